@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from supabase import AClient
+
+from src.config import CountStrategy, Environment, set_config
+from src.database import create_supabase
+from src.pagination import DEFAULT_PAGE_SIZE
+from utils.logger import logger
+
+
+async def measure(client: AClient, table: str, strategy: CountStrategy, repeat: int, limit: int) -> list[float]:
+    """Time `repeat` page reads of `table` using `strategy`, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await client.table(table).select("*", count=strategy.method).limit(limit).execute()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(table: str, repeat: int, limit: int) -> None:
+    """
+    Log the latency of one page read of `table` under each count strategy.
+
+    Run against a large table to see the cost of `exact` counting:
+
+        python -m benchmarks.count --env development --table item --repeat 20
+    """
+    client = await create_supabase()
+    logger.info("Benchmark - Count strategies on table=%s; repeat=%s; limit=%s", table, repeat, limit)
+    try:
+        # Warm up the connection so the first TLS handshake is not measured.
+        await client.table(table).select("*").limit(1).execute()
+        for strategy in CountStrategy:
+            timings = await measure(client, table, strategy, repeat, limit)
+            quantiles = statistics.quantiles(timings, n=20)
+            logger.info(
+                "Benchmark - count=%-9s mean=%7.2fms p50=%7.2fms p95=%7.2fms",
+                strategy.value,
+                statistics.fmean(timings),
+                statistics.median(timings),
+                quantiles[-1],
+            )
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--env",
+        type=str,
+        choices=[e.value for e in Environment],
+        default=None,
+        help="Environment to benchmark against (local, development, staging, production)",
+    )
+    parser.add_argument("--table", type=str, default="item", help="Table to read from")
+    parser.add_argument("--repeat", type=int, default=20, help="Reads per count strategy")
+    parser.add_argument("--limit", type=int, default=DEFAULT_PAGE_SIZE, help="Rows per read")
+    args = parser.parse_args()
+
+    set_config(args.env)
+
+    asyncio.run(main(args.table, args.repeat, args.limit))
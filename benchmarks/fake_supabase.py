@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from benchmarks.startup import free_port
+from utils.vocabulary import CATEGORY_NAMES, FOOD_ADJECTIVES, FOOD_TYPES
+
+Row = dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+# Query parameters that shape the result rather than filter it.
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+# Seconds the server is given to bind its port.
+STARTUP_TIMEOUT = 10.0
+
+
+def _text(value: object) -> str:
+    """Render a column value the way PostgREST compares it against a filter."""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return "" if value is None else str(value)
+
+
+def _unquote(value: str) -> str:
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value  # noqa: PLR2004
+
+
+def _split(expression: str) -> list[str]:
+    """Split a PostgREST logical expression on the commas outside parentheses and quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in expression:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _condition(column: str, operator: str, value: str) -> Predicate:
+    """Build the predicate of one `column=operator.value` filter."""
+    if operator == "in":
+        accepted = {_unquote(part) for part in _split(value.strip("()"))}
+        return lambda row: _text(row.get(column)) in accepted
+    value = _unquote(value)
+    if operator == "is":
+        return lambda row: _text(row.get(column)) == ("" if value == "null" else value)
+    comparisons: dict[str, Callable[[str, str], bool]] = {
+        "eq": lambda a, b: a.lower() == b.lower(),
+        "neq": lambda a, b: a.lower() != b.lower(),
+        "gt": lambda a, b: a > b,
+        "gte": lambda a, b: a >= b,
+        "lt": lambda a, b: a < b,
+        "lte": lambda a, b: a <= b,
+    }
+    compare = comparisons[operator]
+    return lambda row: compare(_text(row.get(column)), value)
+
+
+def _logical(expression: str) -> Predicate:
+    """Build the predicate of an `and(...)`/`or(...)` group or a `column.operator.value` term."""
+    for name, combine in (("and", all), ("or", any)):
+        if expression.startswith(f"{name}("):
+            predicates = [_logical(part) for part in _split(expression[len(name) + 1 : -1])]
+            return lambda row, predicates=predicates, combine=combine: combine(p(row) for p in predicates)
+    column, operator, value = expression.split(".", 2)
+    return _condition(column, operator, value)
+
+
+def parse_filters(params: list[tuple[str, str]]) -> Predicate:
+    """Combine the filters of a PostgREST query string into one predicate."""
+    predicates = []
+    for key, value in params:
+        if key in RESERVED_PARAMS:
+            continue
+        if key in ("or", "and"):
+            predicates.append(_logical(f"{key}{value}"))
+            continue
+        operator, _, operand = value.partition(".")
+        predicates.append(_condition(key, operator, operand))
+    return lambda row: all(predicate(row) for predicate in predicates)
+
+
+def seed_tables(items: int, categories: int, seed: int = 0) -> dict[str, list[Row]]:
+    """Generate deterministic menu rows, so every run reads the same data."""
+    rng = random.Random(seed)  # noqa: S311
+    epoch = datetime(2024, 1, 1, tzinfo=UTC)
+
+    def row_id() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    category_rows = [
+        {
+            "id": row_id(),
+            "title": f"{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {i}"[:22],
+            "image_uri": None,
+            "created_at": (epoch + timedelta(minutes=i)).isoformat(),
+            "updated_at": None,
+            "is_available": i % 5 != 0,
+        }
+        for i in range(categories)
+    ]
+    item_rows = []
+    for i in range(items):
+        title = f"{rng.choice(FOOD_ADJECTIVES)} {rng.choice(FOOD_TYPES)}"
+        item_rows.append({
+            "id": row_id(),
+            "title": title[:22],
+            "title_full": f"{title} no. {i}",
+            "description": f"{title} served the way the house has always made it.",
+            "price": f"{rng.randint(300, 4500) / 100:.2f}",
+            "categories": [row["id"] for row in rng.sample(category_rows, k=min(2, len(category_rows)))],
+            "image_uri": None,
+            "is_available": rng.random() < 0.8,  # noqa: PLR2004
+            "created_at": (epoch + timedelta(seconds=i)).isoformat(),
+            "updated_at": None,
+        })
+    return {"category": category_rows, "item": item_rows}
+
+
+class FakeSupabase:
+    """
+    In-process stand-in for the PostgREST API of a Supabase project.
+
+    It keeps the `item` and `category` tables in memory and answers the selects,
+    filters (`eq`, `in`, `gt`, `or(...)`, ...), ordering, limits, counts, inserts,
+    upserts, updates and deletes the routers send. Every request sleeps for
+    `latency` seconds, plus up to `jitter` seconds, to stand in for the network
+    round trip and the database.
+    """
+
+    def __init__(self, tables: dict[str, list[Row]], latency: float = 0.0, jitter: float = 0.0) -> None:
+        """
+        Initialize the FakeSupabase.
+
+        Args:
+            tables: Rows of each table, keyed by table name.
+            latency: Seconds every request is delayed by.
+            jitter: Upper bound of a random delay added on top of `latency`.
+
+        """
+        self.tables = tables
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._random = random.Random(1)  # noqa: S311
+        self.app = Starlette(routes=[Route("/rest/v1/{table}", self.handle, methods=["GET", "HEAD", "POST", "PATCH", "DELETE"])])
+        self._server: uvicorn.Server | None = None
+        self._task: asyncio.Task | None = None
+
+    async def handle(self, request: Request) -> Response:
+        """Answer one PostgREST request."""
+        self.requests += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        table = self.tables.setdefault(request.path_params["table"], [])
+        params = list(request.query_params.multi_items())
+        prefer = request.headers.get("prefer", "")
+        if request.method in ("GET", "HEAD"):
+            return self._select(table, params, prefer)
+
+        body = json.loads(await request.body() or b"null")
+        if request.method == "POST":
+            rows = body if isinstance(body, list) else [body]
+            return self._insert(table, rows, prefer)
+        predicate = parse_filters(params)
+        matched = [row for row in table if predicate(row)]
+        if request.method == "PATCH":
+            for row in matched:
+                row.update(body)
+        else:
+            deleted = {id(row) for row in matched}
+            table[:] = [row for row in table if id(row) not in deleted]
+        return self._respond(matched, status=200)
+
+    def _select(self, table: list[Row], params: list[tuple[str, str]], prefer: str) -> Response:
+        predicate = parse_filters(params)
+        rows = [row for row in table if predicate(row)]
+        query = dict(params)
+        # Sorting is stable, so sorting by the last key first yields the full ordering.
+        for term in reversed([term for term in query.get("order", "").split(",") if term]):
+            column, _, direction = term.partition(".")
+            rows.sort(key=lambda row, column=column: _text(row.get(column)), reverse=direction.startswith("desc"))
+        total = len(rows)
+        offset = int(query.get("offset", 0))
+        rows = rows[offset : offset + int(query["limit"])] if "limit" in query else rows[offset:]
+        content_range = f"{offset}-{offset + len(rows) - 1}" if rows else "*"
+        count = str(total) if "count=" in prefer else "*"
+        return self._respond(rows, status=200, headers={"Content-Range": f"{content_range}/{count}"})
+
+    def _insert(self, table: list[Row], rows: list[Row], prefer: str) -> Response:
+        now = datetime.now(UTC).isoformat()
+        stored = [{"id": str(uuid.uuid4()), "created_at": now, "updated_at": None, **row} for row in rows]
+        if "resolution=merge-duplicates" in prefer:
+            by_id = {row["id"]: row for row in stored}
+            table[:] = [by_id.pop(row["id"], row) for row in table]
+            table.extend(by_id.values())
+        else:
+            table.extend(stored)
+        return self._respond(stored, status=201)
+
+    @staticmethod
+    def _respond(rows: list[Row], status: int, headers: dict[str, str] | None = None) -> Response:
+        return Response(json.dumps(rows, separators=(",", ":")), status_code=status, media_type="application/json", headers=headers)
+
+    async def start(self) -> str:
+        """
+        Start serving on a free local port and return the base URL.
+
+        Raises:
+            TimeoutError: If the server has not started within STARTUP_TIMEOUT seconds.
+            RuntimeError: If the server stopped before it started.
+
+        """
+        port = free_port()
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._task = asyncio.create_task(self._serve(port))
+        async with asyncio.timeout(STARTUP_TIMEOUT):
+            while not self._server.started:
+                if self._task.done():
+                    self._task.result()
+                    msg = f"Fake Supabase stopped before it started on port {port}"
+                    raise RuntimeError(msg)
+                await asyncio.sleep(0.01)
+        return f"http://127.0.0.1:{port}"
+
+    async def _serve(self, port: int) -> None:
+        # uvicorn exits the process when it cannot bind, e.g. because the port was
+        # taken; that is raised as an error of the task instead, for `start` to report.
+        try:
+            await self._server.serve()
+        except SystemExit as e:
+            msg = f"Fake Supabase failed to start on port {port}"
+            raise RuntimeError(msg) from e
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.should_exit = True
+            await self._task
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import httpx
+
+from benchmarks.fake_supabase import FakeSupabase, Row, seed_tables
+from utils.logger import logger
+
+# supabase-py only checks the key looks like a JWT; the fake never verifies it.
+FAKE_API_KEY = "header.payload.signature"
+
+
+class Scenario(NamedTuple):
+    """One kind of request sent to the app, with its path and body drawn per request."""
+
+    name: str
+    method: str
+    path: Callable[[random.Random], str]
+    body: Callable[[random.Random], Any] | None = None
+
+
+class Result(NamedTuple):
+    """Throughput, latency and memory of one scenario at one concurrency level."""
+
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration_s: float
+    requests_per_s: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    rss_mb: float
+    rss_delta_mb: float
+    peak_rss_mb: float
+    upstream_requests: int
+
+
+def build_scenarios(tables: dict[str, list[Row]]) -> list[Scenario]:
+    """Return the item and category scenarios, reading ids from the seeded tables."""
+    item_ids = [row["id"] for row in tables["item"]]
+    category_ids = [row["id"] for row in tables["category"]]
+    return [
+        Scenario("item-list", "GET", lambda _: "/item/?limit=50"),
+        Scenario("item-list-available", "GET", lambda _: "/item/?available=true&limit=50&count=none"),
+        Scenario("item-detail", "GET", lambda rng: f"/item/{rng.choice(item_ids)}"),
+        Scenario("item-batch", "GET", lambda rng: "/item/batch?" + "&".join(f"ids={i}" for i in rng.sample(item_ids, 10))),
+        Scenario(
+            "item-create",
+            "POST",
+            lambda _: "/item/create",
+            lambda rng: {"title": f"Load Test {rng.randint(0, 9999)}", "price": "9.50", "is_available": True},
+        ),
+        Scenario(
+            "item-update",
+            "PATCH",
+            lambda rng: f"/item/{rng.choice(item_ids)}",
+            lambda rng: {"price": f"{rng.randint(300, 4500) / 100:.2f}"},
+        ),
+        Scenario("category-list", "GET", lambda _: "/category/"),
+        Scenario("category-detail", "GET", lambda rng: f"/category/{rng.choice(category_ids)}"),
+    ]
+
+
+def rss_mb() -> float:
+    """Return the resident set size of this process in MiB, falling back to the peak where /proc is missing."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return peak_rss_mb()
+    return pages * resource.getpagesize() / 2**20
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / 2**20 if platform.system() == "Darwin" else peak / 2**10
+
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, concurrency: int, duration: float, seed: int) -> tuple[list[float], int]:
+    """Send `scenario` from `concurrency` workers for `duration` seconds and return the latencies and errors."""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed + index)  # noqa: S311
+        while time.perf_counter() < deadline:
+            body = scenario.body(rng) if scenario.body is not None else None
+            started = time.perf_counter()
+            response = await client.request(scenario.method, scenario.path(rng), json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:  # noqa: PLR2004
+                errors += 1
+
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return latencies, errors
+
+
+async def run_scenario(  # noqa: PLR0913 # one argument per dimension of a benchmark run
+    client: httpx.AsyncClient,
+    fake: FakeSupabase,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> Result:
+    """Warm up, then measure one scenario at one concurrency level."""
+    await drive(client, scenario, concurrency, warmup, seed=0)
+    rss_before = rss_mb()
+    upstream_before = fake.requests
+    started = time.perf_counter()
+    latencies, errors = await drive(client, scenario, concurrency, duration, seed=concurrency)
+    elapsed = time.perf_counter() - started
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    rss_after = rss_mb()
+    return Result(
+        scenario=scenario.name,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        duration_s=round(elapsed, 3),
+        requests_per_s=round(len(latencies) / elapsed, 1),
+        mean_ms=round(statistics.fmean(latencies) * 1000, 3),
+        p50_ms=round(percentiles[49] * 1000, 3),
+        p95_ms=round(percentiles[94] * 1000, 3),
+        p99_ms=round(percentiles[98] * 1000, 3),
+        max_ms=round(max(latencies) * 1000, 3),
+        rss_mb=round(rss_after, 1),
+        rss_delta_mb=round(rss_after - rss_before, 1),
+        peak_rss_mb=round(peak_rss_mb(), 1),
+        upstream_requests=fake.requests - upstream_before,
+    )
+
+
+def git_commit() -> str | None:
+    """Return the short hash of the checked out commit, if this is a git checkout."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)  # noqa: S603, S607
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results: list[Result], baseline_path: Path) -> None:
+    """Log the change in throughput and p99 latency against an earlier run."""
+    baseline = {(row["scenario"], row["concurrency"]): row for row in json.loads(baseline_path.read_text())["results"]}
+    logger.info("Benchmark - Compared with %s", baseline_path)
+    for result in results:
+        before = baseline.get((result.scenario, result.concurrency))
+        if before is None:
+            continue
+        logger.info(
+            "Benchmark -   %-20s c=%-4s req/s %+7.1f%%  p99 %+7.1f%%",
+            result.scenario,
+            result.concurrency,
+            (result.requests_per_s / before["requests_per_s"] - 1) * 100 if before["requests_per_s"] else 0.0,
+            (result.p99_ms / before["p99_ms"] - 1) * 100 if before["p99_ms"] else 0.0,
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    """
+    Load test the item and category routes against a local PostgREST stand-in.
+
+    The fake is served over HTTP on a local port, so requests go through the app's
+    real connection pool, and the app is driven in-process through its ASGI
+    interface. Both share this process, so absolute numbers include the fake's own
+    cost; compare runs of the same settings across builds:
+
+        python -m benchmarks.loadtest --concurrency 1 16 64 --latency 5 --output before.json
+        python -m benchmarks.loadtest --concurrency 1 16 64 --latency 5 --baseline before.json
+    """
+    tables = seed_tables(args.items, args.categories)
+    fake = FakeSupabase(tables, latency=args.latency / 1000, jitter=args.jitter / 1000)
+    url = await fake.start()
+
+    # The Configuration is resolved before the app is imported and pointed at the
+    # fake, so a local .env file can never send the load to a real project.
+    from src.config import Configuration, resolve_config
+
+    resolve_config()
+    Configuration.api_url = url
+    Configuration.api_key = FAKE_API_KEY
+    if args.cache_ttl is not None:
+        Configuration.cache_ttl = args.cache_ttl
+    Configuration.fast_serialization = args.fast_serialization
+    # Every simulated client shares one address, so with the limiter on most of
+    # the load would be measured as rejections.
+    if not args.rate_limit:
+        Configuration.rate_limit = 0.0
+    if not args.access_log:
+        logging.getLogger("micropos-api.access").setLevel(logging.WARNING)
+
+    from src.app import create_app
+
+    app = create_app()
+    scenarios = [scenario for scenario in build_scenarios(tables) if not args.scenarios or scenario.name in args.scenarios]
+    results = []
+    try:
+        async with (
+            app.router.lifespan_context(app),
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest") as client,
+        ):
+            for scenario in scenarios:
+                for concurrency in args.concurrency:
+                    result = await run_scenario(client, fake, scenario, concurrency, args.duration, args.warmup)
+                    results.append(result)
+                    logger.info(
+                        "Benchmark - %-20s c=%-4s %8.1f req/s p50=%7.2fms p95=%7.2fms p99=%7.2fms errors=%s rss=%.1fMiB",
+                        result.scenario,
+                        result.concurrency,
+                        result.requests_per_s,
+                        result.p50_ms,
+                        result.p95_ms,
+                        result.p99_ms,
+                        result.errors,
+                        result.rss_mb,
+                    )
+    finally:
+        await fake.stop()
+
+    report = {
+        "commit": git_commit(),
+        "generated_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "settings": {
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "items": args.items,
+            "categories": args.categories,
+            "cache_ttl": args.cache_ttl,
+            "fast_serialization": args.fast_serialization,
+            "rate_limit": args.rate_limit,
+        },
+        "results": [result._asdict() for result in results],
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    logger.info("Benchmark - Results written to %s", args.output)
+    if args.baseline is not None:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64], help="Concurrent clients per run")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds each scenario is measured for per concurrency level")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds each scenario runs before it is measured")
+    parser.add_argument("--latency", type=float, default=5.0, help="Milliseconds the fake delays every upstream request by")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Upper bound of a random delay in milliseconds added to --latency")
+    parser.add_argument("--items", type=int, default=1000, help="Items seeded into the fake")
+    parser.add_argument("--categories", type=int, default=20, help="Categories seeded into the fake")
+    parser.add_argument("--scenarios", nargs="+", default=None, help="Scenarios to run, all by default")
+    parser.add_argument("--cache-ttl", type=float, default=None, help="Menu cache TTL in seconds; 0 measures uncached reads")
+    parser.add_argument("--fast-serialization", action="store_true", help="Render reads without response model validation")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep the rate limiter on, with every client sharing one key")
+    parser.add_argument("--access-log", action="store_true", help="Keep writing the access log while under load")
+    parser.add_argument("--output", type=Path, default=Path("loadtest.json"), help="File the JSON results are written to")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier results to compare against")
+    asyncio.run(main(parser.parse_args()))
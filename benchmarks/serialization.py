@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.api.item.schemas import ItemResponseModel
+from src.serialization import FastJSONResponse, format_prices, orjson
+from utils.logger import logger
+
+
+def build_rows(count: int) -> list[dict[str, Any]]:
+    """Build `count` item rows shaped like a PostgREST response, prices as JSON numbers."""
+    return [
+        {
+            "id": str(uuid.UUID(int=i, version=4)),
+            "title": f"Curry {i}"[:22],
+            "title_full": f"Curry {i} with seasonal vegetables",
+            "description": "Southern-style curry cooked with seasonal vegetables.",
+            "categories": [str(uuid.UUID(int=i % 12, version=4))],
+            "price": 10 + (i % 400) / 20,
+            "image_uri": f"https://example.com/images/{i}.jpg",
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "updated_at": None,
+            "is_available": True,
+        }
+        for i in range(count)
+    ]
+
+
+async def validated(rows: list[dict[str, Any]]) -> bytes:
+    """Serialize the way FastAPI does for a route declaring `response_model=ItemResponseModel`."""
+    field = create_model_field(name="Response_get_items", type_=ItemResponseModel, mode="serialization")
+    content = await serialize_response(field=field, response_content={"data": rows, "count": len(rows)})
+    return JSONResponse(content).body
+
+
+async def fast(rows: list[dict[str, Any]]) -> bytes:
+    """Serialize the way a route does with `FAST_SERIALIZATION` enabled."""
+    return FastJSONResponse({"data": format_prices(rows), "count": len(rows)}).body
+
+
+async def measure(path: Callable[[list[dict[str, Any]]], Awaitable[bytes]], rows: list[dict[str, Any]], repeat: int) -> list[float]:
+    """Time `repeat` serializations of `rows` through `path`, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        copied = [dict(row) for row in rows]
+        started = time.perf_counter()
+        await path(copied)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(sizes: list[int], repeat: int) -> None:
+    """
+    Log the cost of serializing item lists through the validated and the fast path.
+
+    Runs offline, with no database:
+
+        python -m benchmarks.serialization --sizes 1000 10000 --repeat 20
+    """
+    logger.info("Benchmark - Serialization with encoder=%s; repeat=%s", "orjson" if orjson is not None else "json", repeat)
+    for size in sizes:
+        rows = build_rows(size)
+        for name, path in (("validated", validated), ("fast", fast)):
+            timings = await measure(path, rows, repeat)
+            logger.info(
+                "Benchmark - rows=%-6s path=%-9s mean=%8.2fms p50=%8.2fms min=%8.2fms",
+                size,
+                name,
+                statistics.fmean(timings),
+                statistics.median(timings),
+                min(timings),
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000], help="List lengths to serialize")
+    parser.add_argument("--repeat", type=int, default=20, help="Serializations per path and size")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sizes, args.repeat))
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import NamedTuple
+
+import httpx
+
+from src.config import Environment
+from utils.logger import logger
+
+
+class ImportTime(NamedTuple):
+    """One line of `python -X importtime` output, in milliseconds."""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+
+
+def import_times(module: str) -> list[ImportTime]:
+    """Import `module` in a fresh interpreter and return the time spent on every module it pulled in."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times.append(ImportTime(name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return times
+
+
+def free_port() -> int:
+    """Return a port nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request(path: str, timeout: float) -> float:
+    """
+    Start the app in a fresh process and return the seconds until `path` first answers.
+
+    The clock starts before the interpreter is spawned, so it covers interpreter
+    startup, imports, configuration, the lifespan and the first request itself.
+    """
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(  # noqa: S603
+        [sys.executable, "-m", "uvicorn", "src.app:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                msg = f"Benchmark - The app exited with code {process.returncode} before answering"
+                raise RuntimeError(msg)
+            try:
+                httpx.get(f"http://127.0.0.1:{port}{path}", timeout=0.5).raise_for_status()
+            except httpx.HTTPError:
+                time.sleep(0.01)
+                continue
+            return time.perf_counter() - started
+        msg = f"Benchmark - The app did not answer {path} within {timeout}s"
+        raise TimeoutError(msg)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(modules: list[str], top: int, repeat: int, path: str, timeout: float) -> None:
+    """
+    Log the import cost of each module and the app's time-to-first-request.
+
+    Nothing upstream is called, so any API_URL works:
+
+        python -m benchmarks.startup --env development --repeat 5
+    """
+    for module in modules:
+        times = import_times(module)
+        total = next(entry.cumulative_ms for entry in times if entry.module == module)
+        logger.info("Benchmark - import %s: %.1fms", module, total)
+        for entry in sorted(times, key=lambda entry: entry.self_ms, reverse=True)[:top]:
+            logger.info("Benchmark -   %-45s self=%7.1fms cumulative=%7.1fms", entry.module, entry.self_ms, entry.cumulative_ms)
+
+    timings = [time_to_first_request(path, timeout) * 1000 for _ in range(repeat)]
+    logger.info(
+        "Benchmark - time-to-first-request %s: mean=%7.1fms p50=%7.1fms min=%7.1fms",
+        path,
+        statistics.fmean(timings),
+        statistics.median(timings),
+        min(timings),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--env",
+        type=str,
+        choices=[e.value for e in Environment],
+        default=None,
+        help="Environment the app is started in (local, development, staging, production)",
+    )
+    parser.add_argument("--modules", nargs="+", default=["src.app", "utils.seeder", "utils.generator"], help="Modules to profile")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed per module")
+    parser.add_argument("--repeat", type=int, default=3, help="App starts timed")
+    parser.add_argument("--path", type=str, default="/system/cache", help="Route the first request is sent to")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the app to answer")
+    args = parser.parse_args()
+
+    if args.env:
+        os.environ["ENVIRONMENT"] = args.env
+
+    main(args.modules, args.top, args.repeat, args.path, args.timeout)
@@ -33,3 +33,4 @@ class CategoryUpdate(BaseModel):
 class CategoryResponseModel(BaseModel):
     data: list[Category]
     count: int | None = Field(None, examples=[1])
+    next_cursor: str | None = Field(None, description="Cursor for the next page, or None on the last page")
@@ -1,165 +1,324 @@
 # ruff: noqa: D103
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Annotated
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from supabase import AClient
 
-from src.api.item.schemas import ItemCreate, ItemResponseModel, ItemUpdate
+from src.api.item.schemas import (
+    BulkRowError,
+    ImportLineError,
+    Item,
+    ItemBulkResponseModel,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemImportResponseModel,
+    ItemResponseModel,
+    ItemUpdate,
+)
+from src.api.resource import Resource, add_crud_routes
+from src.batching import MAX_BATCH_SIZE, read_flight
+from src.bulk import PatchGroup, chunked, format_validation_error, get_bulk_chunk_size, get_bulk_concurrency, group_patches, validate_rows
+from src.cache import CacheKey, MenuCache, get_menu_cache
 from src.database import get_supabase_client
-from supabase import AClient, PostgrestAPIResponse
+from src.middleware import TimedRoute
+from src.pagination import MAX_PAGE_SIZE
+from src.ratelimit import rate_limit
+from src.repository.base import QueryBuilder
+from src.serialization import serialize
+from src.snapshot import MenuSnapshot, get_menu_snapshot
+from src.streaming import (
+    CsvRecordError,
+    LineDecodeError,
+    LineRanges,
+    StreamFormat,
+    decode_csv_row,
+    iter_csv_records,
+    iter_keyset_pages,
+    iter_lines,
+    stream_rows,
+)
 from utils.exceptions import get_error_id
 from utils.logger import logger
 
 router = APIRouter(
     prefix="/item",
     tags=["Items"],
+    route_class=TimedRoute,
+    dependencies=[Depends(rate_limit)],
+)
+
+items = Resource(
+    "item",
+    label="menu item",
+    response_model=ItemResponseModel,
+    create_model=ItemCreate,
+    update_model=ItemUpdate,
+    menu=True,
 )
+item_create_list = TypeAdapter(list[ItemCreate])
+
+MAX_REPORTED_IMPORT_ERRORS = 1000
+# Columns written to CSV as JSON, which an import decodes back.
+CSV_JSON_COLUMNS = frozenset({"categories"})
 
 
 @router.get(
-    "/{item_id}",
-    summary="Get Menu Item",
-    description="Retrieve a menu item by id.",
-    response_model=ItemResponseModel,
+    "/export",
+    summary="Export Menu Items",
+    description="Stream every menu item as NDJSON or CSV, paging through the table internally.",
+    response_class=StreamingResponse,
     status_code=status.HTTP_200_OK,
 )
-async def get_item(
-    item_id: UUID,
+async def export_items(
     client: Annotated[AClient, Depends(get_supabase_client)],
-) -> PostgrestAPIResponse[ItemResponseModel]:
+    export_format: Annotated[StreamFormat, Query(alias="format", description="Format of the export")] = StreamFormat.NDJSON,
+    available: bool | None = Query(None, description="Filter by availability"),
+) -> StreamingResponse:
+    def select() -> QueryBuilder:
+        query = client.table("item").select("*")
+        return query if available is None else query.eq("is_available", f"{available}")
+
+    pages = iter_keyset_pages(select, MAX_PAGE_SIZE)
     try:
-        response = await client.table("item").select("*", count="exact").eq("id", item_id).execute()
+        first_page = await anext(pages)
     except Exception as e:
         error_id = get_error_id()
-        logger.exception("Error ID: %s; Failed to retrieve item: %s", error_id, item_id)
+        logger.exception("Error ID: %s; Failed to export items", error_id)
         raise HTTPException(
             status_code=500,
-            detail=f"Error ID: {error_id}; Failed to retrieve item",
+            detail=f"Error ID: {error_id}; Failed to export items",
         ) from e
     else:
-        return response
+        return StreamingResponse(
+            stream_rows(first_page, pages, export_format, list(Item.model_fields)),
+            media_type=export_format.media_type,
+            headers={"Content-Disposition": f'attachment; filename="items.{export_format.value}"'},
+        )
 
 
 @router.get(
-    "/",
-    summary="Get All Menu Items",
-    description="Retrieve all menu items.",
+    "/batch",
+    summary="Get Menu Items by Id",
+    description="Retrieve several menu items by id with a single lookup.",
     response_model=ItemResponseModel,
     status_code=status.HTTP_200_OK,
 )
-async def get_items(
+async def get_items_by_id(
     client: Annotated[AClient, Depends(get_supabase_client)],
-    available: bool | None = Query(None, description="Filter by availability"),
-) -> PostgrestAPIResponse[ItemResponseModel]:
+    ids: Annotated[list[UUID], Query(min_length=1, max_length=MAX_BATCH_SIZE, description="Ids of the items to retrieve")],
+) -> dict[str, Any] | Response:
+    unique_ids = list(dict.fromkeys(str(item_id) for item_id in ids))
     try:
-        if available is None:
-            response = await client.table("item").select("*", count="exact").execute()
-        else:
-            response = await client.table("item").select("*", count="exact").eq("is_available", f"{available}").execute()
+        response = await read_flight.do(
+            CacheKey("item", params=(("ids", tuple(sorted(unique_ids))),)),
+            lambda: client.table("item").select("*").in_("id", unique_ids).execute(),
+        )
     except Exception as e:
         error_id = get_error_id()
-        logger.exception("Error ID: %s; Failed to retrieve items", error_id)
+        logger.exception("Error ID: %s; Failed to retrieve items: %s", error_id, unique_ids)
         raise HTTPException(
             status_code=500,
-            detail="Error ID: {error_id}; Failed to retrieve items",
+            detail=f"Error ID: {error_id}; Failed to retrieve items",
         ) from e
     else:
-        return response
+        rows = {str(row["id"]): row for row in response.data}
+        found = [rows[item_id] for item_id in unique_ids if item_id in rows]
+        return serialize({"data": found, "count": len(found)})
 
 
 @router.post(
-    "/create",
-    summary="Create Menu Item",
-    description="Create a new menu item.",
-    response_model=ItemResponseModel,
+    "/bulk",
+    summary="Create Menu Items",
+    description="Create many menu items, inserting them in chunks. Invalid rows are reported without aborting the batch.",
+    response_model=ItemBulkResponseModel,
     status_code=status.HTTP_201_CREATED,
 )
-async def create_item(
-    item: ItemCreate,
+async def create_items(
+    # Rows are not typed as objects here, so a row that is not one is reported by index
+    # instead of failing the whole request.
+    items: Annotated[list[Any], Body(description="Items to create, each shaped like ItemCreate")],
     client: Annotated[AClient, Depends(get_supabase_client)],
-) -> PostgrestAPIResponse[ItemResponseModel]:
-    try:
-        item_dict = item.model_dump()
-        item_dict["created_at"] = datetime.now(timezone.utc)
-        item_json_encoded = jsonable_encoder(item_dict)
-        response = await client.table("item").insert(item_json_encoded).execute()
-        logger.info(
-            "Created item: title=%s; id=%s",
-            response.data[0]["title"],
-            response.data[0]["id"],
-        )
-    except Exception as e:
-        error_id = get_error_id()
-        logger.exception("Error ID: %s; Failed to create item", error_id)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error ID: {error_id}; Failed to create item: {item_dict["title"]}",
-        ) from e
-    else:
-        return response
+    cache: Annotated[MenuCache, Depends(get_menu_cache)],
+    snapshot: Annotated[MenuSnapshot, Depends(get_menu_snapshot)],
+) -> dict[str, Any]:
+    indices, valid_items, invalid = validate_rows(item_create_list, items)
+    errors = [BulkRowError(index=index, error=error) for index, error in invalid.items()]
 
+    created_at = datetime.now(UTC).isoformat()
+    rows = item_create_list.dump_python(valid_items, mode="json")
+    for row in rows:
+        row["created_at"] = created_at
 
-@router.patch(
-    "/{item_id}",
-    summary="Update Menu Item",
-    description="Update a menu item.",
-    response_model=ItemResponseModel,
-    status_code=status.HTTP_200_OK,
+    created = []
+    chunk_size = get_bulk_chunk_size()
+    for chunk_indices, chunk in zip(chunked(indices, chunk_size), chunked(rows, chunk_size), strict=True):
+        try:
+            response = await client.table("item").insert(list(chunk)).execute()
+        except Exception:  # noqa: BLE001
+            error_id = get_error_id()
+            logger.exception("Error ID: %s; Failed to create items: rows=%s-%s", error_id, chunk_indices[0], chunk_indices[-1])
+            errors.extend(BulkRowError(index=index, error=f"Error ID: {error_id}; Failed to create item") for index in chunk_indices)
+        else:
+            created.extend(response.data)
+
+    cache.invalidate("item", [row["id"] for row in created])
+    snapshot.apply("item", created)
+    logger.info("Created items: count=%s; failed=%s", len(created), len(errors))
+    return {"data": created, "errors": sorted(errors, key=lambda error: error.index), "count": len(created)}
+
+
+@router.post(
+    "/import",
+    summary="Import Menu Items",
+    description=(
+        "Create menu items from an NDJSON or CSV upload. The body is parsed as it arrives and valid rows are "
+        "inserted in chunks, so the upload is never held in memory as a whole."
+    ),
+    response_model=ItemImportResponseModel,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {stream_format.media_type: {"schema": {"type": "string"}} for stream_format in StreamFormat},
+        },
+    },
 )
-async def update_item(
-    item_id: UUID,
-    item: ItemUpdate,
+async def import_items(  # noqa: C901, PLR0915 # one pass that parses, validates, batches and reports the upload
+    request: Request,
     client: Annotated[AClient, Depends(get_supabase_client)],
-) -> PostgrestAPIResponse[ItemResponseModel]:
-    try:
-        item_dict = item.model_dump(exclude_unset=True)
-        item_dict["updated_at"] = datetime.now(timezone.utc)
-        item_json_encoded = jsonable_encoder(item_dict)
-        response = await client.table("item").update(item_json_encoded).eq("id", item_id).execute()
-        logger.info(
-            "Updated item: title=%s; id=%s",
-            response.data[0]["title"],
-            response.data[0]["id"],
-        )
-    except Exception as e:
-        error_id = get_error_id()
-        logger.exception("Error ID: %s; Failed to update item: %s", error_id, item_id)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error ID: {error_id}; Failed to update item",
-        ) from e
-    else:
-        return response
+    cache: Annotated[MenuCache, Depends(get_menu_cache)],
+    snapshot: Annotated[MenuSnapshot, Depends(get_menu_snapshot)],
+    import_format: Annotated[StreamFormat, Query(alias="format", description="Format of the upload")] = StreamFormat.NDJSON,
+) -> dict[str, Any]:
+    accepted = LineRanges()
+    rejected = []
+    rejected_count = 0
+    created_ids = []
+    batch: list[tuple[int, ItemCreate]] = []
+    chunk_size = get_bulk_chunk_size()
 
+    def reject(line: int, error: str) -> None:
+        nonlocal rejected_count
+        rejected_count += 1
+        if len(rejected) < MAX_REPORTED_IMPORT_ERRORS:
+            rejected.append(ImportLineError(line=line, error=error))
 
-@router.delete(
-    "/{item_id}",
-    summary="Delete Menu Item",
-    description="Delete a menu item by id.",
-    response_model=ItemResponseModel,
+    async def flush() -> None:
+        # Reading of the body pauses while a chunk is inserted, which pushes back on the client.
+        lines = [line for line, _ in batch]
+        rows = item_create_list.dump_python([item for _, item in batch], mode="json")
+        created_at = datetime.now(UTC).isoformat()
+        for row in rows:
+            row["created_at"] = created_at
+        batch.clear()
+        try:
+            response = await client.table("item").insert(rows).execute()
+        except Exception:  # noqa: BLE001
+            error_id = get_error_id()
+            logger.exception("Error ID: %s; Failed to import items: lines=%s-%s", error_id, lines[0], lines[-1])
+            for line in lines:
+                reject(line, f"Error ID: {error_id}; Failed to create item")
+        else:
+            accepted.add(lines)
+            created_ids.extend(row["id"] for row in response.data)
+            snapshot.apply("item", response.data)
+
+    async def records() -> AsyncIterator[tuple[int, str | dict[str, Any]]]:  # noqa: C901 # one branch per format and kind of bad record
+        lines = iter_lines(request.stream())
+        if import_format is StreamFormat.NDJSON:
+            async for line, text in lines:
+                if isinstance(text, LineDecodeError):
+                    reject(line, str(text))
+                elif text.strip():
+                    yield line, text
+            return
+        header = None
+        async for line, values in iter_csv_records(lines):
+            if isinstance(values, CsvRecordError):
+                reject(line, str(values))
+            elif header is None:
+                header = values
+            elif any(values):
+                try:
+                    row = decode_csv_row(header, values, CSV_JSON_COLUMNS)
+                except CsvRecordError as e:
+                    reject(line, str(e))
+                else:
+                    yield line, row
+
+    async for line, record in records():
+        try:
+            item = ItemCreate.model_validate_json(record) if isinstance(record, str) else ItemCreate.model_validate(record)
+        except ValidationError as e:
+            reject(line, "; ".join(format_validation_error(error, skip=0) for error in e.errors()))
+            continue
+        batch.append((line, item))
+        if len(batch) >= chunk_size:
+            await flush()
+    if batch:
+        await flush()
+
+    cache.invalidate("item", created_ids)
+    logger.info("Imported items: accepted=%s; rejected=%s", accepted.count, rejected_count)
+    return {
+        "accepted": accepted.ranges,
+        "rejected": sorted(rejected, key=lambda error: error.line),
+        "accepted_count": accepted.count,
+        "rejected_count": rejected_count,
+    }
+
+
+@router.patch(
+    "/bulk",
+    summary="Update Menu Items",
+    description="Update many menu items with concurrent updates, one per distinct change. Only the fields sent for an item are changed.",
+    response_model=ItemBulkResponseModel,
     status_code=status.HTTP_200_OK,
 )
-async def delete_item(
-    item_id: UUID,
+async def update_items(
+    items: list[ItemBulkUpdate],
     client: Annotated[AClient, Depends(get_supabase_client)],
-) -> PostgrestAPIResponse[ItemResponseModel]:
-    try:
-        response = await client.table("item").delete().eq("id", item_id).execute()
-        logger.info(
-            "Deleted item: title=%s; id=%s",
-            response.data[0]["title"],
-            response.data[0]["id"],
-        )
-    except Exception as e:
-        error_id = get_error_id()
-        logger.exception("Error ID: %s; Failed to delete item: %s", error_id, item_id)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error ID: {error_id}; Failed to delete item",
-        ) from e
-    else:
-        return response
+    cache: Annotated[MenuCache, Depends(get_menu_cache)],
+    snapshot: Annotated[MenuSnapshot, Depends(get_menu_snapshot)],
+) -> dict[str, Any]:
+    updated_at = datetime.now(UTC).isoformat()
+    patches = [(index, str(item.id), item.model_dump(mode="json", exclude_unset=True, exclude={"id"})) for index, item in enumerate(items)]
+    ids = {index: row_id for index, row_id, _ in patches}
+    semaphore = asyncio.Semaphore(get_bulk_concurrency())
+
+    async def apply(group: PatchGroup) -> tuple[list[dict[str, Any]], list[BulkRowError]]:
+        # Each group is one `update ... where id in (...)`, so only the columns sent
+        # are written, concurrent changes to other columns are kept, and a row
+        # deleted meanwhile is reported missing instead of being inserted again.
+        async with semaphore:
+            try:
+                response = await client.table("item").update({**group.patch, "updated_at": updated_at}).in_("id", group.ids).execute()
+            except Exception:  # noqa: BLE001
+                error_id = get_error_id()
+                logger.exception("Error ID: %s; Failed to update items: rows=%s", error_id, group.indices)
+                return [], [BulkRowError(index=index, error=f"Error ID: {error_id}; Failed to update item") for index in group.indices]
+        found = {str(row["id"]) for row in response.data}
+        return response.data, [BulkRowError(index=index, error="Item not found") for index in group.indices if ids[index] not in found]
+
+    errors = []
+    updated = []
+    # Groups never share a row, so they are sent concurrently, a bounded number at a time.
+    for rows, group_errors in await asyncio.gather(*(apply(group) for group in group_patches(patches, get_bulk_chunk_size()))):
+        updated.extend(rows)
+        errors.extend(group_errors)
+
+    cache.invalidate("item", [row["id"] for row in updated])
+    snapshot.apply("item", updated)
+    logger.info("Updated items: count=%s; failed=%s", len(updated), len(errors))
+    return {"data": updated, "errors": sorted(errors, key=lambda error: error.index), "count": len(updated)}
+
+
+add_crud_routes(router, items)
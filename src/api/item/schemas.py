@@ -58,6 +58,12 @@ class ItemUpdate(ItemBase):
     is_available: bool | None = None
 
 
+class ItemBulkUpdate(ItemUpdate):
+    """Model for updating an existing item as part of a bulk update."""
+
+    id: UUID
+
+
 class Item(ItemBase):
     """Model representing the complete item."""
 
@@ -95,3 +101,35 @@ class ItemResponseModel(BaseModel):
 
     data: list[Item]
     count: int | None = Field(None, examples=[1])
+    next_cursor: str | None = Field(None, description="Cursor for the next page, or None on the last page")
+
+
+class BulkRowError(BaseModel):
+    """Model describing a row of a bulk request that was not written."""
+
+    index: int = Field(examples=[3], description="Position of the row in the request body")
+    error: str = Field(examples=["price: Input should be greater than or equal to 0"])
+
+
+class ItemBulkResponseModel(BaseModel):
+    """Response model for a bulk write, with the written items and the rows that failed."""
+
+    data: list[Item]
+    errors: list[BulkRowError]
+    count: int = Field(examples=[1], description="Number of items written")
+
+
+class ImportLineError(BaseModel):
+    """Model describing a line of an import that was not written."""
+
+    line: int = Field(examples=[12], description="Line number the record starts on")
+    error: str = Field(examples=["price: Input should be greater than or equal to 0"])
+
+
+class ItemImportResponseModel(BaseModel):
+    """Response model summarizing a streamed import."""
+
+    accepted: list[list[int]] = Field(examples=[[[1, 11], [13, 40]]], description="Inclusive ranges of line numbers written")
+    rejected: list[ImportLineError] = Field(description="Rejected lines, up to the first 1000")
+    accepted_count: int = Field(examples=[39])
+    rejected_count: int = Field(examples=[1])
@@ -0,0 +1,62 @@
+# ruff: noqa: D103
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from supabase import AClient
+
+from src.api.menu.schemas import MenuSnapshotModel
+from src.cache import CACHE_CONTROL, etag_matches
+from src.database import get_supabase_client
+from src.middleware import TimedRoute
+from src.ratelimit import rate_limit
+from src.snapshot import MenuSnapshot, get_menu_snapshot, negotiate_encoding
+from utils.exceptions import get_error_id
+from utils.logger import logger
+
+router = APIRouter(
+    prefix="/menu",
+    tags=["Menu"],
+    route_class=TimedRoute,
+    dependencies=[Depends(rate_limit)],
+)
+
+
+@router.get(
+    "/snapshot",
+    summary="Get Menu Snapshot",
+    description=(
+        "Retrieve every available category with its available items in one document. The document is built "
+        "once per change and served precompressed with zstd or gzip, as negotiated by Accept-Encoding."
+    ),
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": MenuSnapshotModel, "content": {"application/json": {}}},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"},
+    },
+)
+async def get_menu_snapshot_document(
+    request: Request,
+    client: Annotated[AClient, Depends(get_supabase_client)],
+    snapshot: Annotated[MenuSnapshot, Depends(get_menu_snapshot)],
+) -> Response:
+    try:
+        built = await snapshot.get(client)
+    except Exception as e:
+        error_id = get_error_id()
+        logger.exception("Error ID: %s; Failed to build menu snapshot", error_id)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error ID: {error_id}; Failed to build menu snapshot",
+        ) from e
+
+    headers = {"ETag": built.etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if etag_matches(request, built.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=built.encoded(encoding), media_type="application/json", headers=headers)
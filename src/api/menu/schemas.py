@@ -0,0 +1,20 @@
+# ruff: noqa: D101
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from src.api.category.schemas import Category
+from src.api.item.schemas import Item
+
+
+class MenuCategory(Category):
+    items: list[Item]
+
+
+class MenuSnapshotModel(BaseModel):
+    version: int = Field(examples=[3], description="Increases every time the snapshot is rebuilt")
+    generated_at: datetime
+    categories: list[MenuCategory]
+    uncategorized: list[Item] = Field(description="Available items not linked to any category")
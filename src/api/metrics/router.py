@@ -0,0 +1,36 @@
+# ruff: noqa: D103
+from __future__ import annotations
+
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response, status
+
+from src.metrics import CONTENT_TYPE, MetricsRegistry, get_metrics
+from src.middleware import TimedRoute
+
+router = APIRouter(
+    tags=["Metrics"],
+    route_class=TimedRoute,
+)
+
+
+@router.get(
+    "/metrics",
+    summary="Get Metrics",
+    description=(
+        "Retrieve request, upstream, rate limit, error, cache and pool metrics in the Prometheus text format. "
+        "When several workers run, the values of all of them are added up."
+    ),
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: {"content": {CONTENT_TYPE: {}}}},
+)
+async def get_metrics_document(
+    registry: Annotated[MetricsRegistry, Depends(get_metrics)],
+) -> Response:
+    # The snapshot is taken on the event loop, where the values change. Only reading
+    # the other workers' files, which is blocking I/O, is moved to a thread.
+    snapshot = registry.snapshot()
+    content = registry.render_shared(snapshot) if registry.directory is None else await asyncio.to_thread(registry.render_shared, snapshot)
+    return Response(content=content, media_type=CONTENT_TYPE)
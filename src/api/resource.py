@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import inspect
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Annotated, Any, get_type_hints
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, TypeAdapter
+from supabase import AClient, PostgrestAPIResponse
+
+from src.batching import BatchLoader
+from src.cache import CacheKey, MenuCache, get_menu_cache, not_modified
+from src.config import CountStrategy, get_count_strategy
+from src.database import get_supabase_client
+from src.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, paginate, to_page
+from src.serialization import serialize
+from src.snapshot import MenuSnapshot, get_menu_snapshot
+from utils.exceptions import get_error_id
+from utils.logger import logger
+
+CountQuery = Annotated[CountStrategy | None, Query(description="Row count to include: none, planned, estimated or exact")]
+
+
+class Resource:
+    """
+    A table served through the five CRUD routes.
+
+    Everything the routes need that does not depend on the request is worked
+    out once, when the resource is declared: the batch loader used for lookups
+    by id, the adapters dumping validated bodies straight to JSON-ready rows,
+    the names routes are configured and logged under, and their error messages.
+    """
+
+    def __init__(  # noqa: PLR0913 # every option past `table` is keyword-only
+        self,
+        table: str,
+        *,
+        response_model: type[BaseModel],
+        create_model: type[BaseModel],
+        update_model: type[BaseModel],
+        singular: str | None = None,
+        plural: str | None = None,
+        id_param: str | None = None,
+        label: str | None = None,
+        menu: bool = False,
+    ) -> None:
+        """
+        Initialize the Resource.
+
+        Args:
+            table: The table the routes read and write.
+            response_model: The response model of every route, with the rows under `data`.
+            create_model: The body of the create route.
+            update_model: The body of the update route, whose unset fields are left unchanged.
+            singular: What one row is called in route names and messages, the table name by default.
+            plural: What several rows are called, `singular` with an "s" by default.
+            id_param: Name of the path parameter holding a row's id, `<singular>_id` by default.
+            label: What one row is called in the API docs, e.g. "menu item", `singular` by default.
+            menu: Whether writes are applied to the menu snapshot.
+
+        """
+        self.table = table
+        self.singular = singular or table
+        self.plural = plural or f"{self.singular}s"
+        self.id_param = id_param or f"{self.singular}_id"
+        self.label = label or self.singular
+        self.plural_label = self.label.removesuffix(self.singular) + self.plural
+        self.response_model = response_model
+        self.create_model = create_model
+        self.update_model = update_model
+        self.menu = menu
+        self.loader = BatchLoader(table)
+        self.create_adapter = TypeAdapter(create_model)
+        self.update_adapter = TypeAdapter(update_model)
+
+    def new_row(self, body: BaseModel) -> dict[str, Any]:
+        """Dump a create body to the row inserted for it."""
+        row = self.create_adapter.dump_python(body, mode="json")
+        row["created_at"] = datetime.now(UTC).isoformat()
+        return row
+
+    def patch(self, body: BaseModel) -> dict[str, Any]:
+        """Dump an update body to the columns it changes."""
+        row = self.update_adapter.dump_python(body, mode="json", exclude_unset=True)
+        row["updated_at"] = datetime.now(UTC).isoformat()
+        return row
+
+    def written(self, cache: MenuCache, snapshot: MenuSnapshot, rows: list[dict[str, Any]], *, removed: bool = False) -> None:
+        """Drop cached reads of rows a write returned, and apply them to the menu snapshot if the table is on it."""
+        cache.invalidate(self.table, [row["id"] for row in rows])
+        if self.menu:
+            (snapshot.remove if removed else snapshot.apply)(self.table, rows)
+
+
+def _endpoint(handler: Callable[..., Awaitable[Any]], name: str, id_param: str, **models: type[BaseModel]) -> Callable[..., Awaitable[Any]]:
+    """
+    Give a generic handler the signature FastAPI should see for one resource.
+
+    The handlers are written once, against the placeholder annotations `Create`
+    and `Update` and a `row_id` parameter. Here the placeholders are resolved to
+    the resource's models and `row_id` is renamed to its path parameter, so the
+    OpenAPI schema and validation are exactly those of a hand written route.
+    """
+    hints = get_type_hints(handler, localns=models, include_extras=True)
+    signature = inspect.signature(handler)
+    parameters = [
+        parameter.replace(name=id_param if parameter.name == "row_id" else parameter.name, annotation=hints[parameter.name])
+        for parameter in signature.parameters.values()
+    ]
+
+    async def endpoint(**kwargs: Any) -> Any:  # noqa: ANN401 # stands in for any handler
+        if id_param in kwargs:
+            kwargs["row_id"] = kwargs.pop(id_param)
+        return await handler(**kwargs)
+
+    endpoint.__signature__ = signature.replace(parameters=parameters, return_annotation=hints.get("return", inspect.Signature.empty))
+    endpoint.__name__ = endpoint.__qualname__ = name
+    return endpoint
+
+
+def add_crud_routes(router: APIRouter, resource: Resource) -> None:  # noqa: C901, PLR0915 # the five handlers are closures over the resource
+    """
+    Add the get, list, create, update and delete routes of a resource to a router.
+
+    Routes a router declares itself, such as `/item/batch`, must be added first so
+    their paths are not taken for an id.
+
+    Args:
+        router: The router the routes are added to, whose prefix they are served under.
+        resource: The resource the routes serve.
+
+    """
+    table, singular, plural = resource.table, resource.singular, resource.plural
+    id_path = f"/{{{resource.id_param}}}"
+    get_one_name, get_many_name = f"get_{singular}", f"get_{plural}"
+
+    async def get_one(  # noqa: PLR0913 # FastAPI injects each parameter
+        row_id: UUID,
+        request: Request,
+        response: Response,
+        client: Annotated[AClient, Depends(get_supabase_client)],
+        cache: Annotated[MenuCache, Depends(get_menu_cache)],
+        count: CountQuery = None,
+    ) -> dict[str, Any] | Response:
+        # A lookup by id matches at most one row, so every strategy yields the same
+        # count: whether the row exists. Concurrent lookups are coalesced into one
+        # `in_` query, so that count is taken from the result rather than asked upstream.
+        counted = get_count_strategy(get_one_name, count, CountStrategy.NONE).method is not None
+
+        async def query() -> dict[str, Any]:
+            row = await resource.loader.load(client, str(row_id))
+            rows = [] if row is None else [row]
+            return {"data": rows, "count": len(rows) if counted else None}
+
+        try:
+            entry = await cache.get_or_load(CacheKey(table, id=str(row_id), params=(("count", counted),)), query)
+        except Exception as e:
+            error_id = get_error_id()
+            logger.exception("Error ID: %s; Failed to retrieve %s: %s", error_id, singular, row_id)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error ID: {error_id}; Failed to retrieve {singular}",
+            ) from e
+        else:
+            return not_modified(request, response, entry.etag) or serialize(entry.value, response)
+
+    async def get_many(  # noqa: PLR0913 # FastAPI injects each parameter
+        request: Request,
+        response: Response,
+        client: Annotated[AClient, Depends(get_supabase_client)],
+        cache: Annotated[MenuCache, Depends(get_menu_cache)],
+        available: bool | None = Query(None, description="Filter by availability"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description=f"Maximum number of {plural} in a page"),
+        cursor: str | None = Query(None, description="Opaque `next_cursor` of the previous page"),
+        count: CountQuery = None,
+    ) -> dict[str, Any] | Response:
+        after = decode_cursor(cursor)
+        strategy = get_count_strategy(get_many_name, count, CountStrategy.ESTIMATED)
+
+        async def query() -> dict[str, Any]:
+            select = client.table(table).select("*", count=strategy.method)
+            if available is not None:
+                select = select.eq("is_available", f"{available}")
+            result = await paginate(select, after, limit).execute()
+            return to_page(result.data, result.count, limit)
+
+        try:
+            entry = await cache.get_or_load(
+                CacheKey(table, params=(("available", available), ("limit", limit), ("cursor", cursor), ("count", strategy))),
+                query,
+            )
+        except Exception as e:
+            error_id = get_error_id()
+            logger.exception("Error ID: %s; Failed to retrieve %s", error_id, plural)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error ID: {error_id}; Failed to retrieve {plural}",
+            ) from e
+        else:
+            return not_modified(request, response, entry.etag) or serialize(entry.value, response)
+
+    async def create(
+        body: Create,  # noqa: F821
+        client: Annotated[AClient, Depends(get_supabase_client)],
+        cache: Annotated[MenuCache, Depends(get_menu_cache)],
+        snapshot: Annotated[MenuSnapshot, Depends(get_menu_snapshot)],
+    ) -> PostgrestAPIResponse:
+        row = resource.new_row(body)
+        try:
+            response = await client.table(table).insert(row).execute()
+            resource.written(cache, snapshot, response.data)
+            logger.info("Created %s: title=%s; id=%s", singular, response.data[0].get("title"), response.data[0]["id"])
+        except Exception as e:
+            error_id = get_error_id()
+            logger.exception("Error ID: %s; Failed to create %s", error_id, singular)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error ID: {error_id}; Failed to create {singular}: {row.get("title")}",
+            ) from e
+        else:
+            return response
+
+    async def update(
+        row_id: UUID,
+        body: Update,  # noqa: F821
+        client: Annotated[AClient, Depends(get_supabase_client)],
+        cache: Annotated[MenuCache, Depends(get_menu_cache)],
+        snapshot: Annotated[MenuSnapshot, Depends(get_menu_snapshot)],
+    ) -> PostgrestAPIResponse:
+        try:
+            response = await client.table(table).update(resource.patch(body)).eq("id", row_id).execute()
+            resource.written(cache, snapshot, response.data)
+            logger.info("Updated %s: title=%s; id=%s", singular, response.data[0].get("title"), response.data[0]["id"])
+        except Exception as e:
+            error_id = get_error_id()
+            logger.exception("Error ID: %s; Failed to update %s: %s", error_id, singular, row_id)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error ID: {error_id}; Failed to update {singular}",
+            ) from e
+        else:
+            return response
+
+    async def delete(
+        row_id: UUID,
+        client: Annotated[AClient, Depends(get_supabase_client)],
+        cache: Annotated[MenuCache, Depends(get_menu_cache)],
+        snapshot: Annotated[MenuSnapshot, Depends(get_menu_snapshot)],
+    ) -> PostgrestAPIResponse:
+        try:
+            response = await client.table(table).delete().eq("id", row_id).execute()
+            resource.written(cache, snapshot, response.data, removed=True)
+            logger.info("Deleted %s: title=%s; id=%s", singular, response.data[0].get("title"), response.data[0]["id"])
+        except Exception as e:
+            error_id = get_error_id()
+            logger.exception("Error ID: %s; Failed to delete %s: %s", error_id, singular, row_id)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error ID: {error_id}; Failed to delete {singular}",
+            ) from e
+        else:
+            return response
+
+    label, labels = resource.label, resource.plural_label
+    title, titles = label.title(), labels.title()
+    not_modified_response = {status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}}
+    routes = (
+        ("GET", id_path, get_one, get_one_name, f"Get {title}", f"Retrieve a {label} by id.", status.HTTP_200_OK),
+        ("GET", "/", get_many, get_many_name, f"Get All {titles}", f"Retrieve all {labels} a keyset page at a time.", status.HTTP_200_OK),
+        ("POST", "/create", create, f"create_{singular}", f"Create {title}", f"Create a new {label}.", status.HTTP_201_CREATED),
+        ("PATCH", id_path, update, f"update_{singular}", f"Update {title}", f"Update a {label}.", status.HTTP_200_OK),
+        ("DELETE", id_path, delete, f"delete_{singular}", f"Delete {title}", f"Delete a {label} by id.", status.HTTP_200_OK),
+    )
+    for method, path, handler, name, summary, description, status_code in routes:
+        router.add_api_route(
+            path,
+            _endpoint(handler, name, resource.id_param, Create=resource.create_model, Update=resource.update_model),
+            methods=[method],
+            name=name,
+            summary=summary,
+            description=description,
+            response_model=resource.response_model,
+            status_code=status_code,
+            responses=not_modified_response if method == "GET" else None,
+        )
@@ -7,16 +7,20 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.encoders import jsonable_encoder
+from supabase import AClient, PostgrestAPIResponse
 
 from src.api.category.schemas import CategoryCreate, CategoryResponseModel, CategoryUpdate
 from src.database import get_supabase_client
-from supabase import AClient, PostgrestAPIResponse
+from src.middleware import TimedRoute
+from src.ratelimit import rate_limit
 from utils.exceptions import get_error_id
 from utils.logger import logger
 
 router = APIRouter(
     prefix="/storage",
     tags=["Storage"],
+    route_class=TimedRoute,
+    dependencies=[Depends(rate_limit)],
 )
 
 
@@ -65,7 +69,7 @@ async def get_categories(
         logger.exception("Error ID: %s; Failed to retrieve categories", error_id)
         raise HTTPException(
             status_code=500,
-            detail="Error ID: {error_id}; Failed to retrieve categories",
+            detail=f"Error ID: {error_id}; Failed to retrieve categories",
         ) from e
     else:
         return response
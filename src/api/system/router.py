@@ -0,0 +1,50 @@
+# ruff: noqa: D103
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from supabase import AClient
+
+from src.api.system.schemas import CacheStats, PoolStats
+from src.cache import MenuCache, get_menu_cache
+from src.database import get_supabase_client
+from src.middleware import TimedRoute
+
+router = APIRouter(
+    prefix="/system",
+    tags=["System"],
+    route_class=TimedRoute,
+)
+
+
+@router.get(
+    "/cache",
+    summary="Get Cache Stats",
+    description="Retrieve the hit/miss counters of the menu cache.",
+    response_model=CacheStats,
+    status_code=status.HTTP_200_OK,
+)
+async def get_cache_stats(
+    cache: Annotated[MenuCache, Depends(get_menu_cache)],
+) -> CacheStats:
+    return CacheStats(**cache.stats())
+
+
+@router.get(
+    "/pool",
+    summary="Get Connection Pool Stats",
+    description="Retrieve the occupancy and wait times of the upstream connection pool.",
+    response_model=PoolStats,
+    status_code=status.HTTP_200_OK,
+)
+async def get_pool_stats(
+    client: Annotated[AClient, Depends(get_supabase_client)],
+) -> PoolStats:
+    transport = getattr(client, "transport", None)
+    if transport is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The Supabase client has no pooled transport",
+        )
+    return PoolStats(**transport.stats())
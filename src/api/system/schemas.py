@@ -0,0 +1,29 @@
+# ruff: noqa: D101
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class CacheStats(BaseModel):
+    hits: int = Field(examples=[120])
+    misses: int = Field(examples=[4])
+    evictions: int = Field(examples=[0])
+    size: int = Field(examples=[4])
+    max_size: int = Field(examples=[1024])
+    ttl: float = Field(examples=[30.0])
+
+
+class PoolStats(BaseModel):
+    max_connections: int = Field(examples=[100])
+    max_keepalive: int = Field(examples=[20])
+    http2: bool = Field(examples=[True])
+    connections: int = Field(examples=[4], description="Connections currently open")
+    idle_connections: int = Field(examples=[3])
+    connections_opened: int = Field(examples=[6], description="Connections opened since startup, including TLS handshakes")
+    requests: int = Field(examples=[5210])
+    in_flight: int = Field(examples=[1])
+    peak_in_flight: int = Field(examples=[38])
+    saturation: float = Field(examples=[0.01], description="In-flight requests as a share of max_connections")
+    waited: int = Field(examples=[2], description="Requests that queued for a connection")
+    mean_wait_ms: float = Field(examples=[0.05])
+    max_wait_ms: float = Field(examples=[12.4])
@@ -2,16 +2,17 @@ from __future__ import annotations
 
 import os
 
-from dotenv import load_dotenv
 from fastapi import FastAPI
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
+from starlette.exceptions import HTTPException
 
 from src.api.category.router import router as category_routes
 from src.api.item.router import router as item_routes
-from src.config import get_config, set_config
+from src.api.menu.router import router as menu_routes
+from src.api.metrics.router import router as metrics_routes
+from src.api.system.router import router as system_routes
+from src.config import resolve_config
 from src.database import lifespan
+from src.middleware import AccessLogMiddleware, ServerTimingMiddleware, count_server_errors
 from utils.logger import logger
 
 
@@ -26,14 +27,10 @@ def create_app() -> FastAPI:
         Configured FastAPI application instance
 
     """
-    load_dotenv()
-    set_config(os.getenv("ENVIRONMENT"))
-    config = get_config()
+    config = resolve_config()
 
     logger.info(f"FastAPI - Initializing in {config.environment} environment")
 
-    limiter = Limiter(key_func=get_remote_address)
-
     app = FastAPI(
         title="microPOS API",
         summary="Middleware layer for interfacing between the app and supabase.",
@@ -41,14 +38,19 @@ def create_app() -> FastAPI:
     )
 
     app.state.env = os.getenv("ENVIRONMENT")
-    app.state.limiter = limiter
     app.state.settings = config
 
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    if config.server_timing:
+        app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(AccessLogMiddleware)
+    app.add_exception_handler(HTTPException, count_server_errors)
 
     logger.info("FastAPI - Adding routes")
     app.include_router(category_routes)
     app.include_router(item_routes)
+    app.include_router(menu_routes)
+    app.include_router(metrics_routes)
+    app.include_router(system_routes)
 
     return app
 
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from supabase import AClient
+
+from utils.logger import logger
+
+DEFAULT_BATCH_WINDOW = 0.002
+MAX_BATCH_SIZE = 100
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Batch:
+    """Lookups collected for one client during a batch window."""
+
+    client: AClient
+    waiters: dict[str, list[asyncio.Future]] = field(default_factory=dict)
+    handle: asyncio.TimerHandle | None = None
+
+
+class BatchLoader:
+    """
+    DataLoader-style batcher for lookups of single rows by id.
+
+    Lookups arriving within `window` seconds of each other are merged into one
+    `in_` query against `table` and the rows are fanned back out to their callers.
+    A batch is sent early once it holds `max_batch` distinct ids.
+    """
+
+    def __init__(self, table: str, window: float = DEFAULT_BATCH_WINDOW, max_batch: int = MAX_BATCH_SIZE) -> None:
+        """
+        Initialize the BatchLoader.
+
+        Args:
+            table: The table rows are looked up in.
+            window: Seconds to wait for further lookups before querying.
+            max_batch: Maximum number of distinct ids in one query.
+
+        """
+        self.table = table
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[int, _Batch] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, client: AClient, row_id: str) -> dict[str, Any] | None:
+        """
+        Look up a single row by id as part of the current batch.
+
+        Returns:
+            The row, or None if no row has that id.
+
+        Raises:
+            Exception: Whatever the batched query raised, re-raised in every caller of the batch.
+
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(id(client))
+        if batch is None:
+            batch = self._pending[id(client)] = _Batch(client)
+            batch.handle = loop.call_later(self.window, self._dispatch, id(client))
+
+        future = loop.create_future()
+        batch.waiters.setdefault(row_id, []).append(future)
+        if len(batch.waiters) >= self.max_batch:
+            batch.handle.cancel()
+            self._dispatch(id(client))
+
+        return await future
+
+    def _dispatch(self, key: int) -> None:
+        """Send the pending batch of a client as a background query."""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _Batch) -> None:
+        """Query every id of a batch at once and resolve the waiting callers."""
+        ids = list(batch.waiters)
+        try:
+            response = await batch.client.table(self.table).select("*").in_("id", ids).execute()
+        except Exception as e:  # noqa: BLE001
+            for futures in batch.waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        logger.debug("Batch - Resolved %s lookup(s) on table: %s", len(ids), self.table)
+        rows = {str(row["id"]): row for row in response.data}
+        for row_id, futures in batch.waiters.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(rows.get(row_id))
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between identical concurrent reads.
+
+    The first caller for a key starts the call as a task and every caller arriving
+    before it finishes awaits that same task. Its result or exception reaches every
+    waiter, and a waiter being cancelled never cancels the shared call.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the SingleFlight with no calls in flight."""
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await the in-flight call for `key`, starting `call` if there is none.
+
+        Args:
+            key: Identifies the read, e.g. its table, filters and projection.
+            call: Performs the read when no identical read is in flight.
+
+        Returns:
+            The result of the shared call.
+
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished call so the next read starts a fresh one."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter was cancelled.
+            task.exception()
+
+
+read_flight = SingleFlight()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Sequence
+from typing import Any, NamedTuple, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+
+from src.config import DEFAULT_BULK_CHUNK_SIZE, DEFAULT_BULK_CONCURRENCY, get_config
+
+Model = TypeVar("Model")
+Row = TypeVar("Row")
+
+
+class PatchGroup(NamedTuple):
+    """Rows of a bulk update that receive the same change, and can be updated by one call."""
+
+    patch: dict[str, Any]
+    ids: list[str]
+    indices: list[int]
+
+
+def group_patches(patches: Sequence[tuple[int, str, dict[str, Any]]], size: int | None = None) -> list[PatchGroup]:
+    """
+    Group the `(index, id, patch)` changes of a bulk update by identical patch.
+
+    Changes to the same id are merged in request order first, so a later change
+    wins over an earlier one as if they had been applied one after the other, and
+    no two groups touch the same row, so they can be applied concurrently. Groups
+    hold at most `size` ids, to bound the length of each `in_` filter.
+    """
+    merged: dict[str, tuple[list[int], dict[str, Any]]] = {}
+    for index, row_id, patch in patches:
+        indices, current = merged.setdefault(row_id, ([], {}))
+        indices.append(index)
+        current.update(patch)
+
+    groups: dict[str, list[PatchGroup]] = {}
+    for row_id, (indices, patch) in merged.items():
+        chunks = groups.setdefault(json.dumps(patch, sort_keys=True, default=str), [])
+        if not chunks or (size is not None and len(chunks[-1].ids) >= size):
+            chunks.append(PatchGroup(patch, [], []))
+        chunks[-1].ids.append(row_id)
+        chunks[-1].indices.extend(indices)
+    return [group for chunks in groups.values() for group in chunks]
+
+
+def get_bulk_chunk_size() -> int:
+    """Return the number of rows sent per upstream call by bulk writes."""
+    return getattr(get_config(), "bulk_chunk_size", DEFAULT_BULK_CHUNK_SIZE)
+
+
+def get_bulk_concurrency() -> int:
+    """Return the number of upstream calls a bulk update has in flight at once."""
+    return getattr(get_config(), "bulk_concurrency", DEFAULT_BULK_CONCURRENCY)
+
+
+def chunked(rows: Sequence[Row], size: int) -> Iterator[Sequence[Row]]:
+    """Yield consecutive slices of at most `size` rows."""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def format_validation_error(error: dict[str, Any], skip: int = 1) -> str:
+    """Render a single pydantic error, dropping the first `skip` parts of its location (the list index by default)."""
+    location = ".".join(str(part) for part in error["loc"][skip:])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+def validate_rows(adapter: TypeAdapter[list[Model]], rows: list[Any]) -> tuple[list[int], list[Model], dict[int, str]]:
+    """
+    Validate a list of rows, setting the invalid ones aside instead of failing the batch.
+
+    The whole list goes through `adapter` in one pass. Only if that fails are the
+    invalid rows removed and the remaining rows validated in a second pass.
+
+    Args:
+        adapter: A prebuilt adapter for a list of the target model.
+        rows: The raw rows from the request body.
+
+    Returns:
+        The indices of the valid rows, their validated models, and an error message per invalid index.
+
+    """
+    try:
+        return list(range(len(rows))), adapter.validate_python(rows), {}
+    except ValidationError as e:
+        errors: dict[int, str] = {}
+        for error in e.errors():
+            errors.setdefault(error["loc"][0], format_validation_error(error))
+
+    indices = [index for index in range(len(rows)) if index not in errors]
+    return indices, adapter.validate_python([rows[index] for index in indices]), errors
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any, NamedTuple
+
+from fastapi import Request, Response, status
+
+from src.batching import SingleFlight
+from src.config import DEFAULT_CACHE_MAX_SIZE, DEFAULT_CACHE_TTL, get_config
+from src.metrics import CACHE_ENTRIES, CACHE_EVENTS, MetricsRegistry
+from src.timing import CACHE, timer
+from utils.logger import logger
+
+
+class CacheKey(NamedTuple):
+    """
+    Key for a cached read.
+
+    Detail reads set `id` to the row id, list reads leave it as None and
+    carry their query parameters in `params`. `columns` is the projection.
+    """
+
+    table: str
+    id: str | None = None
+    params: tuple[tuple[str, Hashable], ...] = ()
+    columns: str = "*"
+
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def content_etag(value: object) -> str:
+    """
+    Return a strong ETag derived from a read's value.
+
+    The value is hashed in a canonical JSON form, so equal rows always get the
+    same tag, whichever worker loaded them and however often they were reloaded.
+    """
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return f'"{hashlib.blake2b(encoded, digest_size=16).hexdigest()}"'
+
+
+class CacheEntry(NamedTuple):
+    """A cached value together with the strong ETag it was stored under."""
+
+    value: Any
+    etag: str
+
+
+class MenuCache:
+    """
+    In-process read-through cache for menu reads.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted once `max_size` is reached. Writes invalidate exactly the entries
+    they can affect: every list read of the table plus the detail reads of the
+    written ids.
+
+    Every load is tagged with a strong ETag hashed from its content once, when it
+    is loaded, so conditional GETs never hash the response body. The same rows get
+    the same ETag across TTL reloads and across workers. Concurrent misses for the
+    same key share a single load.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, max_size: int = DEFAULT_CACHE_MAX_SIZE) -> None:
+        """
+        Initialize the MenuCache.
+
+        Args:
+            ttl: Seconds before an entry expires. A value of 0 disables caching.
+            max_size: Maximum number of entries held before LRU eviction.
+
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[CacheKey, tuple[float, CacheEntry]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._flight = SingleFlight()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.ttl > 0 and self.max_size > 0
+
+    def generation(self, table: str) -> int:
+        """Return the invalidation generation of a table."""
+        return self._generations.get(table, 0)
+
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        """Look up a key, counting the hit or miss."""
+        with timer(CACHE):
+            return self._lookup(key)
+
+    def _lookup(self, key: CacheKey) -> CacheEntry | None:
+        cached = self._entries.get(key)
+        if cached is not None:
+            expires_at, entry = cached
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: CacheKey, value: object) -> CacheEntry:
+        """Store a value, evicting the least recently used entries when full."""
+        entry = CacheEntry(value, content_etag(value))
+        if not self.enabled:
+            return entry
+        self._entries[key] = (time.monotonic() + self.ttl, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    async def get_or_load(self, key: CacheKey, loader: Callable[[], Awaitable[Any]]) -> CacheEntry:
+        """
+        Return the cached entry for `key`, calling `loader` on a miss.
+
+        Concurrent misses for the same key wait on one call to `loader`. The loaded
+        value is only stored if no write invalidated the table while the loader was
+        running, so a slow read can never re-insert stale data.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        return await self._flight.do(key, lambda: self._load(key, loader))
+
+    async def _load(self, key: CacheKey, loader: Callable[[], Awaitable[Any]]) -> CacheEntry:
+        """Call `loader` and store its value unless the table was written to meanwhile."""
+        generation = self.generation(key.table)
+        value = await loader()
+        if self.generation(key.table) == generation:
+            return self.set(key, value)
+        return CacheEntry(value, content_etag(value))
+
+    def invalidate(self, table: str, ids: Iterable[Any] | None = None) -> None:
+        """
+        Invalidate the entries a write to `table` can affect.
+
+        Args:
+            table: The table that was written to.
+            ids: The ids of the written rows. When omitted every entry of the table is dropped.
+
+        """
+        self._generations[table] = self.generation(table) + 1
+        id_set = None if ids is None else {str(i) for i in ids}
+        stale = [key for key in self._entries if key.table == table and (id_set is None or key.id is None or key.id in id_set)]
+        for key in stale:
+            del self._entries[key]
+        logger.debug("Cache - Invalidated %s entries for table: %s", len(stale), table)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return the hit/miss counters and current occupancy."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
+
+
+menu_cache: MenuCache | None = None
+
+
+def collect_cache_metrics(registry: MetricsRegistry) -> None:
+    """Set the menu cache counters of `registry`, once the cache has been created."""
+    if menu_cache is None:
+        return
+    stats = menu_cache.stats()
+    for event, counter in (("hit", "hits"), ("miss", "misses"), ("eviction", "evictions")):
+        registry.set(CACHE_EVENTS, stats[counter], {"event": event})
+    registry.set(CACHE_ENTRIES, stats["size"])
+
+
+def get_menu_cache() -> MenuCache:
+    """
+    Retrieve the process-wide menu cache.
+
+    The cache is created on first use so the TTL and size bound are taken from
+    the loaded Configuration, falling back to the defaults when none is loaded.
+
+    Returns:
+        MenuCache: The shared cache instance.
+
+    """
+    global menu_cache  # noqa: PLW0603
+    if menu_cache is None:
+        config = get_config()
+        menu_cache = MenuCache(
+            ttl=getattr(config, "cache_ttl", DEFAULT_CACHE_TTL),
+            max_size=getattr(config, "cache_max_size", DEFAULT_CACHE_MAX_SIZE),
+        )
+        logger.info("Cache - Initialized with ttl=%ss; max_size=%s", menu_cache.ttl, menu_cache.max_size)
+    return menu_cache
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Answer a conditional GET for a cached read.
+
+    Sets the ETag and Cache-Control headers on the outgoing response and, when the
+    client's If-None-Match already holds `etag`, returns a bodyless 304 to send instead.
+
+    Args:
+        request (Request): The incoming request.
+        response (Response): The response FastAPI will render the body into.
+        etag (str): The strong ETag of the cached read.
+
+    Returns:
+        Response | None: A 304 response, or None if the full body must be sent.
+
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    response.headers.update(headers)
+
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the If-None-Match header of a request already holds `etag`, compared weakly."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
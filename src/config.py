@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+import os
 from enum import Enum
 from pathlib import Path
 
-from dotenv import dotenv_values
+from dotenv import dotenv_values, load_dotenv
 
 from utils.logger import logger
 
+DEFAULT_CACHE_TTL = 30.0
+DEFAULT_CACHE_MAX_SIZE = 1024
+DEFAULT_SNAPSHOT_MAX_AGE = 60.0
+DEFAULT_BULK_CHUNK_SIZE = 500
+DEFAULT_BULK_CONCURRENCY = 8
+DEFAULT_POOL_MAX_CONNECTIONS = 100
+DEFAULT_POOL_MAX_KEEPALIVE = 20
+DEFAULT_POOL_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_HTTP2 = True
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_POOL_TIMEOUT = 5.0
+DEFAULT_SQLITE_PATH = "micropos.db"
+DEFAULT_RATE_LIMIT = 20.0
+DEFAULT_RATE_LIMIT_BURST = 100.0
+
 
 class Environment(str, Enum):
     """Enumeration for different application environments."""
@@ -17,13 +34,44 @@ class Environment(str, Enum):
     PRODUCTION = "production"
 
 
+class Backend(str, Enum):
+    """Enumeration for where the routers read and write their tables."""
+
+    SUPABASE = "supabase"
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
+class CountStrategy(str, Enum):
+    """Enumeration for the row count PostgREST computes alongside a read."""
+
+    NONE = "none"
+    PLANNED = "planned"
+    ESTIMATED = "estimated"
+    EXACT = "exact"
+
+    @property
+    def method(self) -> str | None:
+        """Return the `count` argument for a PostgREST select, or None to skip counting."""
+        return None if self is CountStrategy.NONE else self.value
+
+
 class Configuration:
     """
     Singleton class for application settings configuration.
 
     This class loads and holds configuration settings for the application
     based on the defined environment. Settings include the version,
-    API URL, API key, environment, and debug flag.
+    API URL, API key, environment, debug flag, the menu cache bounds, how long
+    the menu snapshot is kept before it is loaded again, the
+    per-route count strategies (`COUNT_<ROUTE>`, e.g. `COUNT_GET_ITEMS = planned`),
+    the number of rows sent per upstream call by bulk writes and how many of
+    those calls a bulk update has in flight at once, whether reads
+    skip response model validation, the connection pool and timeouts of
+    the upstream HTTP clients, whether responses carry a Server-Timing header,
+    the backend the tables are stored in (`BACKEND = supabase|memory|sqlite`),
+    the tokens per second and burst each client is rate limited to, and the
+    API keys and terminal ids clients are rate limited by (`RATE_LIMIT_CLIENTS`).
     """
 
     version: str
@@ -31,6 +79,26 @@ class Configuration:
     key: str
     environment: Environment
     debug: bool
+    cache_ttl: float
+    cache_max_size: int
+    snapshot_max_age: float
+    count_defaults: dict[str, CountStrategy]
+    bulk_chunk_size: int
+    bulk_concurrency: int
+    fast_serialization: bool
+    pool_max_connections: int
+    pool_max_keepalive: int
+    pool_keepalive_expiry: float
+    http2: bool
+    connect_timeout: float
+    read_timeout: float
+    pool_timeout: float
+    server_timing: bool
+    backend: Backend
+    sqlite_path: str
+    rate_limit: float
+    rate_limit_burst: float
+    rate_limit_clients: frozenset[str]
 
     _instance: Configuration | None = None
 
@@ -78,26 +146,60 @@ class Configuration:
 
         This method determines the appropriate .env file based on the
         provided environment and loads its variables into the Configuration class.
+        Without a file, the variables are read from the process environment
+        instead, as long as it sets API_URL, or BACKEND for a local backend.
 
         Args:
             env (str | None): The environment as a string.
 
         Raises:
-            FileNotFoundError: If the environment file does not exist.
+            FileNotFoundError: If the environment file does not exist and the process environment has no API_URL or BACKEND.
 
         """
         environment = cls._from_str(env)
         root_dir = Path(__file__).parent.parent
         env_file = root_dir / f".env.{environment.value}"
 
+        config = None
         if env_file.exists():
             logger.info("Config - Loading from: %s", env_file)
             config = dotenv_values(env_file)
+        elif os.environ.get("API_URL") or os.environ.get("BACKEND"):
+            logger.info("Config - Loading from the process environment")
+            config = dict(os.environ)
+
+        if config is not None:
             cls.version = config.get("VERSION")
             cls.api_url = config.get("API_URL")
             cls.api_key = config.get("API_KEY")
             cls.environment = config.get("ENVIRONMENT")
             cls.debug = config.get("DEBUG")
+            cls.cache_ttl = float(config.get("CACHE_TTL") or DEFAULT_CACHE_TTL)
+            cls.cache_max_size = int(config.get("CACHE_MAX_SIZE") or DEFAULT_CACHE_MAX_SIZE)
+            cls.snapshot_max_age = float(config.get("SNAPSHOT_MAX_AGE") or DEFAULT_SNAPSHOT_MAX_AGE)
+            cls.count_defaults = {
+                key.removeprefix("COUNT_").lower(): CountStrategy(cls._to_lower(value))
+                for key, value in config.items()
+                if key.startswith("COUNT_") and value
+            }
+            cls.bulk_chunk_size = int(config.get("BULK_CHUNK_SIZE") or DEFAULT_BULK_CHUNK_SIZE)
+            cls.bulk_concurrency = max(1, int(config.get("BULK_CONCURRENCY") or DEFAULT_BULK_CONCURRENCY))
+            cls.fast_serialization = cls._to_lower(config.get("FAST_SERIALIZATION") or "false") == "true"
+            cls.pool_max_connections = int(config.get("POOL_MAX_CONNECTIONS") or DEFAULT_POOL_MAX_CONNECTIONS)
+            cls.pool_max_keepalive = int(config.get("POOL_MAX_KEEPALIVE") or DEFAULT_POOL_MAX_KEEPALIVE)
+            cls.pool_keepalive_expiry = float(config.get("POOL_KEEPALIVE_EXPIRY") or DEFAULT_POOL_KEEPALIVE_EXPIRY)
+            cls.http2 = cls._to_lower(config.get("HTTP2") or str(DEFAULT_HTTP2)) == "true"
+            cls.connect_timeout = float(config.get("CONNECT_TIMEOUT") or DEFAULT_CONNECT_TIMEOUT)
+            cls.read_timeout = float(config.get("READ_TIMEOUT") or DEFAULT_READ_TIMEOUT)
+            cls.pool_timeout = float(config.get("POOL_TIMEOUT") or DEFAULT_POOL_TIMEOUT)
+            cls.server_timing = cls._to_lower(config.get("SERVER_TIMING") or "false") == "true"
+            cls.backend = Backend(cls._to_lower(config.get("BACKEND") or Backend.SUPABASE.value))
+            cls.sqlite_path = config.get("SQLITE_PATH") or DEFAULT_SQLITE_PATH
+            cls.rate_limit = float(config.get("RATE_LIMIT") or DEFAULT_RATE_LIMIT)
+            cls.rate_limit_burst = float(config.get("RATE_LIMIT_BURST") or DEFAULT_RATE_LIMIT_BURST)
+            cls.rate_limit_clients = frozenset(
+                client.strip() for client in (config.get("RATE_LIMIT_CLIENTS") or "").split(",") if client.strip()
+            )
             return
 
         msg = f"Config - No environment file found for {environment}. Looked for: {env_file}"
@@ -152,6 +254,46 @@ def get_config() -> Configuration:
     """
     return Configuration.get_instance()
 
+
+def resolve_config() -> Configuration:
+    """
+    Resolve the application settings configuration of this process.
+
+    On the first call `.env` is loaded, without overriding variables that are
+    already set, and the Configuration of its ENVIRONMENT is parsed. Later calls
+    return that same instance without touching the filesystem.
+
+    Returns:
+        Configuration: The singleton instance of Configuration containing the configuration.
+
+    """
+    if Configuration.get_instance() is None:
+        load_dotenv()
+        set_config(os.getenv("ENVIRONMENT"))
+    return get_config()
+
+
+def get_count_strategy(route: str, requested: CountStrategy | None, default: CountStrategy) -> CountStrategy:
+    """
+    Resolve the count strategy for a read.
+
+    An explicit `count` query parameter wins, followed by the route's
+    `COUNT_<ROUTE>` setting, followed by the route's built-in default.
+
+    Args:
+        route (str): The name of the route handler, e.g. `get_items`.
+        requested (CountStrategy | None): The strategy requested by the client.
+        default (CountStrategy): The strategy used when nothing else is configured.
+
+    Returns:
+        CountStrategy: The strategy to pass through to PostgREST.
+
+    """
+    if requested is not None:
+        return requested
+    return getattr(get_config(), "count_defaults", {}).get(route, default)
+
+
 def set_config(env: str | None) -> None:
     """
     Set the application settings configuration for the specified environment.
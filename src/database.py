@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from dotenv import load_dotenv
 from fastapi import FastAPI
 
-from src.config import get_config, set_config
-from supabase import AClient, acreate_client
+from src.cache import collect_cache_metrics
+from src.config import Backend, resolve_config
+from src.metrics import metrics
+from src.repository.base import Repository
+from src.repository.local import LocalClient
+from src.repository.memory import MemoryEngine
+from src.repository.sqlite import SQLiteEngine
+from src.transport import PooledClient, PoolSettings, create_pooled_client
 from utils.exceptions import ClientInitializationError, get_error_id
 from utils.logger import logger
 
-supabase_client: AClient | None = None
+supabase_client: Repository | None = None
 
 
 @asynccontextmanager
@@ -20,8 +27,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # noqa: ARG001
     """
     Asynchronous context manager that manages the lifespan of the FastAPI application.
 
-    During startup, it initializes the global Supabase client and adds a session.
-    When the application shuts down, it logs the user out of Supabase.
+    During startup, it initializes the global client of the configured backend.
+    When the application shuts down, it closes the client, which for Supabase logs
+    the user out and closes the connection pool. Every worker process runs its own
+    lifespan, so each one owns a client and pool that no other process shares. The pool and cache stats
+    are added to the metrics, which are written to the shared metrics directory
+    every second when several workers run.
 
     Args:
         app (FastAPI): The FastAPI application instance.
@@ -30,44 +41,89 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # noqa: ARG001
         None: Yields control during the lifespan of the application.
 
     """
-    logger.info("Client - Adding session")
+    logger.info("Client - Adding session: pid=%s", os.getpid())
     global supabase_client  # noqa: PLW0603
-    supabase_client = await create_supabase()
-    yield
-    await supabase_client.auth.sign_out()
+    supabase_client = await create_repository()
+    transport = getattr(supabase_client, "transport", None)
+    if transport is not None:
+        metrics.add_collector(transport.collect)
+    metrics.add_collector(collect_cache_metrics)
+    flush_task = asyncio.create_task(metrics.flush_periodically()) if metrics.directory is not None else None
+    try:
+        yield
+    finally:
+        client, supabase_client = supabase_client, None
+        if flush_task is not None:
+            flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flush_task
+        try:
+            await client.close()
+        finally:
+            metrics.close()
+            if transport is not None:
+                metrics.remove_collector(transport.collect)
+            metrics.remove_collector(collect_cache_metrics)
+            logger.info("Client - Closed session: pid=%s", os.getpid())
+
+
+async def create_repository() -> Repository:
+    """
+    Create the repository of the configured backend.
+
+    The Supabase backend connects to the configured project. The memory and
+    SQLite backends run fully offline: the memory backend starts empty in every
+    worker, while the SQLite database at SQLITE_PATH persists and can be shared.
+
+    Returns:
+        Repository: The client the routers query.
+
+    """
+    config = resolve_config()
+    backend = getattr(config, "backend", Backend.SUPABASE)
+    if backend is Backend.SUPABASE:
+        return await create_supabase()
+
+    logger.info("Client - Using the local %s backend", backend.value)
+    if backend is Backend.MEMORY:
+        return LocalClient(MemoryEngine())
+    return LocalClient(SQLiteEngine(config.sqlite_path))
 
 
-async def create_supabase() -> AClient:
+async def create_supabase() -> PooledClient:
     """
     Create and return an asynchronous Supabase client.
 
     This contains a workaround for passing through the
-    environment to the Configuration class.
+    environment to the Configuration class. The client's
+    PostgREST and storage requests share one connection pool
+    sized by the pool settings of the Configuration.
 
     Returns:
-        AClient: An instance of the asynchronous Supabase client.
+        PooledClient: An instance of the asynchronous Supabase client.
 
     """
     logger.info("Client - Connecting to supabase instance")
 
-    load_dotenv()
-    set_config(os.getenv("ENVIRONMENT"))
-    config = get_config()
+    config = resolve_config()
 
-    return await acreate_client(
+    return await create_pooled_client(
         config.api_url,
         config.api_key,
+        PoolSettings.from_config(config),
     )
 
 
-def get_supabase_client() -> AClient:
+def get_supabase_client() -> Repository:
     """
-    Retrieve the initialized Supabase client.
+    Retrieve the initialized client of the configured backend.
 
-    If the client has not been initialized, logs an error and raises a ClientInitializationError.
+    This is the Supabase client unless a local backend is configured, in which
+    case it is a LocalClient answering the same queries. If the client has not
+    been initialized, logs an error and raises a ClientInitializationError.
 
     Returns:
-        AClient: The initialized Supabase client.
+        Repository: The initialized client.
 
     Raises:
         ClientInitializationError: If the Supabase client is not initialized.
@@ -80,5 +136,5 @@ def get_supabase_client() -> AClient:
         raise ClientInitializationError(
             msg,
         )
-    logger.info("Client - Session started")
+    logger.debug("Client - Session started")
     return supabase_client
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import os
+import tempfile
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+
+from utils.logger import logger
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+DEFAULT_FLUSH_INTERVAL = 1.0
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+
+class Metric(NamedTuple):
+    """Name, type and help text of one metric family."""
+
+    name: str
+    type: MetricType
+    help: str
+    buckets: tuple[float, ...] = ()
+
+
+HTTP_REQUESTS = Metric("micropos_http_requests_total", "counter", "Requests served, by route template and status.")
+HTTP_REQUEST_DURATION = Metric(
+    "micropos_http_request_duration_seconds",
+    "histogram",
+    "Time to serve a request, by route template.",
+    DEFAULT_BUCKETS,
+)
+HTTP_IN_FLIGHT = Metric("micropos_http_requests_in_flight", "gauge", "Requests being served.")
+UPSTREAM_DURATION = Metric(
+    "micropos_upstream_request_duration_seconds",
+    "histogram",
+    "Time from sending a Supabase request until its body is closed, by table and operation.",
+    DEFAULT_BUCKETS,
+)
+RATE_LIMITED = Metric("micropos_rate_limit_rejections_total", "counter", "Requests rejected by the rate limiter, by route template.")
+ERRORS = Metric("micropos_errors_total", "counter", "Requests failed with a server error or an unhandled exception, by exception class.")
+CACHE_EVENTS = Metric("micropos_menu_cache_events_total", "counter", "Menu cache hits, misses and evictions.")
+CACHE_ENTRIES = Metric("micropos_menu_cache_entries", "gauge", "Entries held by the menu cache.")
+POOL_CONNECTIONS = Metric("micropos_pool_connections", "gauge", "Upstream connections open, by state.")
+POOL_CONNECTIONS_OPENED = Metric("micropos_pool_connections_opened_total", "counter", "Upstream connections opened.")
+POOL_IN_FLIGHT = Metric("micropos_pool_requests_in_flight", "gauge", "Upstream requests holding a connection.")
+POOL_WAITS = Metric("micropos_pool_waits_total", "counter", "Upstream requests that queued for a connection.")
+POOL_WAIT_SECONDS = Metric("micropos_pool_wait_seconds_total", "counter", "Time upstream requests spent acquiring a connection.")
+
+
+def _label_key(labels: dict[str, str] | None) -> str:
+    """Encode labels as a string, so series can be dictionary keys and JSON object keys alike."""
+    return json.dumps(sorted(labels.items())) if labels else "[]"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: str, extra: tuple[str, str] | None = None) -> str:
+    pairs = [tuple(pair) for pair in json.loads(key)]
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def merge(snapshots: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Add up the snapshots of several workers.
+
+    Counters and histograms are summed since each worker counts its own requests.
+    Gauges are summed too, as every one of them is a per-worker quantity such as
+    requests in flight or connections open.
+    """
+    merged: dict[str, Any] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "values": {}})
+            for key, value in family["values"].items():
+                current = target["values"].get(key)
+                if current is None:
+                    target["values"][key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    target["values"][key] = [a + b for a, b in zip(current, value, strict=True)]
+                else:
+                    target["values"][key] = current + value
+    return merged
+
+
+def render(snapshot: dict[str, Any]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = []
+    for name in sorted(snapshot):
+        family = snapshot[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for key in sorted(family["values"]):
+            value = family["values"][key]
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                continue
+            # Buckets are stored individually; the exposition format wants them cumulative.
+            *counts, total = value
+            cumulative = 0.0
+            for bound, count in zip([*family["buckets"], float("inf")], counts, strict=True):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {_format_value(cumulative)}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(key)} {_format_value(cumulative)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and histograms.
+
+    When a directory is given, each worker process writes its values to
+    `<directory>/<pid>.json` and a scrape of any worker adds up the files of
+    all of them, so the numbers cover every uvicorn worker. Files of workers
+    that have exited are kept, as their counters are part of the totals.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        """
+        Initialize the MetricsRegistry.
+
+        Args:
+            directory: Directory shared by the worker processes, or None for a single process.
+
+        """
+        self.directory = directory
+        self._families: dict[str, Metric] = {}
+        self._values: dict[str, dict[str, Any]] = {}
+        self._collectors: list[Callable[[MetricsRegistry], None]] = []
+
+    def _series(self, metric: Metric) -> dict[str, Any]:
+        if metric.name not in self._families:
+            self._families[metric.name] = metric
+            self._values[metric.name] = {}
+        return self._values[metric.name]
+
+    def inc(self, metric: Metric, labels: dict[str, str] | None = None, amount: float = 1) -> None:
+        """Add `amount` to a counter or gauge."""
+        series = self._series(metric)
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + amount
+
+    def set(self, metric: Metric, value: float, labels: dict[str, str] | None = None) -> None:
+        """Set a gauge, or a counter kept elsewhere, to `value`."""
+        self._series(metric)[_label_key(labels)] = value
+
+    def observe(self, metric: Metric, value: float, labels: dict[str, str] | None = None) -> None:
+        """Record one observation in a histogram."""
+        series = self._series(metric)
+        key = _label_key(labels)
+        counts = series.get(key)
+        if counts is None:
+            # One slot per bucket, one for observations above the last bound, and the sum.
+            counts = series[key] = [0] * (len(metric.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(metric.buckets, value)] += 1
+        counts[-1] += value
+
+    def add_collector(self, collector: Callable[[MetricsRegistry], None]) -> None:
+        """Register a callable that sets values kept elsewhere, such as pool stats, before each snapshot."""
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[MetricsRegistry], None]) -> None:
+        """Unregister a collector added with `add_collector`."""
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the values of this process as a JSON serializable dictionary."""
+        for collector in self._collectors:
+            collector(self)
+        return {
+            name: {
+                "type": metric.type,
+                "help": metric.help,
+                "buckets": list(metric.buckets),
+                "values": {key: list(value) if isinstance(value, list) else value for key, value in self._values[name].items()},
+            }
+            for name, metric in self._families.items()
+        }
+
+    def _path(self) -> Path:
+        return self.directory / f"{os.getpid()}.json"
+
+    def _write(self, snapshot: dict[str, Any]) -> None:
+        """Replace this process's file atomically, so a reader never sees it half written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+        Path(tmp).replace(self._path())
+
+    def _read_all(self) -> list[dict[str, Any]]:
+        snapshots = []
+        for path in self.directory.glob("*.json"):
+            try:
+                snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                logger.warning("Metrics - Skipping unreadable file: %s", path)
+        return snapshots
+
+    def write(self) -> None:
+        """Write the values of this process to the shared directory, if any."""
+        if self.directory is not None:
+            self._write(self.snapshot())
+
+    def close(self) -> None:
+        """Write the final values of this process, dropping its gauges since it no longer serves anything."""
+        if self.directory is None:
+            return
+        snapshot = {name: family for name, family in self.snapshot().items() if family["type"] != "gauge"}
+        try:
+            self._write(snapshot)
+        except OSError:
+            logger.exception("Metrics - Failed to write %s", self._path())
+
+    def collect(self) -> str:
+        """Return the values of every worker in the Prometheus text exposition format."""
+        return self.render_shared(self.snapshot())
+
+    def render_shared(self, snapshot: dict[str, Any]) -> str:
+        """
+        Render a snapshot of this process, added up with the files of the other workers.
+
+        Only this part does file I/O, so it can run in a thread. The snapshot must be
+        taken on the event loop, which is the only place values change.
+        """
+        if self.directory is None:
+            return render(snapshot)
+        self._write(snapshot)
+        return render(merge(self._read_all()))
+
+    async def flush_periodically(self, interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        """Write the values of this process every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            # Take the snapshot on the event loop, which is the only place values change.
+            snapshot = self.snapshot()
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except OSError:
+                logger.exception("Metrics - Failed to write %s", self._path())
+
+
+metrics = MetricsRegistry(Path(directory) if (directory := os.getenv("METRICS_DIR")) else None)
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Retrieve the process-wide metrics registry.
+
+    The shared directory is read from METRICS_DIR, which the launcher sets
+    before starting several workers so they all agree on it.
+
+    Returns:
+        MetricsRegistry: The shared registry instance.
+
+    """
+    return metrics
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import inspect
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics import ERRORS, HTTP_IN_FLIGHT, HTTP_REQUEST_DURATION, HTTP_REQUESTS, metrics
+from src.timing import CACHE, SERIALIZATION, UPSTREAM, VALIDATION, RequestTimings, timings_var
+from utils.exceptions import request_id_var
+from utils.logger import access_logger
+
+REQUEST_ID_HEADER = "X-Request-ID"
+MAX_REQUEST_ID_LENGTH = 128
+# Paths that match no route share one label, so unknown paths never become series.
+UNMATCHED_ROUTE = "unmatched"
+SERVER_TIMING_PREFIXES = ("/item", "/category", "/storage")
+SERVER_TIMING_DESCRIPTIONS = {
+    UPSTREAM: "Supabase round trip",
+    VALIDATION: "Request validation",
+    SERIALIZATION: "Response validation and serialization",
+    CACHE: "Cache lookup",
+}
+
+
+class TimedRoute(APIRoute):
+    """
+    Route that records how long FastAPI spends around the endpoint.
+
+    The time from the start of the route handler until the endpoint is called,
+    spent parsing and validating the request and resolving dependencies, is
+    recorded as validation. The time after the endpoint returns, spent validating
+    the response against the response model and serializing it, is recorded as
+    serialization.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401 # passed on to APIRoute
+        """Initialize the route and time calls to its endpoint."""
+        super().__init__(*args, **kwargs)
+        # The dependant is analysed from the original endpoint during __init__,
+        # so wrapping it afterwards leaves the signature FastAPI sees untouched.
+        call = self.dependant.call
+        if not inspect.iscoroutinefunction(call):
+            return
+
+        async def timed_call(**values: Any) -> Any:  # noqa: ANN401 # stands in for any endpoint
+            started = time.perf_counter()
+            timings = timings_var.get()
+            if timings is not None:
+                timings.endpoint_started = started
+            try:
+                return await call(**values)
+            finally:
+                if timings is not None:
+                    timings.endpoint += time.perf_counter() - started
+
+        self.dependant.call = timed_call
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        """Wrap the route handler to record the time spent outside the endpoint."""
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = timings_var.get()
+            if timings is None:
+                return await handler(request)
+            started = time.perf_counter()
+            endpoint_before = timings.endpoint
+            timings.endpoint_started = None
+            try:
+                return await handler(request)
+            finally:
+                elapsed = time.perf_counter() - started
+                # A request rejected before reaching the endpoint spent all its time validating.
+                validation = elapsed if timings.endpoint_started is None else timings.endpoint_started - started
+                timings.add(VALIDATION, validation)
+                timings.add(SERIALIZATION, elapsed - validation - (timings.endpoint - endpoint_before))
+
+        return timed_handler
+
+
+async def count_server_errors(request: Request, exc: HTTPException) -> Response:
+    """
+    Count a server error response by the exception it was raised from, then render it as usual.
+
+    Route handlers log a failure with an error id and re-raise it as an HTTPException,
+    so this is the one place a handled error is counted; unhandled exceptions are
+    counted by AccessLogMiddleware instead.
+    """
+    if exc.status_code >= 500:  # noqa: PLR2004
+        metrics.inc(ERRORS, {"exception": type(exc.__cause__ or exc).__name__})
+    return await http_exception_handler(request, exc)
+
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware writing one JSON line per request to the access log.
+
+    Each request gets an id, taken from its X-Request-ID header when present,
+    which is echoed back on the response and prefixed to every error id logged
+    while serving it. The line breaks the total latency down into time awaiting
+    Supabase, validating, serializing and looking up the cache. The same request is
+    counted in the request metrics of its route template.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware around `app`."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve the request, then log it."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        incoming_id = headers.get(REQUEST_ID_HEADER.lower().encode(), b"").decode("latin-1")
+        request_id = incoming_id[:MAX_REQUEST_ID_LENGTH] or uuid.uuid4().hex
+        # The app adds this middleware last, so it is outermost: the ServerTimingMiddleware
+        # inside it finds these timings and reports the same ones in its header.
+        timings = timings_var.get() or RequestTimings()
+        request_id_token = request_id_var.set(request_id)
+        timings_token = timings_var.set(timings)
+
+        status = 500
+        request_bytes = 0
+        response_bytes = 0
+        started = time.perf_counter()
+        metrics.inc(HTTP_IN_FLIGHT)
+
+        async def receive_counted() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_counted(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (REQUEST_ID_HEADER.lower().encode(), request_id.encode("latin-1"))]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_counted, send_counted)
+        except Exception as e:
+            metrics.inc(ERRORS, {"exception": type(e).__name__})
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            route = scope.get("route")
+            route_path = getattr(route, "path", None)
+            metrics.inc(HTTP_IN_FLIGHT, amount=-1)
+            metrics.inc(HTTP_REQUESTS, {"method": scope["method"], "route": route_path or UNMATCHED_ROUTE, "status": str(status)})
+            metrics.observe(HTTP_REQUEST_DURATION, duration, {"method": scope["method"], "route": route_path or UNMATCHED_ROUTE})
+            access_logger.info(
+                json.dumps(
+                    {
+                        "time": datetime.now(UTC).isoformat(),
+                        "request_id": request_id,
+                        "method": scope["method"],
+                        "route": route_path,
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": round(duration * 1000, 3),
+                        "upstream_ms": round(timings.get(UPSTREAM) * 1000, 3),
+                        "upstream_calls": timings.upstream_calls,
+                        "validation_ms": round(timings.get(VALIDATION) * 1000, 3),
+                        "serialization_ms": round(timings.get(SERIALIZATION) * 1000, 3),
+                        "cache_ms": round(timings.get(CACHE) * 1000, 3),
+                        "request_bytes": request_bytes,
+                        "response_bytes": response_bytes,
+                    },
+                    separators=(",", ":"),
+                ),
+            )
+            request_id_var.reset(request_id_token)
+            timings_var.reset(timings_token)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware adding a Server-Timing header to the responses of some routers.
+
+    The header lists the timings of the request so far, such as the Supabase round
+    trip, validation, serialization, cache lookups and anything the route handler
+    recorded with `src.timing.timer`, plus the total, in milliseconds. Browsers show
+    it in their devtools and `curl -v` prints it. Timings are taken when the response
+    starts, so the body of a streamed response is not included.
+    """
+
+    def __init__(self, app: ASGIApp, prefixes: tuple[str, ...] = SERVER_TIMING_PREFIXES) -> None:
+        """
+        Initialize the middleware around `app`.
+
+        Args:
+            app: The ASGI app to wrap.
+            prefixes: Path prefixes of the routers whose responses get the header.
+
+        """
+        self.app = app
+        self.prefixes = prefixes
+
+    def _applies(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(f"{prefix}/") for prefix in self.prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve the request, adding the header when the response starts."""
+        if scope["type"] != "http" or not self._applies(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        timings = timings_var.get()
+        token = None
+        if timings is None:
+            timings = RequestTimings()
+            token = timings_var.set(timings)
+
+        async def send_timed(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"server-timing", format_server_timing(timings).encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            if token is not None:
+                timings_var.reset(token)
+
+
+def format_server_timing(timings: RequestTimings) -> str:
+    """Format the timings of a request as a Server-Timing header value."""
+    entries = [
+        f'{name};dur={seconds * 1000:.3f};desc="{SERVER_TIMING_DESCRIPTIONS[name]}"'
+        if name in SERVER_TIMING_DESCRIPTIONS
+        else f"{name};dur={seconds * 1000:.3f}"
+        for name, seconds in timings.spans.items()
+    ]
+    entries.append(f"total;dur={(time.perf_counter() - timings.started) * 1000:.3f}")
+    return ", ".join(entries)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from postgrest.base_request_builder import BaseFilterRequestBuilder
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+Builder = TypeVar("Builder", bound=BaseFilterRequestBuilder)
+
+
+def encode_cursor(row: dict[str, Any]) -> str:
+    """Encode the keyset position of a row as an opaque cursor."""
+    raw = json.dumps([row.get("created_at"), str(row["id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> tuple[str | None, str] | None:
+    """
+    Decode an opaque cursor back into its `(created_at, id)` keyset position.
+
+    The position is written into a PostgREST filter, so `created_at` must parse as
+    a timestamp, or be null for a row without one, and `id` as a UUID. Both are
+    returned re-rendered from the parsed values, never as the text the client sent.
+
+    Raises:
+        HTTPException: If the cursor was not produced by `encode_cursor`.
+
+    """
+    if cursor is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        position = None if created_at is None else datetime.fromisoformat(created_at).isoformat(), str(UUID(row_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, AttributeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from e
+    return position
+
+
+def paginate(query: Builder, after: tuple[str | None, str] | None, limit: int) -> Builder:
+    """
+    Restrict a select query to one keyset page ordered by (`created_at`, `id`).
+
+    `created_at` is nullable. Ascending order puts nulls last, so rows without it
+    come after every dated row, ordered by `id` alone. One row more than `limit`
+    is requested so the page knows whether another follows.
+
+    Args:
+        query: The select query to restrict.
+        after: The decoded cursor of the previous page, or None for the first page.
+        limit: The number of rows in a page.
+
+    Returns:
+        The restricted query.
+
+    """
+    if after is not None:
+        created_at, row_id = after
+        if created_at is None:
+            query = query.is_("created_at", "null").gt("id", row_id)
+        else:
+            query = query.or_(f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt.{row_id}),created_at.is.null')
+    return query.order("created_at").order("id").limit(limit + 1)
+
+
+def to_page(rows: list[dict[str, Any]], count: int | None, limit: int) -> dict[str, Any]:
+    """Trim the look-ahead row off a page and derive its `next_cursor`."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return {"data": rows, "count": count, "next_cursor": encode_cursor(rows[-1])}
+    return {"data": rows, "count": count, "next_cursor": None}
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import time
+from collections.abc import Container, Iterator
+from contextlib import contextmanager
+
+from fastapi import HTTPException, Request, status
+
+from src.config import DEFAULT_RATE_LIMIT, DEFAULT_RATE_LIMIT_BURST, get_config
+from src.metrics import RATE_LIMITED, metrics
+from src.middleware import UNMATCHED_ROUTE
+from utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl; buckets are then kept per process
+    fcntl = None
+
+# Tokens a request takes from its bucket. Reads are mostly served from the cache
+# or the menu snapshot, so they are cheap; bulk routes move whole tables.
+READ_COST = 1.0
+WRITE_COST = 5.0
+BULK_COST = 25.0
+BULK_SUFFIXES = ("/bulk", "/import", "/export")
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# The table is 4-way set associative: a key hashes to one set of four slots, so
+# finding its bucket reads at most four slots and locks only that set.
+DEFAULT_SETS = 4096
+WAYS = 4
+# Key hash, tokens left, time the tokens were last counted.
+SLOT = struct.Struct("<Qdd")
+SET_SIZE = SLOT.size * WAYS
+
+
+def key_hash(key: str) -> int:
+    """Hash a client key to a non-zero 64-bit integer; zero marks an empty slot."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+def route_cost(method: str, path: str) -> float:
+    """Return the tokens a request to a route takes: bulk routes cost the most, then writes, then reads."""
+    if path.endswith(BULK_SUFFIXES):
+        return BULK_COST
+    return READ_COST if method in READ_METHODS else WRITE_COST
+
+
+def client_key(request: Request, known_clients: Container[str] = frozenset()) -> str:
+    """
+    Return the key a request is limited under.
+
+    A client is told apart by its API key (`X-API-Key`, or a bearer token), then by
+    the terminal it identifies as (`X-Terminal-ID`), so terminals behind one NAT
+    each get their own bucket. Only values listed in `known_clients` are trusted:
+    an unchecked header could be changed on every request to get a full bucket and
+    push other clients' buckets out of the table. Requests without a known key or
+    terminal are limited by their address, the forwarded one behind a trusted proxy.
+    """
+    headers = request.headers
+    api_key = headers.get("x-api-key") or headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if api_key and api_key in known_clients:
+        return f"key:{api_key}"
+    terminal = headers.get("x-terminal-id")
+    if terminal and terminal in known_clients:
+        return f"terminal:{terminal}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class TokenBuckets:
+    """
+    Token buckets kept in a fixed-size table of shared memory.
+
+    With a path the table is a memory-mapped file, so every worker on the host
+    draws from the same buckets; each check locks only the set its key hashes to,
+    with an `fcntl` record lock. Without a path it is anonymous memory private to
+    the process. Either way a check touches a constant number of slots, whatever
+    the number of clients.
+
+    When a set is full the bucket counted longest ago is given up to the new key.
+    The client it belonged to starts again from a full bucket, so a collision can
+    only ever let a client through, never reject one.
+    """
+
+    def __init__(self, path: str | None = None, sets: int = DEFAULT_SETS) -> None:
+        """
+        Initialize the TokenBuckets.
+
+        Args:
+            path: File the table is shared through, or None to keep it in this process.
+            sets: Number of sets of slots in the table.
+
+        """
+        self.path = path
+        self.sets = sets
+        size = sets * SET_SIZE
+        self._fd: int | None = None
+        if path is None:
+            self._memory = mmap.mmap(-1, size)
+            return
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        # Workers agree on the size, so growing the file concurrently is harmless;
+        # the new bytes read as zeros, which are empty slots.
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._memory = mmap.mmap(self._fd, size)
+
+    @contextmanager
+    def _locked(self, offset: int) -> Iterator[None]:
+        if self._fd is None or fcntl is None:
+            yield
+            return
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, SET_SIZE, offset)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, SET_SIZE, offset)
+
+    def take(self, key: str, cost: float, rate: float, burst: float, now: float | None = None) -> float:
+        """
+        Take `cost` tokens from the bucket of `key` if it holds enough.
+
+        Buckets hold up to `burst` tokens and refill at `rate` tokens per second.
+
+        Args:
+            key: The client the bucket belongs to.
+            cost: Tokens the request takes, capped at `burst` so any request can pass eventually.
+            rate: Tokens added to a bucket per second.
+            burst: Tokens a bucket holds when full.
+            now: The current time of the monotonic clock, for tests.
+
+        Returns:
+            float: 0.0 if the tokens were taken, otherwise the seconds until the bucket holds enough.
+
+        """
+        now = time.monotonic() if now is None else now
+        cost = min(cost, burst)
+        hashed = key_hash(key)
+        offset = hashed % self.sets * SET_SIZE
+        memory = self._memory
+        with self._locked(offset):
+            oldest, oldest_time = offset, math.inf
+            for position in range(offset, offset + SET_SIZE, SLOT.size):
+                slot_key, tokens, updated = SLOT.unpack_from(memory, position)
+                if slot_key == hashed:
+                    tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+                    break
+                if updated < oldest_time:
+                    oldest, oldest_time = position, updated
+            else:
+                position, tokens = oldest, burst
+
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            SLOT.pack_into(memory, position, hashed, tokens - cost if wait == 0.0 else tokens, now)
+        return wait
+
+    def close(self) -> None:
+        """Unmap the table and close its file."""
+        self._memory.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class RateLimiter:
+    """Limits each client to `rate` tokens per second, with bursts of up to `burst` tokens."""
+
+    def __init__(self, buckets: TokenBuckets, rate: float, burst: float, known_clients: Container[str] = frozenset()) -> None:
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            buckets: Where the buckets are kept.
+            rate: Tokens a client gets per second; 0 disables limiting.
+            burst: Tokens a client can spend at once.
+            known_clients: API keys and terminal ids a client is limited by; any other client is limited by address.
+
+        """
+        self.buckets = buckets
+        self.rate = rate
+        self.burst = burst
+        self.known_clients = known_clients
+
+    @property
+    def enabled(self) -> bool:
+        """Whether requests are limited at all."""
+        return self.rate > 0 and self.burst > 0
+
+    def cost(self, request: Request) -> float:
+        """Return the tokens a request takes, from the template of the route it matched."""
+        route = request.scope.get("route")
+        return route_cost(request.method, getattr(route, "path", request.url.path))
+
+    def check(self, request: Request) -> float:
+        """Charge a request to its client, returning 0.0 if it may proceed or the seconds until it may."""
+        if not self.enabled:
+            return 0.0
+        return self.buckets.take(client_key(request, self.known_clients), self.cost(request), self.rate, self.burst)
+
+
+rate_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Retrieve the process-wide rate limiter.
+
+    The limiter is created on first use, with its rate and burst taken from the
+    loaded Configuration. Its buckets are shared through RATE_LIMIT_PATH, which
+    the launcher sets before starting several workers, and are private to the
+    process when it is unset.
+
+    Returns:
+        RateLimiter: The shared rate limiter instance.
+
+    """
+    global rate_limiter  # noqa: PLW0603
+    if rate_limiter is None:
+        config = get_config()
+        path = os.getenv("RATE_LIMIT_PATH") or None
+        rate_limiter = RateLimiter(
+            TokenBuckets(path),
+            rate=getattr(config, "rate_limit", DEFAULT_RATE_LIMIT),
+            burst=getattr(config, "rate_limit_burst", DEFAULT_RATE_LIMIT_BURST),
+            known_clients=getattr(config, "rate_limit_clients", frozenset()),
+        )
+        logger.info(
+            "RateLimit - Initialized with rate=%s/s; burst=%s; known_clients=%s; shared=%s",
+            rate_limiter.rate,
+            rate_limiter.burst,
+            len(rate_limiter.known_clients),
+            path or "no",
+        )
+    return rate_limiter
+
+
+async def rate_limit(request: Request) -> None:
+    """
+    Reject a request whose client has run out of tokens.
+
+    Used as a router dependency, so it runs after routing, when the cost of the
+    route is known. FastAPI reads and parses a JSON body before it runs the
+    dependencies, so a rejected bulk write has still been received; only routes
+    reading the body themselves, such as `/item/import`, are rejected unread.
+
+    Raises:
+        HTTPException: 429 with a Retry-After header if the client is over its limit.
+
+    """
+    wait = get_rate_limiter().check(request)
+    if wait > 0:
+        route = request.scope.get("route")
+        metrics.inc(RATE_LIMITED, {"route": getattr(route, "path", UNMATCHED_ROUTE)})
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any, Protocol, Self
+
+from postgrest import APIResponse
+
+from src.repository.filters import Group
+
+Row = dict[str, Any]
+Order = tuple[str, bool]
+
+
+def with_defaults(row: Row) -> Row:
+    """Fill in the columns the database would default for a new row: a random `id` and the `created_at` time."""
+    return {"id": str(uuid.uuid4()), "created_at": datetime.now(UTC).isoformat(), **row}
+
+
+class QueryBuilder(Protocol):
+    """
+    The part of the postgrest-py request builder the routers use.
+
+    Routers build a query with one action (`select`, `insert`, `upsert`, `update`
+    or `delete`), narrow it with filters, ordering and a limit, then `execute` it.
+    """
+
+    def select(self, *columns: str, count: str | None = None) -> Self: ...  # noqa: D102
+    def insert(self, json: Row | list[Row], **kwargs: object) -> Self: ...  # noqa: D102
+    def upsert(self, json: Row | list[Row], **kwargs: object) -> Self: ...  # noqa: D102
+    def update(self, json: Row, **kwargs: object) -> Self: ...  # noqa: D102
+    def delete(self, **kwargs: object) -> Self: ...  # noqa: D102
+    def eq(self, column: str, value: object) -> Self: ...  # noqa: D102
+    def in_(self, column: str, values: Iterable[object]) -> Self: ...  # noqa: D102
+    def or_(self, filters: str) -> Self: ...  # noqa: D102
+    def order(self, column: str, *, desc: bool = False) -> Self: ...  # noqa: D102
+    def limit(self, size: int) -> Self: ...  # noqa: D102
+    async def execute(self) -> APIResponse: ...  # noqa: D102
+
+
+class Repository(Protocol):
+    """
+    Where the routers read and write their tables.
+
+    The Supabase client (`src.transport.PooledClient`) and the local engines
+    (`src.repository.local.LocalClient`) both implement it, so routers written
+    against `client.table(...)` run unchanged on either.
+    """
+
+    def table(self, table_name: str) -> QueryBuilder: ...  # noqa: D102
+    async def close(self) -> None: ...  # noqa: D102
+
+
+class Engine(ABC):
+    """
+    Storage of a local backend.
+
+    Engines receive parsed queries and return whole rows; projection, defaults
+    and timing are left to the LocalClient that calls them. Every engine keeps
+    an index on `id` and on `is_available`, the columns the routers filter on.
+    """
+
+    # Blocking engines are called from a worker thread rather than the event loop.
+    blocking = False
+
+    @abstractmethod
+    def select(self, table: str, where: Group, order: list[Order], limit: int | None, offset: int) -> tuple[list[Row], int]:
+        """Return one page of the rows matching `where` together with the number of rows matching it."""
+
+    @abstractmethod
+    def insert(self, table: str, rows: list[Row], *, upsert: bool) -> list[Row]:
+        """
+        Store new rows, or with `upsert` merge them into the rows with the same id, and return them.
+
+        New rows get their defaults from `with_defaults`.
+
+        Raises:
+            APIError: If a row without `upsert` has the id of a stored row.
+
+        """
+
+    @abstractmethod
+    def update(self, table: str, patch: Row, where: Group) -> list[Row]:
+        """Apply `patch` to the rows matching `where` and return them."""
+
+    @abstractmethod
+    def delete(self, table: str, where: Group) -> list[Row]:
+        """Remove the rows matching `where` and return them."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release whatever the engine holds open."""
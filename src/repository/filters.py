@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, Literal, NamedTuple
+
+OPERATORS = ("eq", "neq", "gt", "gte", "lt", "lte", "in", "is")
+
+
+class Condition(NamedTuple):
+    """One `column=operator.value` filter. `value` is a tuple for `in` filters."""
+
+    column: str
+    operator: str
+    value: str | tuple[str, ...]
+
+
+class Group(NamedTuple):
+    """Filters joined by `and` or `or`."""
+
+    operator: Literal["and", "or"]
+    terms: tuple[Condition | Group, ...]
+
+    def equalities(self, column: str) -> set[str] | None:
+        """
+        Return the values `column` is restricted to by this group, if it is.
+
+        Only an `and` group restricts a column, through one of its own `eq` or
+        `in` terms. An index can then be used to find the candidate rows.
+        """
+        if self.operator != "and":
+            return None
+        for term in self.terms:
+            if isinstance(term, Condition) and term.column == column:
+                if term.operator == "eq":
+                    return {term.value}
+                if term.operator == "in":
+                    return set(term.value)
+        return None
+
+
+Node = Condition | Group
+MATCH_ALL = Group("and", ())
+
+
+def to_text(value: object) -> str:
+    """Render a column value the way PostgREST compares it with a filter value."""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return "" if value is None else str(value)
+
+
+def normalize(value: object) -> str:
+    """Render a filter value, writing booleans as PostgREST does whatever their case."""
+    text = to_text(value)
+    return text.lower() if text.lower() in ("true", "false") else text
+
+
+def unquote(value: str) -> str:
+    """Strip the double quotes PostgREST puts around values holding reserved characters."""
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value  # noqa: PLR2004
+
+
+def split_terms(expression: str) -> list[str]:
+    """Split a PostgREST logical expression on the commas outside parentheses and quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in expression:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def condition(column: str, operator: str, value: str) -> Condition:
+    """
+    Build a Condition from the parts of a PostgREST filter.
+
+    Raises:
+        ValueError: If the operator is not supported.
+
+    """
+    if operator not in OPERATORS:
+        msg = f"Repository - Unsupported filter operator: {operator}"
+        raise ValueError(msg)
+    if operator == "in":
+        return Condition(column, operator, tuple(normalize(unquote(part)) for part in split_terms(value.strip("()")) if part))
+    return Condition(column, operator, normalize(unquote(value)))
+
+
+def parse_logical(expression: str) -> Node:
+    """Parse an `and(...)`/`or(...)` group or a `column.operator.value` term, as passed to `or_`."""
+    for operator in ("and", "or"):
+        if expression.startswith(f"{operator}("):
+            return Group(operator, tuple(parse_logical(part) for part in split_terms(expression[len(operator) + 1 : -1])))
+    column, operator, value = expression.split(".", 2)
+    return condition(column, operator, value)
+
+
+def parse_params(params: Iterable[tuple[str, str]], reserved: Iterable[str] = ()) -> Group:
+    """Parse the filters of a PostgREST query string into one `and` group, skipping `reserved` keys."""
+    skipped = set(reserved)
+    terms: list[Node] = []
+    for key, value in params:
+        if key in skipped:
+            continue
+        if key in ("and", "or"):
+            terms.append(parse_logical(f"{key}{value}"))
+            continue
+        operator, _, operand = value.partition(".")
+        terms.append(condition(key, operator, operand))
+    return Group("and", tuple(terms))
+
+
+def _compare(value: object, operator: str, operand: str) -> bool:
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        try:
+            left, right = float(value), float(operand)
+        except ValueError:
+            left, right = to_text(value), operand
+    else:
+        left, right = normalize(value), operand
+    if operator == "eq":
+        return left == right
+    if operator == "neq":
+        return left != right
+    if operator == "gt":
+        return left > right
+    if operator == "gte":
+        return left >= right
+    if operator == "lt":
+        return left < right
+    return left <= right
+
+
+def matches(node: Node, row: dict[str, Any]) -> bool:
+    """Return whether a row satisfies a filter tree."""
+    if isinstance(node, Group):
+        combine = all if node.operator == "and" else any
+        return combine(matches(term, row) for term in node.terms)
+    value = row.get(node.column)
+    if node.operator == "in":
+        return normalize(value) in node.value
+    if node.operator == "is":
+        return normalize(value) == ("" if node.value == "null" else node.value)
+    return _compare(value, node.operator, node.value)
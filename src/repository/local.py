@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable
+from typing import Any, Self
+
+from postgrest import APIResponse
+
+from src.metrics import UPSTREAM_DURATION, metrics
+from src.repository.base import Engine, Order, Row
+from src.repository.filters import Condition, Group, Node, condition, normalize, parse_logical
+from src.timing import record_upstream
+
+
+class LocalQuery:
+    """
+    Query against a local engine, built the way a postgrest-py request is.
+
+    Filters are kept as parsed conditions rather than query parameters, and
+    `execute` hands them straight to the engine. The time it takes is recorded
+    as upstream time, so timings and metrics read the same as with Supabase.
+    """
+
+    def __init__(self, client: LocalClient, table: str) -> None:
+        """
+        Initialize the LocalQuery.
+
+        Args:
+            client: The client whose engine runs the query.
+            table: The table the query acts on.
+
+        """
+        self.client = client
+        self.table = table
+        self.action = "select"
+        self.columns: list[str] | None = None
+        self.count: str | None = None
+        self.payload: Row | list[Row] | None = None
+        self.terms: list[Node] = []
+        self.ordering: list[Order] = []
+        self.size: int | None = None
+        self.skip = 0
+
+    def select(self, *columns: str, count: str | None = None) -> Self:
+        """Read rows, keeping only `columns` unless they are `*`."""
+        names = [name.strip() for column in columns for name in column.split(",") if name.strip()]
+        self.action = "select"
+        self.columns = None if not names or "*" in names else names
+        self.count = count
+        return self
+
+    def insert(self, json: Row | list[Row], *, count: str | None = None, upsert: bool = False, **kwargs: object) -> Self:  # noqa: ARG002
+        """Insert one or several rows."""
+        self.action = "upsert" if upsert else "insert"
+        self.payload = json
+        self.count = count
+        return self
+
+    def upsert(self, json: Row | list[Row], *, count: str | None = None, **kwargs: object) -> Self:  # noqa: ARG002
+        """Insert rows, merging them into the existing rows with the same id. Conflicts are always resolved on `id`."""
+        return self.insert(json, count=count, upsert=True)
+
+    def update(self, json: Row, *, count: str | None = None, **kwargs: object) -> Self:  # noqa: ARG002
+        """Update the filtered rows with the given columns."""
+        self.action = "update"
+        self.payload = json
+        self.count = count
+        return self
+
+    def delete(self, *, count: str | None = None, **kwargs: object) -> Self:  # noqa: ARG002
+        """Delete the filtered rows."""
+        self.action = "delete"
+        self.count = count
+        return self
+
+    def filter(self, column: str, operator: str, criteria: str) -> Self:
+        """Add a filter in PostgREST syntax, e.g. `filter("id", "eq", "1")`."""
+        self.terms.append(condition(column, operator, criteria))
+        return self
+
+    def eq(self, column: str, value: object) -> Self:  # noqa: D102
+        return self.filter(column, "eq", str(value))
+
+    def neq(self, column: str, value: object) -> Self:  # noqa: D102
+        return self.filter(column, "neq", str(value))
+
+    def gt(self, column: str, value: object) -> Self:  # noqa: D102
+        return self.filter(column, "gt", str(value))
+
+    def gte(self, column: str, value: object) -> Self:  # noqa: D102
+        return self.filter(column, "gte", str(value))
+
+    def lt(self, column: str, value: object) -> Self:  # noqa: D102
+        return self.filter(column, "lt", str(value))
+
+    def lte(self, column: str, value: object) -> Self:  # noqa: D102
+        return self.filter(column, "lte", str(value))
+
+    def is_(self, column: str, value: object) -> Self:  # noqa: D102
+        return self.filter(column, "is", "null" if value is None else str(value))
+
+    def in_(self, column: str, values: Iterable[Any]) -> Self:
+        """Keep rows whose `column` is one of `values`."""
+        self.terms.append(Condition(column, "in", tuple(normalize(value) for value in values)))
+        return self
+
+    def or_(self, filters: str) -> Self:
+        """Keep rows matching any of `filters`, given in PostgREST syntax."""
+        self.terms.append(parse_logical(f"or({filters})"))
+        return self
+
+    def order(self, column: str, *, desc: bool = False, **kwargs: object) -> Self:  # noqa: ARG002
+        """Sort by `column`, after any columns sorted by already."""
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs: object) -> Self:  # noqa: ARG002
+        """Return at most `size` rows."""
+        self.size = size
+        return self
+
+    def offset(self, size: int) -> Self:
+        """Skip the first `size` rows."""
+        self.skip = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs: object) -> Self:  # noqa: ARG002
+        """Return the rows from `start` to `end`, both included."""
+        self.skip = start
+        self.size = end - start + 1
+        return self
+
+    def _run(self) -> APIResponse:
+        engine = self.client.engine
+        where = Group("and", tuple(self.terms))
+        if self.action == "select":
+            rows, total = engine.select(self.table, where, self.ordering, self.size, self.skip)
+            if self.columns is not None:
+                rows = [{column: row.get(column) for column in self.columns} for row in rows]
+            return APIResponse(data=rows, count=total if self.count else None)
+        if self.action in ("insert", "upsert"):
+            payload = self.payload if isinstance(self.payload, list) else [self.payload]
+            rows = engine.insert(self.table, payload, upsert=self.action == "upsert")
+        elif self.action == "update":
+            rows = engine.update(self.table, self.payload, where)
+        else:
+            rows = engine.delete(self.table, where)
+        return APIResponse(data=rows, count=len(rows) if self.count else None)
+
+    async def execute(self) -> APIResponse:
+        """Run the query on the engine and return its rows the way postgrest-py does."""
+        started = time.perf_counter()
+        try:
+            if self.client.engine.blocking:
+                return await asyncio.to_thread(self._run)
+            return self._run()
+        finally:
+            elapsed = time.perf_counter() - started
+            record_upstream(elapsed)
+            metrics.observe(UPSTREAM_DURATION, elapsed, {"table": self.table, "operation": self.action})
+
+
+class LocalClient:
+    """
+    Repository backed by a local engine instead of a Supabase project.
+
+    It answers `client.table(...)` queries the way the Supabase client does, so the
+    routers, pagination and batching run unchanged, fully offline.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        """
+        Initialize the LocalClient.
+
+        Args:
+            engine: The engine storing the tables.
+
+        """
+        self.engine = engine
+
+    def table(self, table_name: str) -> LocalQuery:
+        """Start a query on `table_name`."""
+        return LocalQuery(self, table_name)
+
+    from_ = table
+
+    async def close(self) -> None:
+        """Close the engine."""
+        if self.engine.blocking:
+            await asyncio.to_thread(self.engine.close)
+        else:
+            self.engine.close()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from postgrest.exceptions import APIError
+
+from src.repository.base import Engine, Order, Row, with_defaults
+from src.repository.filters import Group, matches, normalize
+
+# Columns with a secondary index, besides the `id` every table is keyed by.
+INDEXED_COLUMNS = ("is_available",)
+
+
+def sort_key(value: object) -> tuple[int, object]:
+    """Order values the way Postgres does within a column: numbers by value, text by text, nulls last."""
+    if value is None:
+        return (2, "")
+    if isinstance(value, bool | int | float):
+        return (0, value)
+    return (1, str(value))
+
+
+def copy_row(row: Row) -> Row:
+    """
+    Copy a row deep enough that changing the copy never changes the original.
+
+    Rows are flat JSON objects whose only nested values are lists of scalars, such
+    as an item's categories, so this is much cheaper than `copy.deepcopy`.
+    """
+    return {key: list(value) if isinstance(value, list) else value for key, value in row.items()}
+
+
+def duplicate_key(table: str, row_id: str) -> APIError:
+    """Build the error PostgREST returns for a duplicate primary key."""
+    return APIError({
+        "code": "23505",
+        "message": f'duplicate key value violates unique constraint "{table}_pkey"',
+        "details": f"Key (id)=({row_id}) already exists.",
+        "hint": None,
+    })
+
+
+class MemoryTable:
+    """Rows of one table keyed by id, with an index on each of INDEXED_COLUMNS."""
+
+    def __init__(self) -> None:
+        """Initialize an empty MemoryTable."""
+        self.rows: dict[str, Row] = {}
+        # Insertion ordered dicts are used as ordered sets, so index scans are stable.
+        self.indexes: dict[str, dict[str, dict[str, None]]] = {column: {} for column in INDEXED_COLUMNS}
+
+    def put(self, row: Row) -> None:
+        """Store a row, replacing the row with the same id."""
+        row_id = str(row["id"])
+        if row_id in self.rows:
+            self.remove(row_id)
+        self.rows[row_id] = row
+        for column, index in self.indexes.items():
+            index.setdefault(normalize(row.get(column)), {})[row_id] = None
+
+    def remove(self, row_id: str) -> Row:
+        """Remove and return the row with `row_id`."""
+        row = self.rows.pop(row_id)
+        for column, index in self.indexes.items():
+            index.get(normalize(row.get(column)), {}).pop(row_id, None)
+        return row
+
+    def candidates(self, where: Group) -> Iterable[Row]:
+        """Return the rows `where` can match, narrowed through an index when it restricts an indexed column."""
+        ids = where.equalities("id")
+        if ids is not None:
+            return [self.rows[row_id] for row_id in ids if row_id in self.rows]
+        for column, index in self.indexes.items():
+            values = where.equalities(column)
+            if values is not None:
+                return [self.rows[row_id] for value in values for row_id in index.get(value, {})]
+        return self.rows.values()
+
+    def find(self, where: Group) -> list[Row]:
+        """Return the rows matching `where`."""
+        return [row for row in self.candidates(where) if matches(where, row)]
+
+
+class MemoryEngine(Engine):
+    """
+    Engine keeping every table in the memory of the process.
+
+    Lookups by `id` and `is_available` go through an index, anything else scans
+    the table. Rows are copied on the way in and out, so callers can never change
+    stored rows behind the engine's back. Each worker process has its own tables.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the MemoryEngine with no tables."""
+        self.tables: dict[str, MemoryTable] = {}
+
+    def _table(self, table: str) -> MemoryTable:
+        if table not in self.tables:
+            self.tables[table] = MemoryTable()
+        return self.tables[table]
+
+    def select(self, table: str, where: Group, order: list[Order], limit: int | None, offset: int) -> tuple[list[Row], int]:
+        """Return one page of the rows matching `where` together with the number of rows matching it."""
+        rows = self._table(table).find(where)
+        # Sorting is stable, so sorting by the last column first yields the full ordering.
+        for column, desc in reversed(order):
+            rows.sort(key=lambda row, column=column: sort_key(row.get(column)), reverse=desc)
+        page = rows[offset:] if limit is None else rows[offset : offset + limit]
+        return [copy_row(row) for row in page], len(rows)
+
+    def insert(self, table: str, rows: list[Row], *, upsert: bool) -> list[Row]:
+        """Store new rows, or with `upsert` merge them into the rows with the same id, and return them."""
+        stored = self._table(table)
+        if not upsert:
+            # Every key is checked before anything is stored, so a failing insert stores none of its rows.
+            seen = set()
+            for row_id in (str(row["id"]) for row in rows if "id" in row):
+                if row_id in stored.rows or row_id in seen:
+                    raise duplicate_key(table, row_id)
+                seen.add(row_id)
+        result = []
+        for row in rows:
+            existing = stored.rows.get(str(row["id"])) if "id" in row else None
+            # An upsert keeps the columns it does not set; a new row gets the column defaults.
+            merged = with_defaults(copy_row(row)) if existing is None else {**existing, **copy_row(row)}
+            merged["id"] = str(merged["id"])
+            stored.put(merged)
+            result.append(copy_row(merged))
+        return result
+
+    def update(self, table: str, patch: Row, where: Group) -> list[Row]:
+        """Apply `patch` to the rows matching `where` and return them."""
+        stored = self._table(table)
+        result = []
+        for row in stored.find(where):
+            updated = {**row, **copy_row(patch)}
+            stored.put(updated)
+            result.append(copy_row(updated))
+        return result
+
+    def delete(self, table: str, where: Group) -> list[Row]:
+        """Remove the rows matching `where` and return them."""
+        stored = self._table(table)
+        return [stored.remove(str(row["id"])) for row in stored.find(where)]
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from typing import Any
+
+from src.repository.base import Engine, Order, Row, with_defaults
+from src.repository.filters import Condition, Group, Node
+from src.repository.memory import duplicate_key
+
+# Columns stored in their own column, with an index, rather than only in the JSON document.
+COLUMNS = ("id", "is_available", "created_at")
+TABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+COMPARISONS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _operand(value: str) -> int | str:
+    """Convert a filter value to what SQLite stores: booleans as 1/0, everything else as text."""
+    return {"true": 1, "false": 0}.get(value, value)
+
+
+def _column(column: str) -> tuple[str, list[Any]]:
+    """Return the SQL expression of a column and its parameters."""
+    if column in COLUMNS:
+        return f'"{column}"', []
+    return "json_extract(data, ?)", [f'$."{column}"']
+
+
+def compile_where(node: Node) -> tuple[str, list[Any]]:
+    """
+    Compile a filter tree to a SQL condition and its parameters.
+
+    Raises:
+        ValueError: If the tree uses an operator that is not supported.
+
+    """
+    if isinstance(node, Group):
+        if not node.terms:
+            return ("1" if node.operator == "and" else "0"), []
+        parts, params = [], []
+        for term in node.terms:
+            sql, term_params = compile_where(term)
+            parts.append(sql)
+            params.extend(term_params)
+        return "(" + f" {node.operator.upper()} ".join(parts) + ")", params
+
+    expression, params = _column(node.column)
+    if node.operator == "in":
+        placeholders = ",".join("?" * len(node.value))
+        return f"{expression} IN ({placeholders})", [*params, *(_operand(value) for value in node.value)]
+    if node.operator == "is":
+        if node.value == "null":
+            return f"{expression} IS NULL", params
+        return f"{expression} = ?", [*params, _operand(node.value)]
+    if node.operator in COMPARISONS:
+        return f"{expression} {COMPARISONS[node.operator]} ?", [*params, _operand(node.value)]
+    msg = f"Repository - Unsupported filter operator: {node.operator}"
+    raise ValueError(msg)
+
+
+class SQLiteEngine(Engine):
+    """
+    Engine keeping every table in a SQLite database.
+
+    Each row is stored as a JSON document next to its `id`, `is_available` and
+    `created_at` columns, which are indexed: `id` as the primary key, and
+    `is_available` and (`created_at`, `id`) for filtered reads and keyset pages.
+    Other columns are filtered through `json_extract`. File databases use WAL,
+    so several worker processes can share one.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the SQLiteEngine.
+
+        Args:
+            path: Path of the database file, or `:memory:`.
+
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._tables: set[str] = set()
+
+    def _table(self, table: str) -> str:
+        """Create the table and its indexes on first use and return its quoted name."""
+        if not TABLE_NAME.match(table):
+            msg = f"Repository - Invalid table name: {table}"
+            raise ValueError(msg)
+        if table not in self._tables:
+            self._connection.executescript(
+                f"""
+                CREATE TABLE IF NOT EXISTS "{table}" (
+                    id TEXT PRIMARY KEY,
+                    is_available INTEGER,
+                    created_at TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS "{table}_is_available" ON "{table}" (is_available);
+                CREATE INDEX IF NOT EXISTS "{table}_created_at_id" ON "{table}" (created_at, id);
+                """,
+            )
+            self._tables.add(table)
+        return f'"{table}"'
+
+    def _find(self, name: str, where: Group) -> list[Row]:
+        sql, params = compile_where(where)
+        return [json.loads(data) for (data,) in self._connection.execute(f"SELECT data FROM {name} WHERE {sql}", params)]  # noqa: S608
+
+    def _write(self, name: str, rows: list[Row], *, replace: bool) -> None:
+        verb = "INSERT OR REPLACE" if replace else "INSERT"
+        self._connection.executemany(
+            f"{verb} INTO {name} (id, is_available, created_at, data) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    row["id"],
+                    None if row.get("is_available") is None else int(bool(row["is_available"])),
+                    row.get("created_at"),
+                    json.dumps(row, separators=(",", ":")),
+                )
+                for row in rows
+            ],
+        )
+
+    def select(self, table: str, where: Group, order: list[Order], limit: int | None, offset: int) -> tuple[list[Row], int]:
+        """Return one page of the rows matching `where` together with the number of rows matching it."""
+        with self._lock:
+            name = self._table(table)
+            sql, params = compile_where(where)
+            ordering, order_params = [], []
+            for column, desc in order:
+                expression, column_params = _column(column)
+                ordering.append(f"{expression} {'DESC' if desc else 'ASC'} NULLS LAST")
+                order_params.extend(column_params)
+            query = f"SELECT data FROM {name} WHERE {sql}"  # noqa: S608
+            if ordering:
+                query += " ORDER BY " + ", ".join(ordering)
+            query += " LIMIT ? OFFSET ?"
+            rows = [
+                json.loads(data)
+                for (data,) in self._connection.execute(query, [*params, *order_params, -1 if limit is None else limit, offset])
+            ]
+            (total,) = self._connection.execute(f"SELECT COUNT(*) FROM {name} WHERE {sql}", params).fetchone()  # noqa: S608
+        return rows, total
+
+    def insert(self, table: str, rows: list[Row], *, upsert: bool) -> list[Row]:
+        """Store new rows, or with `upsert` merge them into the rows with the same id, and return them."""
+        with self._lock:
+            name = self._table(table)
+            ids = [str(row["id"]) for row in rows if "id" in row]
+            existing = {row["id"]: row for row in self._find(name, Group("and", (Condition("id", "in", tuple(ids)),)))} if ids else {}
+            stored, seen = [], set()
+            for row in rows:
+                current = existing.get(str(row["id"])) if "id" in row else None
+                if "id" in row and not upsert:
+                    # A key repeated within the insert is as much a duplicate as one already stored.
+                    if current is not None or str(row["id"]) in seen:
+                        raise duplicate_key(table, str(row["id"]))
+                    seen.add(str(row["id"]))
+                merged = with_defaults(row) if current is None else {**current, **row}
+                merged["id"] = str(merged["id"])
+                stored.append(merged)
+            self._connection.execute("BEGIN")
+            try:
+                self._write(name, stored, replace=upsert)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return stored
+
+    def update(self, table: str, patch: Row, where: Group) -> list[Row]:
+        """Apply `patch` to the rows matching `where` and return them."""
+        with self._lock:
+            name = self._table(table)
+            self._connection.execute("BEGIN")
+            try:
+                updated = [{**row, **patch} for row in self._find(name, where)]
+                self._write(name, updated, replace=True)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return updated
+
+    def delete(self, table: str, where: Group) -> list[Row]:
+        """Remove the rows matching `where` and return them."""
+        with self._lock:
+            name = self._table(table)
+            sql, params = compile_where(where)
+            self._connection.execute("BEGIN")
+            try:
+                deleted = self._find(name, where)
+                self._connection.execute(f"DELETE FROM {name} WHERE {sql}", params)  # noqa: S608
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return deleted
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from src.config import get_config
+from src.timing import SERIALIZATION, timer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - the standard library encoder is used instead
+    orjson = None
+
+PRICE_QUANTUM = Decimal("0.01")
+
+
+def _default(value: object) -> str:
+    """Encode values JSON has no type for, such as Decimal, UUID and datetime, as strings."""
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight from upstream rows.
+
+    Uses orjson when it is installed and the standard library encoder otherwise.
+    No response model is involved, so the content must already be JSON-shaped.
+    """
+
+    def render(self, content: Any) -> bytes:  # noqa: ANN401 # overrides JSONResponse.render
+        """Encode the content without validating it."""
+        with timer(SERIALIZATION):
+            if orjson is not None:
+                return orjson.dumps(content, default=_default)
+            return json.dumps(content, separators=(",", ":"), ensure_ascii=False, default=_default).encode()
+
+
+def fast_serialization_enabled() -> bool:
+    """Whether reads skip response model validation, as set by `FAST_SERIALIZATION`."""
+    return getattr(get_config(), "fast_serialization", False)
+
+
+def format_prices(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Return the rows with their `price` rendered as a string with two decimal places.
+
+    PostgREST returns numeric columns as JSON numbers. This matches what the Item
+    model produces for them, and leaves prices that are already formatted unchanged.
+    Rows with a price are shallow copies, so rows held by the menu cache are never altered.
+    """
+    formatted = []
+    for row in rows:
+        price = row.get("price")
+        formatted.append(row if price is None else {**row, "price": str(Decimal(str(price)).quantize(PRICE_QUANTUM))})
+    return formatted
+
+
+def serialize(value: dict[str, Any], response: Response | None = None) -> dict[str, Any] | Response:
+    """
+    Return a read's value in the form the configured serialization path expects.
+
+    By default the value is returned as is for FastAPI to validate against the
+    route's response model. With `FAST_SERIALIZATION` enabled the rows are trusted,
+    since every write was validated on the way in, and are rendered directly.
+
+    Args:
+        value: The response body, with its rows under `data`.
+        response: The response FastAPI injected into the route, whose headers are carried over.
+
+    Returns:
+        dict[str, Any] | Response: The value, or a rendered FastJSONResponse.
+
+    """
+    if not fast_serialization_enabled():
+        return value
+    return FastJSONResponse({**value, "data": format_prices(value["data"])}, headers=None if response is None else dict(response.headers))
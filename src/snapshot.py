@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
+
+from supabase import AClient
+
+from src.batching import SingleFlight
+from src.config import DEFAULT_SNAPSHOT_MAX_AGE, get_config
+from src.pagination import MAX_PAGE_SIZE
+from src.streaming import iter_keyset_pages
+from utils.logger import logger
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd is optional, gzip is always served
+    zstandard = None
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+UNCATEGORIZED = "uncategorized"
+
+
+class Snapshot(NamedTuple):
+    """One built version of the menu document, encoded once per content coding."""
+
+    version: int
+    etag: str
+    identity: bytes
+    gzip: bytes
+    zstd: bytes | None
+
+    def encoded(self, encoding: str) -> bytes:
+        """Return the body for a content coding chosen by `negotiate_encoding`."""
+        if encoding == "zstd" and self.zstd is not None:
+            return self.zstd
+        return self.gzip if encoding == "gzip" else self.identity
+
+
+def negotiate_encoding(accept_encoding: str | None, *, zstd_available: bool = zstandard is not None) -> str:
+    """
+    Pick the content coding to answer an Accept-Encoding header with.
+
+    zstd is preferred over gzip when both are acceptable, and a coding listed
+    with `q=0` is never chosen.
+
+    Returns:
+        str: One of "zstd", "gzip" or "identity".
+
+    """
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for coding in ("zstd", "gzip"):
+        if coding == "zstd" and not zstd_available:
+            continue
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return "identity"
+
+
+def _encode(value: object) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+
+class MenuSnapshot:
+    """
+    Prebuilt document of every available category joined to its available items.
+
+    The rows are loaded once and then kept current by the write routes, which pass
+    the rows they wrote to `apply` and `remove` instead of invalidating. Each
+    category is serialized into its own fragment and only the fragments a write
+    touched are re-encoded, after which the document is joined and compressed once
+    and reused by every read until the next write.
+
+    Writes handled by other workers never reach this one, so the rows are loaded
+    again once they are `max_age` seconds old. The ETag is a hash of the categories
+    and items, so an unchanged menu keeps its tag across reloads and workers.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_SNAPSHOT_MAX_AGE) -> None:
+        """
+        Initialize an empty MenuSnapshot that loads on first use.
+
+        Args:
+            max_age: Seconds the loaded rows are kept before they are loaded again; 0 keeps them until restart.
+
+        """
+        self.max_age = max_age
+        self._rows: dict[str, dict[str, dict[str, Any]]] = {"category": {}, "item": {}}
+        self._members: dict[str, set[str]] = {}
+        self._fragments: dict[str, bytes] = {}
+        self._dirty: set[str] = set()
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._loading = False
+        self._pending: list[tuple[str, str, list[dict[str, Any]]]] = []
+        self._built: Snapshot | None = None
+        self._version = 0
+        self._flight = SingleFlight()
+
+    @property
+    def stale(self) -> bool:
+        """Whether a write has happened since the document was last built."""
+        return self._built is None or bool(self._dirty)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the loaded rows are older than `max_age` and must be loaded again."""
+        return self._loaded and self.max_age > 0 and time.monotonic() - self._loaded_at >= self.max_age
+
+    async def get(self, client: AClient) -> Snapshot:
+        """
+        Return the current document, loading or rebuilding it if needed.
+
+        Concurrent callers share a single load or rebuild.
+        """
+        if not self.stale and not self.expired:
+            return self._built
+        return await self._flight.do("snapshot", lambda: self._refresh(client))
+
+    async def _refresh(self, client: AClient) -> Snapshot:
+        if self.expired:
+            self._reset()
+        if not self._loaded:
+            await self._load(client)
+        if not self.stale:
+            return self._built
+
+        self._encode_fragments()
+        body = self._body()
+        etag = f'W/"menu-{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if self._built is not None and self._built.etag == etag:
+            return self._built
+
+        self._version += 1
+        document = self._header() + body
+        compressed = await asyncio.to_thread(self._compress, document)
+        self._built = Snapshot(self._version, etag, document, *compressed)
+        logger.info("Snapshot - Built version %s: %s byte(s), %s gzipped", self._version, len(document), len(compressed[0]))
+        return self._built
+
+    def _reset(self) -> None:
+        """Drop the loaded rows so the next refresh loads them again, re-encoding every category."""
+        self._rows = {"category": {}, "item": {}}
+        self._members = {}
+        self._dirty.update(self._fragments)
+        self._loaded = False
+
+    async def _load(self, client: AClient) -> None:
+        """
+        Load every available row, replaying the writes made while loading.
+
+        A failed load drops the rows it read and the writes queued during it: a
+        later load reads those rows again, so replaying the older writes on top
+        of it would put back rows that have changed since.
+        """
+        self._loading = True
+        try:
+            for table in ("category", "item"):
+                pages = iter_keyset_pages(lambda table=table: client.table(table).select("*").eq("is_available", "True"), MAX_PAGE_SIZE)
+                async for rows in pages:
+                    self._apply(table, rows)
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+        except BaseException:
+            self._pending.clear()
+            self._reset()
+            raise
+        finally:
+            self._loading = False
+        for operation, table, rows in self._pending:
+            if operation == "apply":
+                self._apply(table, rows)
+            else:
+                self._remove(table, rows)
+        self._pending.clear()
+
+    def apply(self, table: str, rows: Iterable[dict[str, Any]]) -> None:
+        """
+        Record rows a write has returned, dropping the ones that are no longer available.
+
+        Writes made before the first load are skipped since the load reads them anyway.
+        """
+        self._record("apply", table, list(rows))
+
+    def remove(self, table: str, rows: Iterable[dict[str, Any]]) -> None:
+        """Record rows a delete has returned."""
+        self._record("remove", table, list(rows))
+
+    def _record(self, operation: str, table: str, rows: list[dict[str, Any]]) -> None:
+        if self._loading:
+            self._pending.append((operation, table, rows))
+        elif self._loaded and operation == "apply":
+            self._apply(table, rows)
+        elif self._loaded:
+            self._remove(table, rows)
+
+    def _apply(self, table: str, rows: list[dict[str, Any]]) -> None:
+        available = [row for row in rows if row.get("is_available")]
+        self._remove(table, [row for row in rows if not row.get("is_available")])
+        for row in available:
+            row_id = str(row["id"])
+            if table == "category":
+                self._dirty.add(row_id)
+            else:
+                self._unlink(row_id)
+                for category_id in self._category_ids(row):
+                    self._members.setdefault(category_id, set()).add(row_id)
+                    self._dirty.add(category_id)
+            self._rows[table][row_id] = row
+
+    def _remove(self, table: str, rows: list[dict[str, Any]]) -> None:
+        for row in rows:
+            row_id = str(row["id"])
+            if table == "category":
+                self._dirty.add(row_id)
+            else:
+                self._unlink(row_id)
+            self._rows[table].pop(row_id, None)
+
+    def _unlink(self, item_id: str) -> None:
+        """Take an item out of the categories it was listed under."""
+        previous = self._rows["item"].get(item_id)
+        if previous is None:
+            return
+        for category_id in self._category_ids(previous):
+            self._members.get(category_id, set()).discard(item_id)
+            self._dirty.add(category_id)
+
+    @staticmethod
+    def _category_ids(item: dict[str, Any]) -> list[str]:
+        return [str(category_id) for category_id in item.get("categories") or []] or [UNCATEGORIZED]
+
+    def _encode_fragments(self) -> None:
+        """Re-encode the categories touched since the last build."""
+        items = self._rows["item"]
+        for category_id in self._dirty:
+            category = self._rows["category"].get(category_id)
+            members = sorted((items[item_id] for item_id in self._members.get(category_id, ())), key=_sort_key)
+            if category_id == UNCATEGORIZED:
+                self._fragments[category_id] = _encode(members)
+            elif category is None:
+                self._fragments.pop(category_id, None)
+            else:
+                self._fragments[category_id] = _encode({**category, "items": members})
+        self._dirty.clear()
+
+    def _header(self) -> bytes:
+        """Encode the opening of the document, with the fields that vary between builds of the same menu."""
+        return _encode({"version": self._version, "generated_at": datetime.now(UTC).isoformat()})[:-1]
+
+    def _body(self) -> bytes:
+        """Join the category fragments into the rest of the document, which depends only on the rows."""
+        categories = sorted((row for row in self._rows["category"].values() if str(row["id"]) in self._fragments), key=_sort_key)
+        return b"".join(
+            (
+                b',"categories":[',
+                b",".join(self._fragments[str(row["id"])] for row in categories),
+                b'],"uncategorized":',
+                self._fragments.get(UNCATEGORIZED, b"[]"),
+                b"}",
+            ),
+        )
+
+    @staticmethod
+    def _compress(document: bytes) -> tuple[bytes, bytes | None]:
+        compressed = gzip.compress(document, compresslevel=GZIP_LEVEL, mtime=0)
+        if zstandard is None:
+            return compressed, None
+        return compressed, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(document)
+
+
+def _sort_key(row: dict[str, Any]) -> tuple[str, str]:
+    return str(row.get("created_at") or ""), str(row["id"])
+
+
+menu_snapshot: MenuSnapshot | None = None
+
+
+def get_menu_snapshot() -> MenuSnapshot:
+    """
+    Retrieve the process-wide menu snapshot.
+
+    The snapshot is created on first use, with its max age taken from the loaded
+    Configuration.
+
+    Returns:
+        MenuSnapshot: The shared snapshot instance.
+
+    """
+    global menu_snapshot  # noqa: PLW0603
+    if menu_snapshot is None:
+        menu_snapshot = MenuSnapshot(max_age=getattr(get_config(), "snapshot_max_age", DEFAULT_SNAPSHOT_MAX_AGE))
+    return menu_snapshot
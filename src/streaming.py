@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Callable, Container, Iterable
+from enum import Enum
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from src.pagination import Builder, paginate
+from utils.exceptions import get_error_id
+from utils.logger import logger
+
+MAX_RECORD_BYTES = 1024 * 1024
+
+
+class StreamFormat(str, Enum):
+    """Enumeration for the formats rows are streamed in and out of the API in."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        """Return the Content-Type of the format."""
+        return "application/x-ndjson" if self is StreamFormat.NDJSON else "text/csv"
+
+
+async def iter_keyset_pages(select: Callable[[], Builder], page_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Yield every row of a select, one keyset page at a time.
+
+    Only the current page is held in memory, however large the table.
+
+    Args:
+        select: Builds a fresh select query for each page.
+        page_size: Rows fetched per upstream call.
+
+    """
+    after = None
+    while True:
+        response = await paginate(select(), after, page_size).execute()
+        rows = response.data[:page_size]
+        yield rows
+        if len(response.data) <= page_size:
+            return
+        after = (rows[-1].get("created_at"), str(rows[-1]["id"]))
+
+
+def encode_ndjson(rows: Iterable[dict[str, Any]]) -> str:
+    """Encode rows as newline-delimited JSON."""
+    return "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+
+
+def encode_csv(rows: Iterable[dict[str, Any]], columns: list[str], *, header: bool = False) -> str:
+    """Encode rows as CSV, writing nested values as JSON."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow(json.dumps(value) if isinstance(value, list | dict) else value for value in (row.get(column) for column in columns))
+    return buffer.getvalue()
+
+
+async def stream_rows(
+    first_page: list[dict[str, Any]],
+    pages: AsyncIterator[list[dict[str, Any]]],
+    stream_format: StreamFormat,
+    columns: list[str],
+) -> AsyncIterator[str]:
+    """
+    Encode pages of rows as they arrive.
+
+    The first page is fetched before the response starts, so a failing upstream can
+    still be answered with an error status. A failure on a later page is logged and
+    re-raised, which aborts the response instead of ending it as if it were complete.
+    """
+    if stream_format is StreamFormat.CSV:
+        yield encode_csv(first_page, columns, header=True)
+    else:
+        yield encode_ndjson(first_page)
+
+    try:
+        async for rows in pages:
+            yield encode_csv(rows, columns) if stream_format is StreamFormat.CSV else encode_ndjson(rows)
+    except Exception:
+        error_id = get_error_id()
+        logger.exception("Error ID: %s; Failed to stream export", error_id)
+        raise
+
+
+class LineDecodeError(ValueError):
+    """A line that is not valid UTF-8, reported against its number."""
+
+
+def decode_line(line: bytes) -> str | LineDecodeError:
+    """Decode one line as UTF-8, or describe why it cannot be."""
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError as e:
+        return LineDecodeError(f"Invalid UTF-8 at byte {e.start + 1}: {e.reason}")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str | LineDecodeError]]:
+    """
+    Split a byte stream into numbered lines as the chunks arrive.
+
+    A line that is not valid UTF-8 is yielded as a LineDecodeError, so it is
+    rejected by number rather than imported with replacement characters.
+
+    Raises:
+        HTTPException: If a line grows past MAX_RECORD_BYTES, which bounds the buffer.
+
+    """
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            yield number, decode_line(line)
+        if len(buffer) > MAX_RECORD_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Line {number + 1} is longer than {MAX_RECORD_BYTES} bytes",
+            )
+    if buffer:
+        yield number + 1, decode_line(buffer)
+
+
+class CsvRecordError(ValueError):
+    """A CSV record that cannot be read, reported against the line it starts on."""
+
+
+def parse_csv_record(record: str) -> list[str] | CsvRecordError:
+    """Split one CSV record into its fields, or describe why it is malformed."""
+    try:
+        return next(csv.reader([record]), [])
+    except csv.Error as e:
+        return CsvRecordError(f"Malformed CSV record: {e}")
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[tuple[int, str | LineDecodeError]],
+) -> AsyncIterator[tuple[int, list[str] | CsvRecordError]]:
+    """
+    Join numbered lines into CSV records, numbered by the line they start on.
+
+    A record continues onto the next line while it has an unterminated quoted field,
+    up to MAX_RECORD_BYTES. A record that is malformed or left open past that size,
+    such as by a stray quote, is yielded as a CsvRecordError and reading resumes on
+    the following line, so one bad record cannot swallow the rest of the upload.
+    The same goes for a record with a line that is not valid UTF-8.
+    """
+    start = None
+    pending: list[str] = []
+    size = quotes = 0
+    async for number, line in lines:
+        start = number if start is None else start
+        if isinstance(line, LineDecodeError):
+            yield start, CsvRecordError(f"Line {number}: {line}" if number != start else str(line))
+            start = None
+            pending = []
+            size = quotes = 0
+            continue
+        pending.append(line)
+        size += len(line.encode("utf-8")) + 1
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield start, parse_csv_record("\n".join(pending))
+        elif size > MAX_RECORD_BYTES:
+            yield start, CsvRecordError(f"Record is longer than {MAX_RECORD_BYTES} bytes, is a quote left open?")
+        else:
+            continue
+        start = None
+        pending = []
+        size = quotes = 0
+    if pending:
+        yield start, parse_csv_record("\n".join(pending))
+
+
+def decode_csv_row(header: list[str], values: list[str], json_columns: Container[str] = ()) -> dict[str, Any]:
+    """
+    Map a CSV record onto its header, reversing `encode_csv`.
+
+    Empty fields are left out so model defaults apply, and the fields of
+    `json_columns`, written as JSON by `encode_csv`, are decoded.
+
+    Raises:
+        CsvRecordError: If a field of `json_columns` is not valid JSON.
+
+    """
+    row = {}
+    for column, value in zip(header, values, strict=False):
+        if value == "":
+            continue
+        if column in json_columns:
+            try:
+                row[column] = json.loads(value)
+            except ValueError as e:
+                msg = f"{column}: Invalid JSON: {e}"
+                raise CsvRecordError(msg) from e
+        else:
+            row[column] = value
+    return row
+
+
+class LineRanges:
+    """Line numbers compacted into inclusive `[first, last]` ranges."""
+
+    def __init__(self) -> None:
+        """Initialize the LineRanges with no lines."""
+        self.ranges: list[list[int]] = []
+        self.count = 0
+
+    def add(self, numbers: Iterable[int]) -> None:
+        """Add ascending line numbers, extending the last range where they follow on."""
+        for number in numbers:
+            self.count += 1
+            if self.ranges and self.ranges[-1][1] == number - 1:
+                self.ranges[-1][1] = number
+            else:
+                self.ranges.append([number, number])
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# Names of the timings recorded by the app itself. Route handlers can record
+# their own with `timer`, under any other name.
+UPSTREAM = "upstream"
+VALIDATION = "validation"
+SERIALIZATION = "serialization"
+CACHE = "cache"
+
+
+@dataclass
+class RequestTimings:
+    """Where the time of one request went, in seconds per timing name."""
+
+    spans: dict[str, float] = field(default_factory=dict)
+    upstream_calls: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    endpoint: float = 0.0
+    endpoint_started: float | None = None
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add `seconds` to the timing called `name`."""
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def get(self, name: str) -> float:
+        """Return the seconds recorded under `name`, or 0 if none were."""
+        return self.spans.get(name, 0.0)
+
+
+# Tasks started while serving a request (batched lookups, shared single-flight
+# reads, streamed bodies) copy this variable, so their upstream time is added
+# to the RequestTimings of the request that started them.
+timings_var: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def record(name: str, seconds: float) -> None:
+    """Add `seconds` to the timing called `name` of the current request, if any."""
+    timings = timings_var.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def record_upstream(seconds: float) -> None:
+    """Add one upstream call to the timings of the current request, if any."""
+    timings = timings_var.get()
+    if timings is not None:
+        timings.add(UPSTREAM, seconds)
+        timings.upstream_calls += 1
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """
+    Record the time spent in the block under `name` for the current request.
+
+    Outside of a request this only costs two clock reads, so it can be left
+    in code that also runs from scripts and tests.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from postgrest import AsyncPostgrestClient
+from storage3 import AsyncStorageClient
+from supabase import AClient
+
+from src.config import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_HTTP2,
+    DEFAULT_POOL_KEEPALIVE_EXPIRY,
+    DEFAULT_POOL_MAX_CONNECTIONS,
+    DEFAULT_POOL_MAX_KEEPALIVE,
+    DEFAULT_POOL_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    Configuration,
+)
+from src.metrics import (
+    POOL_CONNECTIONS,
+    POOL_CONNECTIONS_OPENED,
+    POOL_IN_FLIGHT,
+    POOL_WAIT_SECONDS,
+    POOL_WAITS,
+    UPSTREAM_DURATION,
+    MetricsRegistry,
+    metrics,
+)
+from src.timing import record_upstream
+from utils.logger import logger
+
+# The first trace event of a request marks the moment it got hold of a connection,
+# either by opening a new one or by starting to write to a pooled one.
+CONNECTION_ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+OPERATIONS = {"GET": "select", "HEAD": "select", "POST": "insert", "PUT": "upsert", "PATCH": "update", "DELETE": "delete"}
+
+
+def upstream_labels(request: httpx.Request) -> dict[str, str]:
+    """
+    Return the table and operation a Supabase request acts on, for metrics.
+
+    PostgREST requests are `/rest/v1/<table>` with the operation given by the
+    method, and `/rest/v1/rpc/<function>` for functions. Storage and auth
+    requests are grouped under their service so paths never become labels.
+    """
+    parts = request.url.path.strip("/").split("/")
+    operation = OPERATIONS.get(request.method, request.method.lower())
+    if parts[:2] != ["rest", "v1"] or len(parts) < 3:  # noqa: PLR2004
+        return {"table": parts[0] or "unknown", "operation": operation}
+    if parts[2] == "rpc" and len(parts) > 3:  # noqa: PLR2004
+        return {"table": parts[3], "operation": "rpc"}
+    if operation == "insert" and "resolution=merge-duplicates" in request.headers.get("prefer", ""):
+        operation = "upsert"
+    return {"table": parts[2], "operation": operation}
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool limits and timeouts for the upstream HTTP clients."""
+
+    max_connections: int = DEFAULT_POOL_MAX_CONNECTIONS
+    max_keepalive: int = DEFAULT_POOL_MAX_KEEPALIVE
+    keepalive_expiry: float = DEFAULT_POOL_KEEPALIVE_EXPIRY
+    http2: bool = DEFAULT_HTTP2
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    read_timeout: float = DEFAULT_READ_TIMEOUT
+    pool_timeout: float = DEFAULT_POOL_TIMEOUT
+
+    @classmethod
+    def from_config(cls, config: Configuration | None) -> PoolSettings:
+        """Read the settings from a loaded Configuration, keeping the defaults for anything unset."""
+        return cls(
+            max_connections=getattr(config, "pool_max_connections", DEFAULT_POOL_MAX_CONNECTIONS),
+            max_keepalive=getattr(config, "pool_max_keepalive", DEFAULT_POOL_MAX_KEEPALIVE),
+            keepalive_expiry=getattr(config, "pool_keepalive_expiry", DEFAULT_POOL_KEEPALIVE_EXPIRY),
+            http2=getattr(config, "http2", DEFAULT_HTTP2),
+            connect_timeout=getattr(config, "connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=getattr(config, "read_timeout", DEFAULT_READ_TIMEOUT),
+            pool_timeout=getattr(config, "pool_timeout", DEFAULT_POOL_TIMEOUT),
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        """Return the timeouts as an httpx.Timeout. Writes share the read timeout."""
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout, pool=self.pool_timeout)
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Return the pool limits as httpx.Limits."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body that reports when it is closed, which is when its connection is released."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]) -> None:
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Shared, pooled transport that records how busy the pool is.
+
+    Every upstream HTTP client of a PooledClient sends through one instance, so
+    connections are reused across the PostgREST and storage clients and across the
+    clients supabase-py recreates on auth events. Requests are counted from when
+    they are sent until their body is closed, and the time each one waited for a
+    connection is measured with httpcore's trace extension. The time until the
+    body is closed is added to the upstream time of the request being served
+    and to the upstream latency histogram of its table and operation.
+    """
+
+    def __init__(self, settings: PoolSettings) -> None:
+        """
+        Initialize the InstrumentedTransport.
+
+        Args:
+            settings: The pool limits and HTTP/2 toggle to open connections with.
+
+        """
+        self.settings = settings
+        self._transport = httpx.AsyncHTTPTransport(limits=settings.limits, http2=settings.http2)
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_opened = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request through the pool, timing its wait for a connection."""
+        started = time.perf_counter()
+        acquired = False
+        trace = request.extensions.get("trace")
+
+        async def on_trace(event: str, info: dict[str, Any]) -> None:
+            nonlocal acquired
+            if not acquired and event in CONNECTION_ACQUIRED_EVENTS:
+                acquired = True
+                self._record_wait(time.perf_counter() - started)
+            if event == "connection.connect_tcp.complete":
+                self.connections_opened += 1
+            if trace is not None:
+                await trace(event, info)
+
+        request.extensions["trace"] = on_trace
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        labels = upstream_labels(request)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._release(started, labels)
+            raise
+        response.stream = _TrackedStream(response.stream, lambda: self._release(started, labels))
+        return response
+
+    def _record_wait(self, seconds: float) -> None:
+        # Anything under a millisecond is the pool's own bookkeeping, not queueing.
+        if seconds >= 0.001:  # noqa: PLR2004
+            self.waited += 1
+        self.wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def _release(self, started: float, labels: dict[str, str]) -> None:
+        self.in_flight -= 1
+        elapsed = time.perf_counter() - started
+        record_upstream(elapsed)
+        metrics.observe(UPSTREAM_DURATION, elapsed, labels)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the pool occupancy and the wait counters."""
+        connections = getattr(getattr(self._transport, "_pool", None), "connections", [])
+        return {
+            "max_connections": self.settings.max_connections,
+            "max_keepalive": self.settings.max_keepalive,
+            "http2": self.settings.http2,
+            "connections": len(connections),
+            "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+            "connections_opened": self.connections_opened,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": min(self.in_flight / self.settings.max_connections, 1.0) if self.settings.max_connections else 0.0,
+            "waited": self.waited,
+            "mean_wait_ms": self.wait_seconds / self.requests * 1000 if self.requests else 0.0,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+        }
+
+    def collect(self, registry: MetricsRegistry) -> None:
+        """Set the pool gauges and counters of `registry` from this transport."""
+        stats = self.stats()
+        registry.set(POOL_CONNECTIONS, stats["idle_connections"], {"state": "idle"})
+        registry.set(POOL_CONNECTIONS, stats["connections"] - stats["idle_connections"], {"state": "active"})
+        registry.set(POOL_CONNECTIONS_OPENED, self.connections_opened)
+        registry.set(POOL_IN_FLIGHT, self.in_flight)
+        registry.set(POOL_WAITS, self.waited)
+        registry.set(POOL_WAIT_SECONDS, self.wait_seconds)
+
+    async def aclose(self) -> None:
+        """
+        Leave the pool open when one of the sharing clients is closed.
+
+        supabase-py drops and recreates its clients on auth events, so a client
+        closing must not close the connections the others still use. Use `close`.
+        """
+
+    async def close(self) -> None:
+        """Close every pooled connection."""
+        await self._transport.aclose()
+
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """PostgREST client whose session sends through a shared InstrumentedTransport."""
+
+    def __init__(self, base_url: str, *, transport: InstrumentedTransport, **kwargs: Any) -> None:  # noqa: ANN401 # passed on to AsyncPostgrestClient
+        """Initialize the client, keeping the transport for `create_session`."""
+        self.transport = transport
+        super().__init__(base_url, **kwargs)
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: dict[str, str],
+        timeout: httpx.Timeout | float,
+        verify: bool = True,  # noqa: ARG002, FBT001, FBT002
+        proxy: str | None = None,  # noqa: ARG002
+    ) -> httpx.AsyncClient:
+        """Create the session on the shared transport. Verification and proxies are the transport's concern."""
+        return httpx.AsyncClient(base_url=base_url, headers=headers, timeout=timeout, transport=self.transport, follow_redirects=True)
+
+
+class PooledStorageClient(AsyncStorageClient):
+    """Storage client whose session sends through a shared InstrumentedTransport."""
+
+    def __init__(self, url: str, headers: dict[str, str], *, transport: InstrumentedTransport, timeout: httpx.Timeout) -> None:
+        """Initialize the client, keeping the transport for `_create_session`."""
+        self.transport = transport
+        super().__init__(url, headers, timeout)
+
+    def _create_session(
+        self,
+        base_url: str,
+        headers: dict[str, str],
+        timeout: httpx.Timeout | float,
+        verify: bool = True,  # noqa: ARG002, FBT001, FBT002
+        proxy: str | None = None,  # noqa: ARG002
+    ) -> httpx.AsyncClient:
+        """Create the session on the shared transport."""
+        return httpx.AsyncClient(base_url=base_url, headers=headers, timeout=timeout, transport=self.transport, follow_redirects=True)
+
+
+class PooledClient(AClient):
+    """
+    Supabase client whose PostgREST and storage clients share one tuned connection pool.
+
+    The transport is attached after `create`, before the first table or storage call
+    builds the lazily created sub-clients.
+    """
+
+    transport: InstrumentedTransport | None = None
+
+    def _init_postgrest_client(self, rest_url: str, headers: dict[str, str], schema: str, **kwargs: Any) -> AsyncPostgrestClient:  # noqa: ANN401 # as in AClient
+        """Build the PostgREST client on the shared transport."""
+        if self.transport is None:
+            return super()._init_postgrest_client(rest_url, headers, schema, **kwargs)
+        return PooledPostgrestClient(
+            rest_url,
+            headers=headers,
+            schema=schema,
+            timeout=self.transport.settings.timeout,
+            transport=self.transport,
+        )
+
+    def _init_storage_client(self, storage_url: str, headers: dict[str, str], *args: Any, **kwargs: Any) -> AsyncStorageClient:  # noqa: ANN401 # as in AClient
+        """Build the storage client on the shared transport."""
+        if self.transport is None:
+            return super()._init_storage_client(storage_url, headers, *args, **kwargs)
+        return PooledStorageClient(storage_url, headers, timeout=self.transport.settings.timeout, transport=self.transport)
+
+    async def close(self) -> None:
+        """Sign out, then close the connection pool even if signing out failed."""
+        try:
+            await self.auth.sign_out()
+        except Exception:  # noqa: BLE001
+            logger.exception("Client - Failed to sign out: pid=%s", os.getpid())
+        finally:
+            if self.transport is not None:
+                await self.transport.close()
+
+
+async def create_pooled_client(url: str, key: str, settings: PoolSettings) -> PooledClient:
+    """Create a Supabase client sending through a new InstrumentedTransport with `settings`."""
+    client = await PooledClient.create(url, key)
+    client.transport = InstrumentedTransport(settings)
+    logger.info(
+        "Client - Pool max_connections=%s; max_keepalive=%s; keepalive_expiry=%ss; http2=%s",
+        settings.max_connections,
+        settings.max_keepalive,
+        settings.keepalive_expiry,
+        settings.http2,
+    )
+    return client
@@ -1,9 +1,15 @@
 import argparse
+import importlib.util
+import os
+import shutil
+import tempfile
+from pathlib import Path
 
 import uvicorn
-from dotenv import set_key
 
 from src.config import Environment
+from utils.logger import logger
+from utils.seeder import positive_int
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -14,20 +20,88 @@ if __name__ == "__main__":
         default=None,
         help="Environment to start the app in (local, development, staging, production)",
     )
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="Run several worker processes without reload, using uvloop and httptools when installed",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes in production mode (defaults to the CPU count)",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to bind to")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     args = parser.parse_args()
 
     """
-    Passthrough desired environment by writing it to .env
-    This allows us to still load the correct settings when
-    uvicorn spawns FastAPI app in a different process.
+    Passthrough desired environment through the process environment.
+    uvicorn's reloader and workers inherit it when they spawn the
+    FastAPI app in a different process, and load_dotenv never
+    overrides a variable that is already set.
     """
 
-    set_key(dotenv_path=".env", key_to_set="ENVIRONMENT", value_to_set=args.env)
+    if args.env:
+        os.environ["ENVIRONMENT"] = args.env
 
-    uvicorn.run(
-        "src.app:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True,
-        log_level="debug",
-    )
+    if not args.prod:
+        uvicorn.run(
+            "src.app:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="debug",
+        )
+    else:
+        loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+        http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+        logger.info("Launcher - Starting %s worker(s) with loop=%s; http=%s", args.workers, loop, http)
+
+        # Each worker rotates its own log files, since workers rotating one shared
+        # file would overwrite each other's lines.
+        if args.workers > 1:
+            os.environ.setdefault("LOG_FILE_PER_PROCESS", "true")
+
+        # Workers share their metrics through files in METRICS_DIR. Files left by
+        # an earlier run are removed so counters start from zero with the workers.
+        # What the launcher creates itself is removed again once the workers exit.
+        created_metrics_dir = not os.getenv("METRICS_DIR")
+        metrics_dir = Path(os.getenv("METRICS_DIR") or tempfile.mkdtemp(prefix="micropos-metrics-"))
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        os.environ["METRICS_DIR"] = str(metrics_dir)
+        for stale in metrics_dir.glob("*.json"):
+            stale.unlink()
+        logger.info("Launcher - Sharing metrics through %s", metrics_dir)
+
+        # Workers draw from the same token buckets, kept in shared memory where the
+        # host has it. The table is emptied so no worker starts out throttled.
+        rate_limit_path = os.getenv("RATE_LIMIT_PATH")
+        created_rate_limit_path = not rate_limit_path
+        if created_rate_limit_path:
+            # mkstemp creates a uniquely named file only this user can open, so /dev/shm is safe to use.
+            shared_memory = Path("/dev/shm")  # noqa: S108
+            directory = shared_memory if shared_memory.is_dir() else None
+            rate_limit_fd, rate_limit_path = tempfile.mkstemp(prefix="micropos-ratelimit-", dir=directory)
+            os.close(rate_limit_fd)
+        Path(rate_limit_path).write_bytes(b"")
+        os.environ["RATE_LIMIT_PATH"] = rate_limit_path
+        logger.info("Launcher - Sharing rate limits through %s", rate_limit_path)
+
+        try:
+            uvicorn.run(
+                "src.app:app",
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                loop=loop,
+                http=http,
+                log_level="info",
+                proxy_headers=True,
+                timeout_graceful_shutdown=30,
+            )
+        finally:
+            if created_metrics_dir:
+                shutil.rmtree(metrics_dir, ignore_errors=True)
+            if created_rate_limit_path:
+                Path(rate_limit_path).unlink(missing_ok=True)
@@ -1,4 +1,5 @@
 import argparse
+
 from src.config import Environment, set_config
 from utils.logger import logger
 
@@ -0,0 +1,67 @@
+import argparse
+from pathlib import Path
+
+from utils.generator import DEFAULT_SHARD_SIZE, CategoryDistribution, DatasetGenerator, OutputFormat
+from utils.seeder import positive_int
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--items",
+        type=positive_int,
+        default=1_000_000,
+        help="Number of items to generate",
+    )
+    parser.add_argument(
+        "--categories",
+        type=positive_int,
+        default=50,
+        help="Number of categories to generate and link items to",
+    )
+    parser.add_argument(
+        "--distribution",
+        type=str,
+        choices=[d.value for d in CategoryDistribution],
+        default=CategoryDistribution.ZIPF.value,
+        help="How items are spread across categories (uniform, zipf)",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=[f.value for f in OutputFormat],
+        default=OutputFormat.NDJSON.value,
+        help="File format to write (ndjson, parquet)",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=Path("datasets/default"),
+        help="Directory to write the dataset to",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for all random draws; the same seed produces the same dataset",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=positive_int,
+        default=DEFAULT_SHARD_SIZE,
+        help="Number of items per output file",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes (defaults to the CPU count)",
+    )
+    args = parser.parse_args()
+
+    generator = DatasetGenerator(
+        output_dir=args.out,
+        seed=args.seed,
+        output_format=OutputFormat(args.format),
+        distribution=CategoryDistribution(args.distribution),
+    )
+    generator.generate(items=args.items, categories=args.categories, shard_size=args.shard_size, workers=args.workers)
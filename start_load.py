@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from src.config import Environment, set_config
+from utils.loader import DEFAULT_LOAD_BATCH_SIZE, main
+from utils.logger import logger
+from utils.seeder import DEFAULT_SEED_CONCURRENCY, positive_int
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        required=True,
+        help="Directory of a dataset written by start_generate.py",
+    )
+    parser.add_argument(
+        "--env",
+        type=str,
+        choices=[e.value for e in Environment],
+        default=None,
+        help="Environment to load into (local, development, staging, production)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=DEFAULT_LOAD_BATCH_SIZE,
+        help="Rows sent per insert",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=DEFAULT_SEED_CONCURRENCY,
+        help="Number of inserts in flight at once",
+    )
+    args = parser.parse_args()
+
+    set_config(args.env)
+
+    logger.info("Loader - Starting load from: %s", args.dir)
+
+    asyncio.run(main(args.dir, batch_size=args.batch_size, concurrency=args.concurrency))
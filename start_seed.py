@@ -3,7 +3,7 @@ import asyncio
 
 from src.config import Environment, set_config
 from utils.logger import logger
-from utils.seeder import main
+from utils.seeder import DEFAULT_SEED_CONCURRENCY, main, positive_int
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -20,10 +20,22 @@ if __name__ == "__main__":
         default=None,
         help="Environment to seed (local, development, staging, production)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=None,
+        help="Insert items in chunks of this size instead of one at a time",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=DEFAULT_SEED_CONCURRENCY,
+        help="Number of chunks inserted at once when --batch-size is set",
+    )
     args = parser.parse_args()
 
     set_config(args.env)
 
     logger.info("Seeder - Starting seeding process ...")
 
-    asyncio.run(main(items=args.count))
+    asyncio.run(main(items=args.count, batch_size=args.batch_size, concurrency=args.concurrency))
@@ -0,0 +1,37 @@
+import os
+import tempfile
+from collections.abc import Generator
+
+# The logger opens its files on import, so tests are pointed away from the repo's
+# logs/ directory before any module that logs is imported.
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="micropos-test-logs-"))
+
+import pytest
+
+from src import cache, ratelimit, snapshot
+
+
+@pytest.fixture(autouse=True)
+def reset_menu_cache() -> Generator[None, None, None]:
+    """Give every test a fresh menu cache so cached reads never leak between tests."""
+    cache.menu_cache = None
+    yield
+    cache.menu_cache = None
+
+
+@pytest.fixture(autouse=True)
+def reset_menu_snapshot() -> Generator[None, None, None]:
+    """Give every test a fresh menu snapshot that loads on first use."""
+    snapshot.menu_snapshot = None
+    yield
+    snapshot.menu_snapshot = None
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter() -> Generator[None, None, None]:
+    """Give every test fresh token buckets so requests of earlier tests are never charged against it."""
+    ratelimit.rate_limiter = None
+    yield
+    if ratelimit.rate_limiter is not None:
+        ratelimit.rate_limiter.buckets.close()
+    ratelimit.rate_limiter = None
@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from supabase import AClient, PostgrestAPIResponse
+
+from src.batching import BatchLoader, SingleFlight
+
+ROWS = [{"id": "1", "title": "Curry"}, {"id": "2", "title": "Soup"}]
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    """Create a mock Supabase client whose `in_` lookups return ROWS."""
+    client = MagicMock(spec=AClient)
+    client.table.return_value.select.return_value.in_.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=ROWS, count=None),
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_coalesced(client: MagicMock) -> None:
+    """Test that concurrent lookups share one upstream query."""
+    loader = BatchLoader("item")
+
+    results = await asyncio.gather(loader.load(client, "1"), loader.load(client, "2"), loader.load(client, "1"), loader.load(client, "3"))
+
+    assert results == [ROWS[0], ROWS[1], ROWS[0], None]
+    client.table.return_value.select.return_value.in_.assert_called_once_with("id", ["1", "2", "3"])
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_early(client: MagicMock) -> None:
+    """Test that a batch reaching max_batch does not wait for the window."""
+    loader = BatchLoader("item", window=60, max_batch=2)
+
+    results = await asyncio.wait_for(asyncio.gather(loader.load(client, "1"), loader.load(client, "2")), timeout=1)
+
+    assert results == ROWS
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller(client: MagicMock) -> None:
+    """Test that a failed batch query fails every lookup in it."""
+    client.table.return_value.select.return_value.in_.return_value.execute.side_effect = Exception("Database error")
+    loader = BatchLoader("item")
+
+    results = await asyncio.gather(loader.load(client, "1"), loader.load(client, "2"), return_exceptions=True)
+
+    assert all(str(result) == "Database error" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_call() -> None:
+    """Test that identical concurrent reads share one upstream call."""
+    flight = SingleFlight()
+    call = AsyncMock(return_value=ROWS)
+
+    results = await asyncio.gather(*(flight.do(("item", "*"), call) for _ in range(3)))
+
+    assert results == [ROWS, ROWS, ROWS]
+    assert call.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_errors_reach_every_waiter() -> None:
+    """Test that a failed shared call fails every waiter."""
+    flight = SingleFlight()
+    call = AsyncMock(side_effect=Exception("Database error"))
+
+    results = await asyncio.gather(*(flight.do(("item", "*"), call) for _ in range(2)), return_exceptions=True)
+
+    assert all(str(result) == "Database error" for result in results)
+    assert call.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_waiter() -> None:
+    """Test that cancelling one waiter leaves the shared call running for the others."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def call() -> list[dict[str, str]]:
+        await release.wait()
+        return ROWS
+
+    first = asyncio.create_task(flight.do("key", call))
+    second = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == ROWS
+    assert first.cancelled()
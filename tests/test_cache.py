@@ -0,0 +1,127 @@
+from unittest.mock import AsyncMock, call
+
+import pytest
+from fastapi import Request, Response, status
+
+from src.cache import CACHE_CONTROL, CacheKey, MenuCache, not_modified
+
+ITEM_LIST = CacheKey("item", params=(("available", None),))
+ITEM_DETAIL = CacheKey("item", id="123")
+OTHER_DETAIL = CacheKey("item", id="456")
+CATEGORY_LIST = CacheKey("category", params=(("available", None),))
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_value() -> None:
+    """Test that a second read is served from the cache."""
+    cache = MenuCache(ttl=60, max_size=10)
+    loader = AsyncMock(return_value="rows")
+
+    first = await cache.get_or_load(ITEM_LIST, loader)
+    second = await cache.get_or_load(ITEM_LIST, loader)
+
+    assert first.value == second.value == "rows"
+    assert first.etag == second.etag
+
+    assert loader.await_count == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_cache() -> None:
+    """Test that a TTL of 0 always reaches the loader."""
+    cache = MenuCache(ttl=0)
+    loader = AsyncMock(return_value="rows")
+
+    await cache.get_or_load(ITEM_LIST, loader)
+    await cache.get_or_load(ITEM_LIST, loader)
+
+    assert loader.await_args_list == [call(), call()]
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used entry is evicted first."""
+    cache = MenuCache(ttl=60, max_size=2)
+    cache.set(ITEM_LIST, 1)
+    cache.set(ITEM_DETAIL, 2)
+    cache.get(ITEM_LIST)
+    cache.set(OTHER_DETAIL, 3)
+
+    assert cache.get(ITEM_LIST).value == 1
+    assert cache.get(ITEM_DETAIL) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_is_exact() -> None:
+    """Test that a write drops list reads and the written ids only."""
+    cache = MenuCache(ttl=60, max_size=10)
+    for key in (ITEM_LIST, ITEM_DETAIL, OTHER_DETAIL, CATEGORY_LIST):
+        cache.set(key, "rows")
+
+    cache.invalidate("item", ["123"])
+
+    assert cache.get(ITEM_LIST) is None
+    assert cache.get(ITEM_DETAIL) is None
+    assert cache.get(OTHER_DETAIL) is not None
+    assert cache.get(CATEGORY_LIST) is not None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_load_skips_store() -> None:
+    """Test that a read racing a write does not store stale rows."""
+    cache = MenuCache(ttl=60, max_size=10)
+
+    async def loader() -> str:
+        cache.invalidate("item", ["123"])
+        return "stale"
+
+    assert (await cache.get_or_load(ITEM_LIST, loader)).value == "stale"
+    assert cache.get(ITEM_LIST) is None
+
+
+@pytest.mark.asyncio
+async def test_etag_changes_after_write() -> None:
+    """Test that a write changing the rows gives the next read a new ETag."""
+    cache = MenuCache(ttl=60, max_size=10)
+    loader = AsyncMock(side_effect=["rows", "written rows"])
+
+    before = await cache.get_or_load(ITEM_LIST, loader)
+    cache.invalidate("item", ["123"])
+    after = await cache.get_or_load(ITEM_LIST, loader)
+
+    assert before.etag != after.etag
+
+
+def test_not_modified_matches_etag() -> None:
+    """Test that a matching If-None-Match produces a bodyless 304."""
+    etag = '"abc-1"'
+    request = Request({"type": "http", "headers": [(b"if-none-match", b'W/"abc-1", "abc-0"')]})
+    response = Response()
+
+    not_modified_response = not_modified(request, response, etag)
+
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.body == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == CACHE_CONTROL
+
+
+def test_not_modified_requires_match() -> None:
+    """Test that a stale If-None-Match sends the full body."""
+    request = Request({"type": "http", "headers": [(b"if-none-match", b'"abc-0"')]})
+
+    assert not_modified(request, Response(), '"abc-1"') is None
+
+
+def test_etag_is_derived_from_content() -> None:
+    """Test that equal rows get the same ETag across reloads and workers, and changed rows a new one."""
+    worker, other_worker = MenuCache(ttl=60, max_size=10), MenuCache(ttl=60, max_size=10)
+
+    first = worker.set(ITEM_LIST, {"data": [{"id": "123", "title": "Curry"}], "count": 1})
+    reloaded = worker.set(ITEM_LIST, {"count": 1, "data": [{"title": "Curry", "id": "123"}]})
+    elsewhere = other_worker.set(ITEM_LIST, {"data": [{"id": "123", "title": "Curry"}], "count": 1})
+    changed = worker.set(ITEM_LIST, {"data": [{"id": "123", "title": "Laksa"}], "count": 1})
+
+    assert first.etag == reloaded.etag == elsewhere.etag
+    assert changed.etag != first.etag
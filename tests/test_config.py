@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.config import Configuration, CountStrategy, get_count_strategy, resolve_config
+
+BULK_CHUNK_SIZE = 50
+
+
+def test_requested_count_strategy_wins(mocker: MagicMock) -> None:
+    """Test that the client's count parameter overrides configured defaults."""
+    mocker.patch.object(Configuration, "_instance", mocker.Mock(count_defaults={"get_items": CountStrategy.PLANNED}))
+
+    assert get_count_strategy("get_items", CountStrategy.NONE, CountStrategy.EXACT) is CountStrategy.NONE
+
+
+def test_configured_count_strategy(mocker: MagicMock) -> None:
+    """Test that a COUNT_<ROUTE> setting replaces the route's built-in default."""
+    mocker.patch.object(Configuration, "_instance", mocker.Mock(count_defaults={"get_items": CountStrategy.PLANNED}))
+
+    assert get_count_strategy("get_items", None, CountStrategy.EXACT) is CountStrategy.PLANNED
+    assert get_count_strategy("get_item", None, CountStrategy.NONE) is CountStrategy.NONE
+
+
+def test_count_strategy_method() -> None:
+    """Test that `none` skips counting entirely."""
+    assert CountStrategy.NONE.method is None
+    assert CountStrategy.ESTIMATED.method == "estimated"
+
+
+def test_config_from_process_environment(mocker: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that settings are read from the process environment when there is no .env file."""
+    mocker.patch("src.config.Path.exists", return_value=False)
+    for name in ("API_URL", "API_KEY", "BULK_CHUNK_SIZE"):
+        mocker.patch.object(Configuration, name.lower(), None, create=True)
+    monkeypatch.setenv("API_URL", "https://example.supabase.co")
+    monkeypatch.setenv("BULK_CHUNK_SIZE", str(BULK_CHUNK_SIZE))
+
+    Configuration._parse_env("production")  # noqa: SLF001 # the parser is tested without resolve_config's caching
+
+    assert Configuration.api_url == "https://example.supabase.co"
+    assert Configuration.bulk_chunk_size == BULK_CHUNK_SIZE
+
+
+def test_config_without_file_or_environment(mocker: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a missing .env file is still an error when the process environment is not set up."""
+    mocker.patch("src.config.Path.exists", return_value=False)
+    monkeypatch.delenv("API_URL", raising=False)
+
+    with pytest.raises(FileNotFoundError):
+        Configuration._parse_env("production")  # noqa: SLF001 # the parser is tested without resolve_config's caching
+
+
+def test_resolve_config_parses_once(mocker: MagicMock) -> None:
+    """Test that the configuration is only resolved by the first caller in a process."""
+    load_dotenv = mocker.patch("src.config.load_dotenv")
+    set_config = mocker.patch("src.config.set_config")
+    mocker.patch.object(Configuration, "_instance", None)
+
+    resolve_config()
+    Configuration._instance = mocker.Mock()  # noqa: SLF001 # stands in for the instance the first call resolved
+    resolve_config()
+
+    load_dotenv.assert_called_once()
+    set_config.assert_called_once()
@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+
+from src import database
+from src.config import Backend, Configuration
+from src.repository.local import LocalClient
+from src.repository.memory import MemoryEngine
+from src.repository.sqlite import SQLiteEngine
+from src.transport import PooledClient
+
+
+@pytest.mark.asyncio
+async def test_lifespan_closes_client(mocker: MagicMock) -> None:
+    """Test that a worker shutting down closes its client and forgets it even if closing fails."""
+    client = MagicMock(spec=["close"])
+    client.close = AsyncMock(side_effect=Exception("Network error"))
+    mocker.patch("src.database.create_repository", AsyncMock(return_value=client))
+
+    with pytest.raises(Exception, match="Network error"):
+        async with database.lifespan(FastAPI()):
+            assert database.get_supabase_client() is client
+
+    client.close.assert_awaited_once()
+    assert database.supabase_client is None
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_closes_pool_when_sign_out_fails() -> None:
+    """Test that closing the Supabase client closes its pool even if signing out fails."""
+    client = MagicMock()
+    client.auth.sign_out = AsyncMock(side_effect=Exception("Network error"))
+    client.transport.close = AsyncMock()
+
+    await PooledClient.close(client)
+
+    client.transport.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("backend", "engine"), [(Backend.MEMORY, MemoryEngine), (Backend.SQLITE, SQLiteEngine)])
+async def test_create_repository_local(mocker: MagicMock, backend: Backend, engine: type) -> None:
+    """Test that a local backend is created from the Configuration without connecting to Supabase."""
+    mocker.patch.object(Configuration, "backend", backend, create=True)
+    mocker.patch.object(Configuration, "sqlite_path", ":memory:", create=True)
+    mocker.patch.object(Configuration, "_instance", Configuration())
+    create_supabase = mocker.patch("src.database.create_supabase")
+
+    client = await database.create_repository()
+
+    assert isinstance(client, LocalClient)
+    assert isinstance(client.engine, engine)
+    create_supabase.assert_not_called()
+    await client.close()
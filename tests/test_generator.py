@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from supabase import AClient
+
+from utils.exceptions import ItemSeedingError
+from utils.generator import DatasetGenerator
+from utils.loader import DatasetLoader
+
+ITEMS = 250
+CATEGORIES = 5
+MAX_CATEGORIES_PER_ITEM = 3
+
+
+def read_ndjson(path: Path) -> list[dict]:
+    """Read the rows of an NDJSON file."""
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Path:
+    """Generate a small dataset and return its directory."""
+    DatasetGenerator(tmp_path / "dataset", seed=7).generate(items=ITEMS, categories=CATEGORIES, shard_size=100, workers=1)
+    return tmp_path / "dataset"
+
+
+def test_generate_links_items_to_real_categories(dataset: Path) -> None:
+    """Test that every item references categories written to the same dataset."""
+    category_ids = {row["id"] for row in read_ndjson(dataset / "categories.ndjson")}
+    items = [row for path in sorted(dataset.glob("items-*")) for row in read_ndjson(path)]
+
+    assert len(category_ids) == CATEGORIES
+    assert len(items) == ITEMS
+    assert all(1 <= len(item["categories"]) <= MAX_CATEGORIES_PER_ITEM for item in items)
+    assert all(set(item["categories"]) <= category_ids for item in items)
+
+
+def test_generate_is_deterministic(dataset: Path, tmp_path: Path) -> None:
+    """Test that the same seed writes byte-identical files."""
+    DatasetGenerator(tmp_path / "again", seed=7).generate(items=ITEMS, categories=CATEGORIES, shard_size=100, workers=1)
+
+    for path in dataset.iterdir():
+        assert path.read_bytes() == (tmp_path / "again" / path.name).read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_loader_reports_failed_batches(dataset: Path, mocker: MagicMock) -> None:
+    """Test that the loader inserts categories first and aggregates failed batches."""
+    client = mocker.MagicMock(spec=AClient)
+    execute = client.table.return_value.insert.return_value.execute = mocker.AsyncMock(return_value=mocker.Mock(data=[{}]))
+    execute.side_effect = [execute.return_value, Exception("Database error")] + [execute.return_value] * 10
+
+    with pytest.raises(ItemSeedingError) as exc_info:
+        await DatasetLoader(client, batch_size=100, concurrency=1).load(dataset)
+
+    assert [call.args[0] for call in client.table.call_args_list][:2] == ["category", "item"]
+    assert exc_info.value.details["errors"][0]["details"]["file"] == "items-00000.ndjson"
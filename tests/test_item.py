@@ -1,7 +1,6 @@
+import asyncio
 import uuid
-from datetime import datetime, timezone
-from decimal import Decimal
-from typing import AsyncGenerator
+from collections.abc import AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -11,8 +10,7 @@ from httpx import AsyncClient
 from supabase import AClient, PostgrestAPIResponse
 
 from src.api.item.router import router as item_routes
-from src.api.item.schemas import Item, ItemResponseModel
-from src.database import lifespan
+from src.database import get_supabase_client
 
 # Test data
 SAMPLE_UUID = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
@@ -60,6 +58,20 @@ async def mock_supabase_client() -> AsyncGenerator[MagicMock, None]:
         yield client
 
 
+@pytest.fixture
+def supabase(app: FastAPI) -> MagicMock:
+    """Override the Supabase dependency of the app with a mock client."""
+    client = MagicMock(spec=AClient)
+    app.dependency_overrides[get_supabase_client] = lambda: client
+    return client
+
+
+@pytest.fixture
+def test_client(app: FastAPI) -> TestClient:
+    """Create a synchronous test client."""
+    return TestClient(app)
+
+
 @pytest.mark.anyio
 async def test_get_item_success(client: TestClient, mock_supabase_client: AsyncMock) -> None:
     """Test successful retrieval of a single item."""
@@ -68,10 +80,10 @@ async def test_get_item_success(client: TestClient, mock_supabase_client: AsyncM
         data=[SAMPLE_ITEM],
         count=1,
     )
-    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_response
+    mock_supabase_client.table.return_value.select.return_value.in_.return_value.execute.return_value = mock_response
 
     # Make the request
-    response = client.get(f"/item/{SAMPLE_UUID}")
+    response = client.get(f"/item/{SAMPLE_UUID}?count=exact")
 
     # Verify the response
     assert response.status_code == HTTP_OK
@@ -84,9 +96,9 @@ async def test_get_item_not_found(client: TestClient, mock_supabase_client: Asyn
     """Test retrieval of non-existent item."""
     # Mock empty response
     mock_response = PostgrestAPIResponse(data=[], count=0)
-    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_response
+    mock_supabase_client.table.return_value.select.return_value.in_.return_value.execute.return_value = mock_response
 
-    response = client.get(f"/item/{SAMPLE_UUID}")
+    response = client.get(f"/item/{SAMPLE_UUID}?count=exact")
     assert response.status_code == HTTP_OK
     assert response.json()["data"] == []
     assert response.json()["count"] == 0
@@ -99,7 +111,8 @@ async def test_get_items_success(client: TestClient, mock_supabase_client: Async
         data=[SAMPLE_ITEM],
         count=1,
     )
-    mock_supabase_client.table.return_value.select.return_value.execute.return_value = mock_response
+    select = mock_supabase_client.table.return_value.select.return_value
+    select.order.return_value.order.return_value.limit.return_value.execute.return_value = mock_response
 
     response = client.get("/item/")
     assert response.status_code == HTTP_OK
@@ -114,7 +127,8 @@ async def test_get_items_with_availability_filter(client: TestClient, mock_supab
         data=[SAMPLE_ITEM],
         count=1,
     )
-    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_response
+    select = mock_supabase_client.table.return_value.select.return_value
+    select.eq.return_value.order.return_value.order.return_value.limit.return_value.execute.return_value = mock_response
 
     response = client.get("/item/?available=true")
     assert response.status_code == HTTP_OK
@@ -142,7 +156,6 @@ async def test_create_item_success(client: TestClient, mock_supabase_client: Asy
     mock_supabase_client.table.return_value.insert.return_value.execute.return_value = mock_response
 
     response = client.post("/item/create", json=new_item)
-    print(response)
     assert response.status_code == HTTP_CREATED
     assert response.json()["data"][0]["title"] == "New Curry"
 
@@ -194,8 +207,274 @@ async def test_delete_item_success(client: TestClient, mock_supabase_client: Asy
 @pytest.mark.anyio
 async def test_supabase_error_handling(client: TestClient, mock_supabase_client: AsyncMock) -> None:
     """Test error handling when Supabase operations fail."""
-    mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.side_effect = Exception("Database error")
+    mock_supabase_client.table.return_value.select.return_value.in_.return_value.execute.side_effect = Exception("Database error")
 
     response = client.get(f"/item/{SAMPLE_UUID}")
     assert response.status_code == HTTP_INTERNAL_ERROR
     assert "Error ID" in response.json()["detail"]
+
+
+def test_create_items_bulk(test_client: TestClient, supabase: MagicMock) -> None:
+    """Test that a bulk create inserts valid rows in chunks and reports invalid rows."""
+    new_item = {"title": "New Curry", "price": "15.50", "is_available": True}
+    invalid_item = {"title": "Bad Curry", "price": "-1.00", "is_available": True}
+    supabase.table.return_value.insert.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[{**new_item, "id": str(SAMPLE_UUID)}], count=None),
+    )
+
+    response = test_client.post("/item/bulk", json=[new_item, invalid_item])
+
+    assert response.status_code == HTTP_CREATED
+    assert response.json()["count"] == 1
+    assert response.json()["errors"][0]["index"] == 1
+    inserted_rows = supabase.table.return_value.insert.call_args.args[0]
+    assert len(inserted_rows) == 1
+    assert inserted_rows[0]["price"] == "15.50"
+    assert inserted_rows[0]["created_at"] is not None
+
+
+def test_create_items_bulk_reports_rows_that_are_not_objects(test_client: TestClient, supabase: MagicMock) -> None:
+    """Test that a row that is not an object is reported by index instead of rejecting the whole batch."""
+    new_item = {"title": "New Curry", "price": "15.50", "is_available": True}
+    supabase.table.return_value.insert.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[{**new_item, "id": str(SAMPLE_UUID)}], count=None),
+    )
+
+    response = test_client.post("/item/bulk", json=["Curry", new_item, None])
+
+    assert response.status_code == HTTP_CREATED
+    assert response.json()["count"] == 1
+    assert [error["index"] for error in response.json()["errors"]] == [0, 2]
+    assert len(supabase.table.return_value.insert.call_args.args[0]) == 1
+
+
+def test_create_items_bulk_chunk_failure(test_client: TestClient, supabase: MagicMock, mocker: MagicMock) -> None:
+    """Test that a failed chunk marks its rows as failed without aborting later chunks."""
+    mocker.patch("src.api.item.router.get_bulk_chunk_size", return_value=1)
+    items = [{"title": f"Curry {i}", "price": "10.00", "is_available": True} for i in range(2)]
+    supabase.table.return_value.insert.return_value.execute = AsyncMock(
+        side_effect=[Exception("Database error"), PostgrestAPIResponse(data=[{**items[1], "id": str(SAMPLE_UUID)}], count=None)],
+    )
+
+    response = test_client.post("/item/bulk", json=items)
+
+    assert response.status_code == HTTP_CREATED
+    assert response.json()["count"] == 1
+    assert [error["index"] for error in response.json()["errors"]] == [0]
+    assert "Error ID" in response.json()["errors"][0]["error"]
+
+
+def test_update_items_bulk(test_client: TestClient, supabase: MagicMock) -> None:
+    """Test that a bulk update writes only the fields sent, with one update per distinct change, and reports unknown ids."""
+    unknown_uuid = uuid.UUID("123e4567-e89b-12d3-a456-426614174009")
+    table = supabase.table.return_value
+    table.update.return_value.in_.return_value.execute = AsyncMock(
+        side_effect=[
+            PostgrestAPIResponse(data=[{**SAMPLE_ITEM, "price": "9.00"}], count=None),
+            PostgrestAPIResponse(data=[], count=None),
+        ],
+    )
+
+    response = test_client.patch(
+        "/item/bulk",
+        json=[
+            {"id": str(SAMPLE_UUID), "price": "8.00"},
+            {"id": str(unknown_uuid), "price": "1.00"},
+            {"id": str(SAMPLE_UUID), "price": "9.00"},
+        ],
+    )
+
+    assert response.status_code == HTTP_OK
+    assert response.json()["count"] == 1
+    assert response.json()["errors"] == [{"index": 1, "error": "Item not found"}]
+    first_patch, second_patch = (call.args[0] for call in table.update.call_args_list)
+    assert first_patch.keys() == {"price", "updated_at"}
+    assert first_patch["price"] == "9.00"
+    assert second_patch["price"] == "1.00"
+    assert table.update.return_value.in_.call_args_list[0].args == ("id", [str(SAMPLE_UUID)])
+    table.upsert.assert_not_called()
+    table.select.assert_not_called()
+
+
+def test_update_items_bulk_sends_distinct_changes_concurrently(test_client: TestClient, supabase: MagicMock, mocker: MagicMock) -> None:
+    """Test that a reprice with a different price per item runs its updates concurrently, a bounded number at a time."""
+    mocker.patch("src.api.item.router.get_bulk_concurrency", return_value=3)
+    in_flight = peak = 0
+
+    async def execute() -> PostgrestAPIResponse:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return PostgrestAPIResponse(data=[], count=None)
+
+    supabase.table.return_value.update.return_value.in_.return_value.execute = execute
+    items = [{"id": str(uuid.UUID(int=number)), "price": f"{number}.00"} for number in range(1, 9)]
+
+    response = test_client.patch("/item/bulk", json=items)
+
+    assert response.status_code == HTTP_OK
+    assert len(response.json()["errors"]) == len(items)
+    assert supabase.table.return_value.update.call_count == len(items)
+    assert peak == 3  # noqa: PLR2004
+
+
+def test_get_items_by_id(test_client: TestClient, supabase: MagicMock) -> None:
+    """Test that a batch lookup resolves every id with one query."""
+    supabase.table.return_value.select.return_value.in_.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[SAMPLE_ITEM], count=None),
+    )
+
+    response = test_client.get(f"/item/batch?ids={SAMPLE_UUID}&ids={SAMPLE_CATEGORY_UUID}")
+
+    assert response.status_code == HTTP_OK
+    assert response.json()["count"] == 1
+    assert supabase.table.return_value.select.return_value.in_.call_args.args == ("id", [str(SAMPLE_UUID), str(SAMPLE_CATEGORY_UUID)])
+
+
+def test_get_items_counts_are_estimated_unless_requested(test_client: TestClient, supabase: MagicMock) -> None:
+    """Test that a listing asks for an estimated count by default and an exact one only when requested."""
+    supabase.table.return_value.select.return_value.order.return_value.order.return_value.limit.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[SAMPLE_ITEM], count=1),
+    )
+
+    test_client.get("/item/")
+    test_client.get("/item/?count=exact")
+
+    counts = [call.kwargs["count"] for call in supabase.table.return_value.select.call_args_list]
+    assert counts == ["estimated", "exact"]
+
+
+def test_export_items_streams_every_page(test_client: TestClient, supabase: MagicMock, mocker: MagicMock) -> None:
+    """Test that an export pages through the table and streams every row."""
+    mocker.patch("src.api.item.router.MAX_PAGE_SIZE", 1)
+    second_item = {**SAMPLE_ITEM, "id": str(SAMPLE_CATEGORY_UUID), "categories": []}
+    select = supabase.table.return_value.select.return_value
+    select.order.return_value.order.return_value.limit.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[SAMPLE_ITEM, second_item], count=None),
+    )
+    select.or_.return_value.order.return_value.order.return_value.limit.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[second_item], count=None),
+    )
+
+    response = test_client.get("/item/export?format=csv")
+
+    assert response.status_code == HTTP_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    header, *rows = response.text.splitlines()
+    assert header.startswith("title,price,is_available")
+    assert [row.split(",")[0] for row in rows] == [SAMPLE_ITEM["title"], second_item["title"]]
+    assert str(SAMPLE_CATEGORY_UUID) in rows[1]
+
+
+def test_import_items_ndjson(test_client: TestClient, supabase: MagicMock, mocker: MagicMock) -> None:
+    """Test that an NDJSON import inserts valid lines in chunks and reports invalid lines by number."""
+    mocker.patch("src.api.item.router.get_bulk_chunk_size", return_value=2)
+    supabase.table.return_value.insert.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[{"id": str(SAMPLE_UUID)}], count=None),
+    )
+    lines = [
+        '{"title": "Curry 1", "price": "10.00", "is_available": true}',
+        '{"title": "Curry 2", "price": "-1.00", "is_available": true}',
+        "",
+        '{"title": "Curry 3", "price": "11.00", "is_available": true}',
+        '{"title": "Curry 4", "price": "12.00", "is_available": false}',
+    ]
+
+    response = test_client.post("/item/import", content="\n".join(lines), headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == HTTP_CREATED
+    assert response.json()["accepted"] == [[1, 1], [4, 5]]
+    assert (response.json()["accepted_count"], response.json()["rejected_count"]) == (3, 1)
+    assert [error["line"] for error in response.json()["rejected"]] == [2]
+    assert response.json()["rejected"][0]["error"].startswith("price")
+    assert [len(call.args[0]) for call in supabase.table.return_value.insert.call_args_list] == [2, 1]
+
+
+@pytest.mark.parametrize(
+    ("import_format", "body"),
+    [
+        ("ndjson", b'{"title": "Curry", "price": "10.00", "is_available": true}\n{"title": "\xff", "price": "9.00", "is_available": true}'),
+        ("csv", b"title,price,is_available\nCurry,10.00,true\n\xff,9.00,true\n"),
+    ],
+)
+def test_import_items_rejects_lines_that_are_not_utf8(
+    test_client: TestClient,
+    supabase: MagicMock,
+    import_format: str,
+    body: bytes,
+) -> None:
+    """Test that a line that is not valid UTF-8 is rejected by number instead of imported with replacement characters."""
+    supabase.table.return_value.insert.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[{"id": str(SAMPLE_UUID)}], count=None),
+    )
+
+    response = test_client.post(f"/item/import?format={import_format}", content=body)
+
+    assert response.status_code == HTTP_CREATED
+    assert response.json()["rejected_count"] == 1
+    assert response.json()["rejected"][0]["line"] == (3 if import_format == "csv" else 2)
+    assert response.json()["rejected"][0]["error"].startswith("Invalid UTF-8 at byte")
+    assert [row["title"] for row in supabase.table.return_value.insert.call_args.args[0]] == ["Curry"]
+
+
+def test_import_items_csv(test_client: TestClient, supabase: MagicMock) -> None:
+    """Test that a CSV import maps records onto the header, including quoted multi-line fields."""
+    supabase.table.return_value.insert.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[{"id": str(SAMPLE_UUID)}], count=None),
+    )
+    body = f'title,description,price,is_available,categories\nCurry,"Spicy,\nhot",10.00,true,"[""{SAMPLE_CATEGORY_UUID}""]"\n'
+
+    response = test_client.post("/item/import?format=csv", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == HTTP_CREATED
+    assert response.json()["accepted"] == [[2, 2]]
+    inserted_row = supabase.table.return_value.insert.call_args.args[0][0]
+    assert inserted_row["description"] == "Spicy,\nhot"
+    assert inserted_row["categories"] == [str(SAMPLE_CATEGORY_UUID)]
+
+
+def test_import_items_csv_rejects_undecodable_records(test_client: TestClient, supabase: MagicMock) -> None:
+    """Test that text in brackets is kept as text and invalid JSON is rejected by line instead of failing the import."""
+    supabase.table.return_value.insert.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[{"id": str(SAMPLE_UUID)}], count=None),
+    )
+    body = "title,description,price,is_available,categories\nCurry,[development] tasty,10.00,true,\nDal,,9.00,true,[oops\n"
+
+    response = test_client.post("/item/import?format=csv", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == HTTP_CREATED
+    assert response.json()["accepted"] == [[2, 2]]
+    assert [error["line"] for error in response.json()["rejected"]] == [3]
+    assert response.json()["rejected"][0]["error"].startswith("categories: Invalid JSON")
+    inserted_row = supabase.table.return_value.insert.call_args.args[0][0]
+    assert inserted_row["description"] == "[development] tasty"
+
+
+def test_import_items_csv_bounds_an_open_quote(test_client: TestClient, supabase: MagicMock, mocker: MagicMock) -> None:
+    """Test that a record left open by a stray quote is rejected once it outgrows the record limit, and reading resumes."""
+    mocker.patch("src.streaming.MAX_RECORD_BYTES", 64)
+    supabase.table.return_value.insert.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[{"id": str(SAMPLE_UUID)}], count=None),
+    )
+    lines = ["title,description,price,is_available", 'Curry,"Spicy,10.00,true', *(f"Dal {n},Lentils,9.00,true" for n in range(1, 6))]
+
+    response = test_client.post("/item/import?format=csv", content="\n".join(lines), headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == HTTP_CREATED
+    assert [error["line"] for error in response.json()["rejected"]] == [2]
+    assert "longer than 64 bytes" in response.json()["rejected"][0]["error"]
+    assert response.json()["accepted"] == [[5, 7]]
+
+
+def test_import_items_csv_rejects_malformed_records(test_client: TestClient, supabase: MagicMock) -> None:
+    """Test that a record the csv module cannot read is rejected by line."""
+    body = 'title,description,price,is_available\nCurry,Spicy"hot,10.00,true\nDal,Lentils"mild,9.00,true\n'
+
+    response = test_client.post("/item/import?format=csv", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == HTTP_CREATED
+    assert [error["line"] for error in response.json()["rejected"]] == [2]
+    assert response.json()["rejected"][0]["error"].startswith("Malformed CSV record")
+    supabase.table.return_value.insert.assert_not_called()
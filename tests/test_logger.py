@@ -0,0 +1,66 @@
+import logging
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from utils.logger import DailyRotatingFileHandler, LoggerSetup, SamplingFilter
+
+
+def make_record(message: str, level: int = logging.DEBUG) -> logging.LogRecord:
+    """Create a log record for `message`."""
+    return logging.LogRecord("micropos-api", level, __file__, 1, message, None, None)
+
+
+def test_sampling_filter_limits_each_message(mocker: MagicMock) -> None:
+    """Test that a hot debug line is sampled per second and reports what was dropped."""
+    clock = mocker.patch("utils.logger.time.monotonic", return_value=100.0)
+    sampler = SamplingFilter(rate=2)
+
+    allowed = [sampler.filter(make_record("Client - Session started")) for _ in range(5)]
+    other = sampler.filter(make_record("Cache - Invalidated %s entries"))
+    warning = sampler.filter(make_record("Client - Session started", logging.WARNING))
+    clock.return_value = 101.0
+    resumed = make_record("Client - Session started")
+
+    assert allowed == [True, True, False, False, False]
+    assert other is True
+    assert warning is True
+    assert sampler.filter(resumed) is True
+    assert "3 similar message(s) dropped" in resumed.msg
+
+
+def test_file_handler_moves_to_new_day(tmp_path: Path, mocker: MagicMock) -> None:
+    """Test that a long-running process starts writing to the new date folder at midnight."""
+    today = mocker.patch.object(DailyRotatingFileHandler, "_today", return_value="2024-01-01")
+    handler = DailyRotatingFileHandler(tmp_path, "micropos-api.log", max_bytes=0, backup_count=1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    handler.emit(make_record("before midnight", logging.INFO))
+    today.return_value = "2024-01-02"
+    handler.emit(make_record("after midnight", logging.INFO))
+    handler.close()
+
+    assert (tmp_path / "2024-01-01" / "micropos-api.log").read_text() == "before midnight\n"
+    assert (tmp_path / "2024-01-02" / "micropos-api.log").read_text() == "after midnight\n"
+
+
+def test_file_handler_rotates_by_size(tmp_path: Path) -> None:
+    """Test that a full log file is rolled over into a numbered backup."""
+    handler = DailyRotatingFileHandler(tmp_path, "micropos-api.log", max_bytes=20, backup_count=1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    for message in ("first message line", "second message line"):
+        handler.emit(make_record(message, logging.INFO))
+    handler.close()
+
+    folder = Path(handler.baseFilename).parent
+    assert (folder / "micropos-api.log.1").read_text() == "first message line\n"
+    assert (folder / "micropos-api.log").read_text() == "second message line\n"
+
+
+def test_file_handler_per_process(mocker: MagicMock) -> None:
+    """Test that workers write separate files, so none rotates a file another is writing."""
+    mocker.patch.dict(os.environ, {"LOG_FILE_PER_PROCESS": "true"})
+    handler = LoggerSetup._file_handler("access.log")  # noqa: SLF001 # builds the handler without attaching it to a logger
+
+    assert Path(handler.baseFilename).name == f"access.{os.getpid()}.log"
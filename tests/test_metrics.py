@@ -0,0 +1,132 @@
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.api.metrics.router import router as metrics_routes
+from src.metrics import ERRORS, HTTP_IN_FLIGHT, HTTP_REQUEST_DURATION, HTTP_REQUESTS, MetricsRegistry, get_metrics
+from src.middleware import AccessLogMiddleware, count_server_errors
+from src.transport import upstream_labels
+from tests.test_middleware import create_test_app
+from utils.exceptions import get_error_id
+
+HTTP_OK = 200
+HTTP_SERVER_ERROR = 500
+
+
+def test_render_histogram() -> None:
+    """Test that histogram buckets are rendered cumulatively with their sum and count."""
+    registry = MetricsRegistry()
+    labels = {"method": "GET", "route": "/item/{item_id}"}
+    registry.observe(HTTP_REQUEST_DURATION, 0.003, labels)
+    registry.observe(HTTP_REQUEST_DURATION, 0.2, labels)
+    registry.observe(HTTP_REQUEST_DURATION, 60, labels)
+
+    text = registry.collect()
+
+    assert "# TYPE micropos_http_request_duration_seconds histogram" in text
+    assert 'micropos_http_request_duration_seconds_bucket{method="GET",route="/item/{item_id}",le="0.005"} 1' in text
+    assert 'micropos_http_request_duration_seconds_bucket{method="GET",route="/item/{item_id}",le="0.25"} 2' in text
+    assert 'micropos_http_request_duration_seconds_bucket{method="GET",route="/item/{item_id}",le="+Inf"} 3' in text
+    assert 'micropos_http_request_duration_seconds_count{method="GET",route="/item/{item_id}"} 3' in text
+    assert 'micropos_http_request_duration_seconds_sum{method="GET",route="/item/{item_id}"} 60.203' in text
+
+
+def test_workers_are_added_up(tmp_path: Path, mocker: MagicMock) -> None:
+    """Test that a scrape adds up the values written by every worker, dropping the gauges of exited ones."""
+    exited = MetricsRegistry(tmp_path)
+    mocker.patch("src.metrics.os.getpid", return_value=1)
+    exited.inc(HTTP_REQUESTS, {"method": "GET", "route": "/menu/snapshot", "status": "200"}, 3)
+    exited.inc(HTTP_IN_FLIGHT, amount=5)
+    exited.close()
+
+    mocker.patch("src.metrics.os.getpid", return_value=2)
+    serving = MetricsRegistry(tmp_path)
+    serving.inc(HTTP_REQUESTS, {"method": "GET", "route": "/menu/snapshot", "status": "200"}, 2)
+    serving.inc(HTTP_IN_FLIGHT)
+
+    text = serving.collect()
+
+    assert 'micropos_http_requests_total{method="GET",route="/menu/snapshot",status="200"} 5' in text
+    assert "micropos_http_requests_in_flight 1" in text
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["1.json", "2.json"]
+
+
+def test_upstream_labels() -> None:
+    """Test that Supabase requests are labelled by table and operation."""
+    base = "https://project.supabase.co"
+
+    assert upstream_labels(httpx.Request("GET", f"{base}/rest/v1/item?id=eq.1")) == {"table": "item", "operation": "select"}
+    assert upstream_labels(httpx.Request("PATCH", f"{base}/rest/v1/category")) == {"table": "category", "operation": "update"}
+    assert upstream_labels(
+        httpx.Request("POST", f"{base}/rest/v1/item", headers={"Prefer": "resolution=merge-duplicates"}),
+    ) == {"table": "item", "operation": "upsert"}
+    assert upstream_labels(httpx.Request("POST", f"{base}/rest/v1/rpc/reorder")) == {"table": "reorder", "operation": "rpc"}
+    assert upstream_labels(httpx.Request("DELETE", f"{base}/storage/v1/object/images/a.png")) == {"table": "storage", "operation": "delete"}
+
+
+def test_errors_counted_by_exception_class(mocker: MagicMock) -> None:
+    """Test that a server error is counted once, by the class of the exception it was raised from."""
+    registry = MetricsRegistry()
+    mocker.patch("src.middleware.metrics", registry)
+    mocker.patch("src.middleware.access_logger")
+    app = FastAPI()
+    app.add_middleware(AccessLogMiddleware)
+    app.add_exception_handler(HTTPException, count_server_errors)
+
+    @app.get("/timeout")
+    async def timeout() -> None:
+        raise HTTPException(status_code=500, detail=f"Error ID: {get_error_id()}") from TimeoutError()
+
+    @app.get("/missing")
+    async def missing() -> None:
+        raise HTTPException(status_code=404)
+
+    client = TestClient(app)
+    assert client.get("/timeout").status_code == HTTP_SERVER_ERROR
+    client.get("/missing")
+
+    assert 'micropos_errors_total{exception="TimeoutError"} 1' in registry.collect()
+    assert registry.snapshot()[ERRORS.name]["values"] == {'[["exception", "TimeoutError"]]': 1}
+
+
+def test_metrics_route(mocker: MagicMock) -> None:
+    """Test that served requests show up on /metrics under their route template."""
+    registry = MetricsRegistry()
+    mocker.patch("src.middleware.metrics", registry)
+    mocker.patch("src.middleware.access_logger")
+    app = create_test_app()
+    app.include_router(metrics_routes)
+    app.dependency_overrides[get_metrics] = lambda: registry
+    client = TestClient(app)
+
+    client.post("/things/7", content=b"{}")
+    client.get("/nowhere")
+    response = client.get("/metrics")
+
+    assert response.status_code == HTTP_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'micropos_http_requests_total{method="POST",route="/things/{thing_id}",status="200"} 1' in response.text
+    assert 'micropos_http_requests_total{method="GET",route="unmatched",status="404"} 1' in response.text
+    assert "micropos_http_requests_in_flight 1" in response.text
+
+
+def test_shared_metrics_route_snapshots_on_the_event_loop(tmp_path: Path) -> None:
+    """Test that collectors run on the event loop thread, and only the shared files are handled in a worker thread."""
+    registry = MetricsRegistry(tmp_path)
+    threads = []
+    registry.add_collector(lambda _: threads.append(threading.current_thread()))
+    app = FastAPI()
+    app.include_router(metrics_routes)
+    app.dependency_overrides[get_metrics] = lambda: registry
+
+    with TestClient(app) as client:
+        loop_thread = client.portal.call(threading.current_thread)
+        response = client.get("/metrics")
+
+    assert response.status_code == HTTP_OK
+    assert threads == [loop_thread]
+    assert list(tmp_path.glob("*.json"))
@@ -0,0 +1,91 @@
+import json
+import uuid
+from unittest.mock import MagicMock
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from src.middleware import AccessLogMiddleware, ServerTimingMiddleware, TimedRoute
+from src.timing import record_upstream, timer
+from utils.exceptions import get_error_id, request_id_var
+
+HTTP_OK = 200
+HTTP_NOT_FOUND = 404
+UPSTREAM_SECONDS = 0.25
+
+
+def create_test_app() -> FastAPI:
+    """Create an app with one timed route that records an upstream call."""
+    router = APIRouter(prefix="/things", route_class=TimedRoute)
+
+    @router.post("/{thing_id}")
+    async def echo(thing_id: int, body: dict) -> dict:
+        record_upstream(UPSTREAM_SECONDS)
+        with timer("pricing"):
+            return {"id": thing_id, **body}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(AccessLogMiddleware)
+    return app
+
+
+def test_access_log_line(mocker: MagicMock) -> None:
+    """Test that a request is logged as one JSON line with its route template and latency breakdown."""
+    access_logger = mocker.patch("src.middleware.access_logger")
+
+    response = TestClient(create_test_app()).post("/things/7", content=b'{"name":"Curry"}', headers={"X-Request-ID": "abc"})
+
+    assert response.status_code == HTTP_OK
+    assert response.headers["X-Request-ID"] == "abc"
+    line = json.loads(access_logger.info.call_args.args[0])
+    assert line["request_id"] == "abc"
+    assert line["method"] == "POST"
+    assert line["route"] == "/things/{thing_id}"
+    assert line["path"] == "/things/7"
+    assert line["status"] == HTTP_OK
+    assert line["upstream_ms"] == UPSTREAM_SECONDS * 1000
+    assert line["upstream_calls"] == 1
+    assert line["validation_ms"] > 0
+    assert line["serialization_ms"] > 0
+    assert line["request_bytes"] == len(b'{"name":"Curry"}')
+    assert line["response_bytes"] == len(response.content)
+
+
+def test_access_log_generates_request_id(mocker: MagicMock) -> None:
+    """Test that a request without an id is given one, and that unmatched paths are still logged."""
+    access_logger = mocker.patch("src.middleware.access_logger")
+
+    response = TestClient(create_test_app()).get("/missing")
+
+    line = json.loads(access_logger.info.call_args.args[0])
+    assert response.status_code == HTTP_NOT_FOUND
+    assert response.headers["X-Request-ID"] == line["request_id"]
+    assert uuid.UUID(line["request_id"]).hex == line["request_id"]
+    assert line["route"] is None
+
+
+def test_error_id_carries_request_id() -> None:
+    """Test that error ids raised while serving a request are prefixed with its request id."""
+    assert ":" not in get_error_id()
+
+    token = request_id_var.set("abc")
+    try:
+        assert get_error_id().startswith("abc:")
+    finally:
+        request_id_var.reset(token)
+
+
+def test_server_timing_header(mocker: MagicMock) -> None:
+    """Test that opted-in routers report their timings, including those recorded by the handler."""
+    mocker.patch("src.middleware.access_logger")
+    app = create_test_app()
+    app.add_middleware(ServerTimingMiddleware, prefixes=("/things",))
+    client = TestClient(app)
+
+    response = client.post("/things/7", content=b"{}")
+
+    entries = dict(entry.split(";", 1) for entry in response.headers["Server-Timing"].split(", "))
+    assert entries["upstream"].startswith('dur=250.000;desc="Supabase round trip"')
+    assert set(entries) == {"upstream", "pricing", "validation", "serialization", "total"}
+    assert "server-timing" not in client.get("/missing").headers
@@ -0,0 +1,112 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+from postgrest import AsyncPostgrestClient
+
+from src.pagination import decode_cursor, encode_cursor, paginate, to_page
+from src.repository.base import Engine
+from src.repository.local import LocalClient
+from src.repository.memory import MemoryEngine
+from src.repository.sqlite import SQLiteEngine
+
+HTTP_BAD_REQUEST = 400
+
+ROWS = [
+    {"id": "123e4567-e89b-12d3-a456-426614174000", "created_at": "2024-10-24T12:00:00+00:00"},
+    {"id": "123e4567-e89b-12d3-a456-426614174001", "created_at": "2024-10-24T12:00:00+00:00"},
+    {"id": "123e4567-e89b-12d3-a456-426614174002", "created_at": "2024-10-25T12:00:00+00:00"},
+]
+
+
+def test_cursor_round_trip() -> None:
+    """Test that a cursor decodes back to the keyset position of its row."""
+    cursor = encode_cursor(ROWS[1])
+
+    assert decode_cursor(cursor) == (ROWS[1]["created_at"], ROWS[1]["id"])
+
+
+def test_invalid_cursor_is_rejected() -> None:
+    """Test that a tampered cursor is a client error."""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor")
+
+    assert exc_info.value.status_code == HTTP_BAD_REQUEST
+
+
+def test_paginate_builds_keyset_query() -> None:
+    """Test that a page is ordered by (created_at, id) and starts after the cursor."""
+    select = AsyncPostgrestClient("http://test").table("item").select("*")
+
+    query = paginate(select, (ROWS[1]["created_at"], ROWS[1]["id"]), 2)
+
+    assert query.params["order"] == "created_at,id"
+    assert query.params["limit"] == "3"
+    assert query.params["or"] == (
+        f'(created_at.gt."{ROWS[1]["created_at"]}",and(created_at.eq."{ROWS[1]["created_at"]}",id.gt.{ROWS[1]["id"]}),created_at.is.null)'
+    )
+
+
+def test_to_page_sets_next_cursor() -> None:
+    """Test that the look-ahead row is trimmed and becomes the next cursor."""
+    page = to_page(ROWS, None, 2)
+
+    assert page["data"] == ROWS[:2]
+    assert decode_cursor(page["next_cursor"]) == (ROWS[1]["created_at"], ROWS[1]["id"])
+
+
+def test_to_page_last_page() -> None:
+    """Test that the last page has no next cursor."""
+    page = to_page(ROWS, 3, 3)
+
+    assert page["data"] == ROWS
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "position",
+    [
+        ['2024-10-24T12:00:00",id.gt.0,and(x.eq."1', ROWS[0]["id"]],
+        [ROWS[0]["created_at"], "1),or(id.gt.0"],
+        [12, ROWS[0]["id"]],
+    ],
+)
+def test_cursor_with_invalid_position_is_rejected(position: list) -> None:
+    """Test that a cursor whose values are not a timestamp and a UUID is a client error, so it never reaches a filter."""
+    cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.status_code == HTTP_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine", [MemoryEngine(), SQLiteEngine(":memory:")], ids=["memory", "sqlite"])
+async def test_pages_continue_past_rows_without_created_at(engine: Engine) -> None:
+    """Test that rows with a null created_at are paged last, by id, instead of ending the listing with a rejected cursor."""
+    rows = [*ROWS, {"id": "123e4567-e89b-12d3-a456-426614174004", "created_at": None}, {"id": "123e4567-e89b-12d3-a456-426614174003"}]
+    client = LocalClient(engine)
+    await client.table("item").insert(rows).execute()
+
+    seen, after = [], None
+    while True:
+        page = to_page((await paginate(client.table("item").select("*"), after, 2).execute()).data, None, 2)
+        seen.extend(row["id"] for row in page["data"])
+        if page["next_cursor"] is None:
+            break
+        after = decode_cursor(page["next_cursor"])
+
+    assert seen == [row["id"] for row in ROWS] + ["123e4567-e89b-12d3-a456-426614174003", "123e4567-e89b-12d3-a456-426614174004"]
+
+
+def test_paginate_after_a_row_without_created_at() -> None:
+    """Test that the page after an undated row only holds the undated rows that follow it by id."""
+    select = AsyncPostgrestClient("http://test").table("item").select("*")
+
+    query = paginate(select, decode_cursor(encode_cursor({"id": ROWS[0]["id"], "created_at": None})), 2)
+
+    assert query.params["created_at"] == "is.null"
+    assert query.params["id"] == f"gt.{ROWS[0]['id']}"
+    assert "or" not in query.params
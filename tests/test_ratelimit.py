@@ -0,0 +1,119 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src import ratelimit
+from src.api.category.router import router as category_routes
+from src.database import get_supabase_client
+from src.metrics import RATE_LIMITED
+from src.ratelimit import BULK_COST, READ_COST, WRITE_COST, RateLimiter, TokenBuckets, client_key, route_cost
+from src.repository.local import LocalClient
+from src.repository.memory import MemoryEngine
+
+HTTP_OK = 200
+HTTP_CREATED = 201
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+def test_bucket_refills_at_rate() -> None:
+    """Test that a bucket allows a burst, then refills at its rate and reports how long to wait."""
+    buckets = TokenBuckets()
+
+    allowed = [buckets.take("terminal:1", 1, rate=2, burst=3, now=10.0) for _ in range(3)]
+    rejected = buckets.take("terminal:1", 1, rate=2, burst=3, now=10.0)
+    refilled = buckets.take("terminal:1", 1, rate=2, burst=3, now=10.5)
+    other = buckets.take("terminal:2", 1, rate=2, burst=3, now=10.5)
+
+    assert allowed == [0.0, 0.0, 0.0]
+    assert rejected == 0.5  # noqa: PLR2004
+    assert refilled == 0.0
+    assert other == 0.0
+
+
+def test_buckets_are_shared_through_a_file(tmp_path: Path) -> None:
+    """Test that two workers mapping the same file draw from the same buckets."""
+    path = str(tmp_path / "ratelimit")
+    first, second = TokenBuckets(path), TokenBuckets(path)
+
+    first.take("key:a", 5, rate=1, burst=5, now=1.0)
+    wait = second.take("key:a", 1, rate=1, burst=5, now=1.0)
+
+    assert wait == 1.0
+    first.close()
+    second.close()
+
+
+def test_full_set_gives_up_oldest_bucket() -> None:
+    """Test that a key hashed to a full set takes over the bucket counted longest ago, starting full."""
+    buckets = TokenBuckets(sets=1)
+    for index in range(4):
+        buckets.take(f"terminal:{index}", 2, rate=1, burst=2, now=float(index + 1))
+
+    newcomer = buckets.take("terminal:new", 2, rate=1, burst=2, now=5.0)
+    evicted = buckets.take("terminal:0", 2, rate=1, burst=2, now=5.0)
+    kept = buckets.take("terminal:3", 2, rate=1, burst=2, now=5.0)
+
+    assert newcomer == 0.0
+    assert evicted == 0.0
+    assert kept == 1.0
+
+
+def test_route_cost() -> None:
+    """Test that bulk routes cost more than writes, and writes more than reads."""
+    assert route_cost("GET", "/item/{item_id}") == READ_COST
+    assert route_cost("PATCH", "/item/{item_id}") == WRITE_COST
+    assert route_cost("POST", "/item/import") == BULK_COST
+    assert route_cost("GET", "/item/export") == BULK_COST
+
+
+def test_routes_reject_client_over_limit(mocker: MagicMock) -> None:
+    """Test that a terminal over its limit is answered 429 with Retry-After, while other known terminals are not."""
+    mocker.patch("src.middleware.access_logger")
+    inc = mocker.patch("src.ratelimit.metrics.inc")
+    known = frozenset({"till-1", "till-2"})
+    ratelimit.rate_limiter = RateLimiter(TokenBuckets(), rate=1, burst=WRITE_COST + READ_COST, known_clients=known)
+    app = FastAPI()
+    app.include_router(category_routes)
+    local = LocalClient(MemoryEngine())
+    app.dependency_overrides[get_supabase_client] = lambda: local
+    client = TestClient(app)
+    terminal = {"X-Terminal-ID": "till-1"}
+
+    created = client.post("/category/create", json={"title": "Mains"}, headers=terminal)
+    listed = client.get("/category/", headers=terminal)
+    rejected = client.get("/category/", headers=terminal)
+    other = client.get("/category/", headers={"X-Terminal-ID": "till-2"})
+
+    assert created.status_code == HTTP_CREATED
+    assert listed.status_code == HTTP_OK
+    assert rejected.status_code == HTTP_TOO_MANY_REQUESTS
+    assert rejected.headers["Retry-After"] == "1"
+    assert other.status_code == HTTP_OK
+    assert local.engine.tables["category"].rows
+    inc.assert_called_once_with(RATE_LIMITED, {"route": "/category/"})
+
+
+def request_from(host: str, headers: dict[str, str]) -> Request:
+    """Create a request sent from `host` with `headers`."""
+    encoded = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": encoded, "client": (host, 50000)})
+
+
+def test_client_key_trusts_known_keys_and_terminals() -> None:
+    """Test that known API keys and terminals get their own bucket, ahead of the address they share."""
+    known = frozenset({"key-a", "till-1", "till-2"})
+
+    assert client_key(request_from("10.0.0.1", {"X-API-Key": "key-a", "X-Terminal-ID": "till-1"}), known) == "key:key-a"
+    assert client_key(request_from("10.0.0.1", {"Authorization": "Bearer key-a"}), known) == "key:key-a"
+    assert client_key(request_from("10.0.0.1", {"X-Terminal-ID": "till-2"}), known) == "terminal:till-2"
+    assert client_key(request_from("10.0.0.1", {}), known) == "ip:10.0.0.1"
+
+
+def test_client_key_ignores_unknown_headers() -> None:
+    """Test that unknown keys and terminals fall back to the address, so a new value does not buy a fresh bucket."""
+    known = frozenset({"till-1"})
+
+    assert client_key(request_from("10.0.0.1", {"X-API-Key": "b", "X-Terminal-ID": "till-9"}), known) == "ip:10.0.0.1"
+    assert client_key(request_from("10.0.0.1", {"X-Terminal-ID": "till-1"})) == "ip:10.0.0.1"
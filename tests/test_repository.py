@@ -0,0 +1,123 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from postgrest.exceptions import APIError
+
+from src.api.item.router import router as item_routes
+from src.database import get_supabase_client
+from src.pagination import paginate
+from src.repository.filters import Group, parse_logical
+from src.repository.local import LocalClient
+from src.repository.memory import MemoryEngine
+from src.repository.sqlite import SQLiteEngine
+
+HTTP_CREATED = 201
+
+ROWS = [
+    {
+        "id": f"00000000-0000-4000-8000-00000000000{i}",
+        "title": f"Item {i}",
+        "is_available": i % 2 == 0,
+        "created_at": f"2024-01-0{i}T00:00:00+00:00",
+    }
+    for i in range(1, 7)
+]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def client(request: pytest.FixtureRequest) -> LocalClient:
+    """Return a LocalClient on each engine."""
+    return LocalClient(MemoryEngine() if request.param == "memory" else SQLiteEngine(":memory:"))
+
+
+def test_parse_logical() -> None:
+    """Test that the `or_` syntax written by the pagination is parsed into a filter tree."""
+    node = parse_logical('or(created_at.gt."2024-01-01T00:00:00",and(created_at.eq."2024-01-01T00:00:00",id.gt.5))')
+
+    assert node.operator == "or"
+    assert node.terms[0] == ("created_at", "gt", "2024-01-01T00:00:00")
+    assert node.terms[1] == Group("and", (("created_at", "eq", "2024-01-01T00:00:00"), ("id", "gt", "5")))
+
+
+@pytest.mark.asyncio
+async def test_select_filters(client: LocalClient) -> None:
+    """Test that eq, in and or filters, ordering, limits and counts behave as PostgREST's do."""
+    await client.table("item").insert(ROWS).execute()
+
+    select = client.table("item").select("*", count="exact").eq("is_available", "True")
+    available = await select.order("created_at", desc=True).limit(2).execute()
+    by_id = await client.table("item").select("id,title").in_("id", [ROWS[0]["id"], ROWS[4]["id"]]).order("id").execute()
+    page = await paginate(client.table("item").select("*"), (ROWS[2]["created_at"], ROWS[2]["id"]), 2).execute()
+
+    assert [row["title"] for row in available.data] == ["Item 6", "Item 4"]
+    assert available.count == len(ROWS) // 2
+    assert by_id.data == [{"id": ROWS[0]["id"], "title": "Item 1"}, {"id": ROWS[4]["id"], "title": "Item 5"}]
+    assert by_id.count is None
+    assert [row["title"] for row in page.data] == ["Item 4", "Item 5", "Item 6"]
+
+
+@pytest.mark.asyncio
+async def test_writes(client: LocalClient) -> None:
+    """Test that inserts get defaults, duplicates are rejected, and upserts, updates and deletes keep indexes in step."""
+    created = await client.table("item").insert({"title": "New", "is_available": False}).execute()
+    row_id = created.data[0]["id"]
+
+    with pytest.raises(APIError):
+        await client.table("item").insert({"id": row_id, "title": "Again"}).execute()
+    await client.table("item").update({"is_available": True}).eq("id", row_id).execute()
+    await client.table("item").upsert({"id": row_id, "title": "Renamed"}, on_conflict="id").execute()
+    available = await client.table("item").select("*").eq("is_available", "True").execute()
+    deleted = await client.table("item").delete().eq("id", row_id).execute()
+    remaining = await client.table("item").select("*", count="exact").execute()
+
+    assert created.data[0]["created_at"]
+    assert available.data == [{**created.data[0], "title": "Renamed", "is_available": True}]
+    assert [row["id"] for row in deleted.data] == [row_id]
+    assert remaining.count == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_insert_stores_no_rows(client: LocalClient) -> None:
+    """Test that an insert hitting a duplicate key partway, or repeating a key, stores none of its rows."""
+    await client.table("item").insert(ROWS[2]).execute()
+
+    with pytest.raises(APIError):
+        await client.table("item").insert(ROWS[:4]).execute()
+    with pytest.raises(APIError):
+        await client.table("item").insert([ROWS[0], ROWS[1], ROWS[0]]).execute()
+    remaining = await client.table("item").select("id").execute()
+
+    assert remaining.data == [{"id": ROWS[2]["id"]}]
+
+
+@pytest.mark.asyncio
+async def test_returned_rows_are_copies() -> None:
+    """Test that changing a returned row does not change the stored one."""
+    client = LocalClient(MemoryEngine())
+    await client.table("item").insert({**ROWS[0], "categories": ["a"]}).execute()
+
+    first = await client.table("item").select("*").execute()
+    first.data[0]["categories"].append("b")
+    second = await client.table("item").select("*").execute()
+
+    assert second.data[0]["categories"] == ["a"]
+
+
+def test_routes_run_on_local_backend(mocker: MagicMock) -> None:
+    """Test that the item routes run unchanged against a local backend."""
+    mocker.patch("src.middleware.access_logger")
+    app = FastAPI()
+    app.include_router(item_routes)
+    local = LocalClient(MemoryEngine())
+    app.dependency_overrides[get_supabase_client] = lambda: local
+    client = TestClient(app)
+
+    created = client.post("/item/create", json={"title": "Curry", "price": "12.50", "is_available": True})
+    listed = client.get("/item/", params={"available": True})
+    detail = client.get(f"/item/{created.json()['data'][0]['id']}")
+
+    assert created.status_code == HTTP_CREATED
+    assert [row["title"] for row in listed.json()["data"]] == ["Curry"]
+    assert detail.json()["data"][0]["price"] == "12.50"
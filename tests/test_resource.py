@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.category.router import router as category_routes
+from src.api.category.schemas import CategoryCreate, CategoryResponseModel, CategoryUpdate
+from src.api.resource import Resource, add_crud_routes
+from src.cache import get_menu_cache
+from src.database import get_supabase_client
+from src.repository.local import LocalClient
+from src.repository.memory import MemoryEngine
+from src.snapshot import get_menu_snapshot
+
+HTTP_OK = 200
+HTTP_CREATED = 201
+HTTP_UNPROCESSABLE = 422
+
+
+@pytest.fixture
+def local() -> LocalClient:
+    """Return a LocalClient on an empty memory engine."""
+    return LocalClient(MemoryEngine())
+
+
+def create_client(router: APIRouter, local: LocalClient, mocker: MagicMock) -> tuple[TestClient, MagicMock, MagicMock]:
+    """Serve a router against a local backend, returning the client with a mock cache and snapshot."""
+    mocker.patch("src.middleware.access_logger")
+    app = FastAPI()
+    app.include_router(router)
+    cache, snapshot = MagicMock(), MagicMock()
+    cache.get_or_load.side_effect = lambda _, loader: loader_entry(loader)
+    app.dependency_overrides[get_supabase_client] = lambda: local
+    app.dependency_overrides[get_menu_cache] = lambda: cache
+    app.dependency_overrides[get_menu_snapshot] = lambda: snapshot
+    return TestClient(app), cache, snapshot
+
+
+async def loader_entry(loader: MagicMock) -> MagicMock:
+    """Run a cache loader and wrap its value the way a cache miss does."""
+    return MagicMock(value=await loader(), etag='"1"')
+
+
+def test_category_routes(local: LocalClient, mocker: MagicMock) -> None:
+    """Test that the generated category routes create, read, list, update and delete a row."""
+    client, cache, snapshot = create_client(category_routes, local, mocker)
+
+    created = client.post("/category/create", json={"title": "Mains", "is_available": True}).json()["data"][0]
+    updated = client.patch(f"/category/{created['id']}", json={"title": "Sides", "is_available": True})
+    fetched = client.get(f"/category/{created['id']}", params={"count": "exact"})
+    listed = client.get("/category/", params={"available": True})
+    deleted = client.delete(f"/category/{created['id']}")
+
+    assert created["created_at"]
+    assert updated.json()["data"][0]["title"] == "Sides"
+    assert updated.json()["data"][0]["updated_at"]
+    assert fetched.json() == {**updated.json(), "count": 1, "next_cursor": None}
+    assert [row["id"] for row in listed.json()["data"]] == [created["id"]]
+    assert deleted.status_code == HTTP_OK
+    assert local.engine.tables["category"].rows == {}
+    cache.invalidate.assert_called_with("category", [created["id"]])
+    snapshot.remove.assert_called_once()
+
+
+def test_new_resource_gets_every_route(local: LocalClient, mocker: MagicMock) -> None:
+    """Test that a resource declared for a new table gets the five routes, and leaves the menu snapshot alone."""
+    router = APIRouter(prefix="/tag")
+    add_crud_routes(
+        router,
+        Resource("tag", response_model=CategoryResponseModel, create_model=CategoryCreate, update_model=CategoryUpdate),
+    )
+    client, _, snapshot = create_client(router, local, mocker)
+
+    created = client.post("/tag/create", json={"title": "Spicy"})
+    missing = client.get("/tag/00000000-0000-4000-8000-000000000000")
+    invalid = client.patch("/tag/not-a-uuid", json={})
+
+    assert [(route.name, route.path) for route in router.routes] == [
+        ("get_tag", "/tag/{tag_id}"),
+        ("get_tags", "/tag/"),
+        ("create_tag", "/tag/create"),
+        ("update_tag", "/tag/{tag_id}"),
+        ("delete_tag", "/tag/{tag_id}"),
+    ]
+    assert created.status_code == HTTP_CREATED
+    assert missing.json()["data"] == []
+    assert invalid.status_code == HTTP_UNPROCESSABLE
+    snapshot.apply.assert_not_called()
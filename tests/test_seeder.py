@@ -1,12 +1,14 @@
+import argparse
 from decimal import Decimal
+from unittest.mock import MagicMock
 from uuid import UUID
 
 import pytest
-from pydantic import ValidationError
-
 from supabase import AClient
+
+from src.config import Environment
 from utils.exceptions import ItemSeedingError, ValidationSeedingError
-from utils.seeder import DataSeeder
+from utils.seeder import DataSeeder, positive_int
 
 
 @pytest.fixture
@@ -95,3 +97,42 @@ async def test_seed_items_complete_failure(seeder, mocker):
     assert "Seeding completed with errors" in str(exc_info.value)
     assert exc_info.value.details["errors"]
     assert len(exc_info.value.details["errors"]) == 3  # All attempts failed
+
+
+@pytest.fixture
+def batch_seeder(mocker: MagicMock) -> DataSeeder:
+    """Return a seeder on a development config whose inserts all succeed."""
+    mocker.patch("utils.seeder.get_config", return_value=mocker.Mock(environment=Environment.DEVELOPMENT))
+    mock_client = mocker.MagicMock(spec=AClient)
+    mock_client.table.return_value.insert.return_value.execute = mocker.AsyncMock(return_value=mocker.Mock(data=[{}] * 3))
+    return DataSeeder(mock_client)
+
+
+@pytest.mark.asyncio
+async def test_seed_items_batched(batch_seeder: DataSeeder) -> None:
+    """Test that batched seeding inserts one chunk per upstream call."""
+    await batch_seeder.seed_items(count=10, batch_size=4, concurrency=2)
+
+    insert = batch_seeder.client.table.return_value.insert
+    assert sorted(len(call.args[0]) for call in insert.call_args_list) == [2, 4, 4]
+
+
+@pytest.mark.asyncio
+async def test_seed_items_batched_chunk_failure(batch_seeder: DataSeeder) -> None:
+    """Test that a failed chunk is reported in the aggregated error details."""
+    execute = batch_seeder.client.table.return_value.insert.return_value.execute
+    execute.side_effect = [Exception("Database error"), execute.return_value, execute.return_value]
+
+    with pytest.raises(ItemSeedingError) as exc_info:
+        await batch_seeder.seed_items(count=9, batch_size=3, concurrency=1)
+
+    assert "Seeded 6 of 9 items" in str(exc_info.value)
+    errors = exc_info.value.details["errors"]
+    assert [(error["details"]["chunk"], error["details"]["size"]) for error in errors] == [(1, 3)]
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "four"])
+def test_positive_int_rejects_values_below_one(value: str) -> None:
+    """Test that a batch size or concurrency below 1 is rejected on the command line."""
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_int(value)
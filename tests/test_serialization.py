@@ -0,0 +1,52 @@
+import json
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from supabase import AClient, PostgrestAPIResponse
+
+from src.api.item.router import router as item_routes
+from src.config import Configuration
+from src.database import get_supabase_client
+from src.serialization import FastJSONResponse, format_prices
+
+HTTP_OK = 200
+
+ROW = {"id": "123e4567-e89b-12d3-a456-426614174000", "title": "Curry", "price": 12.5, "is_available": True}
+
+
+def test_format_prices() -> None:
+    """Test that prices are rendered with two decimal places the way the Item model renders them, leaving the rows given untouched."""
+    original = [{"price": 12.5}, {"price": "3"}, {"price": None}, {"title": "no price"}]
+    rows = format_prices(original)
+
+    assert [row.get("price") for row in rows] == ["12.50", "3.00", None, None]
+    assert original[0] == {"price": 12.5}
+
+
+def test_fast_json_response_renders_decimals() -> None:
+    """Test that values without a JSON type are rendered as strings."""
+    response = FastJSONResponse({"price": Decimal("1.50")})
+
+    assert json.loads(response.body) == {"price": "1.50"}
+
+
+def test_fast_serialization_skips_response_model(mocker: MagicMock) -> None:
+    """Test that an opted-in read is rendered from the upstream rows and keeps its cache headers."""
+    mocker.patch.object(Configuration, "fast_serialization", new=True, create=True)
+    mocker.patch.object(Configuration, "_instance", Configuration())
+    app = FastAPI()
+    app.include_router(item_routes)
+    client = MagicMock(spec=AClient)
+    client.table.return_value.select.return_value.order.return_value.order.return_value.limit.return_value.execute = AsyncMock(
+        return_value=PostgrestAPIResponse(data=[dict(ROW, extra="kept")], count=1),
+    )
+    app.dependency_overrides[get_supabase_client] = lambda: client
+
+    response = TestClient(app).get("/item/")
+
+    assert response.status_code == HTTP_OK
+    assert response.json()["data"][0]["price"] == "12.50"
+    assert response.json()["data"][0]["extra"] == "kept"
+    assert response.headers["ETag"]
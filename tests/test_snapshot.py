@@ -0,0 +1,149 @@
+import gzip
+import json
+from unittest.mock import AsyncMock, MagicMock, call
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from supabase import AClient, PostgrestAPIResponse
+
+from src.api.menu.router import router as menu_routes
+from src.database import get_supabase_client
+from src.snapshot import MenuSnapshot, negotiate_encoding
+
+HTTP_NOT_MODIFIED = 304
+
+CATEGORY = {"id": "c1", "title": "Mains", "created_at": "2024-01-01T00:00:00Z", "is_available": True}
+ITEM = {"id": "i1", "title": "Curry", "categories": ["c1"], "created_at": "2024-01-01T00:00:00Z", "is_available": True}
+
+
+def mock_client(rows: dict[str, list[dict]]) -> MagicMock:
+    """Create a client whose keyset reads of each table return `rows`."""
+    client = MagicMock(spec=AClient)
+    tables = {}
+    for table, data in rows.items():
+        query = MagicMock()
+        select = query.select.return_value.eq.return_value
+        select.order.return_value.order.return_value.limit.return_value.execute = AsyncMock(
+            return_value=PostgrestAPIResponse(data=data, count=None),
+        )
+        tables[table] = query
+    client.table.side_effect = tables.__getitem__
+    return client
+
+
+@pytest.mark.asyncio
+async def test_snapshot_joins_categories_to_items() -> None:
+    """Test that the document lists each category with its items and compresses it once."""
+    snapshot = MenuSnapshot()
+    client = mock_client({"category": [CATEGORY], "item": [ITEM, {**ITEM, "id": "i2", "categories": []}]})
+
+    built = await snapshot.get(client)
+    document = json.loads(built.identity)
+
+    assert document["categories"][0]["items"][0]["id"] == "i1"
+    assert [item["id"] for item in document["uncategorized"]] == ["i2"]
+    assert json.loads(gzip.decompress(built.gzip)) == document
+    assert await snapshot.get(client) is built
+
+
+@pytest.mark.asyncio
+async def test_snapshot_applies_writes_incrementally() -> None:
+    """Test that writes update the document without reading upstream again."""
+    snapshot = MenuSnapshot()
+    client = mock_client({"category": [CATEGORY], "item": [ITEM]})
+    first = await snapshot.get(client)
+
+    snapshot.apply("item", [{**ITEM, "id": "i2"}])
+    snapshot.apply("item", [{**ITEM, "is_available": False}])
+    second = await snapshot.get(client)
+
+    assert second.etag != first.etag
+    assert [item["id"] for item in json.loads(second.identity)["categories"][0]["items"]] == ["i2"]
+    assert client.table.call_args_list == [call("category"), call("item")]
+
+    snapshot.remove("category", [CATEGORY])
+    assert json.loads((await snapshot.get(client)).identity)["categories"] == []
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip", "gzip"),
+        ("zstd;q=0, gzip;q=0.5", "gzip"),
+        ("*", "zstd"),
+        ("br", "identity"),
+        (None, "identity"),
+    ],
+)
+def test_negotiate_encoding(accept_encoding: str | None, expected: str) -> None:
+    """Test that the best acceptable precompressed coding is chosen."""
+    assert negotiate_encoding(accept_encoding, zstd_available=True) == expected
+
+
+def test_get_menu_snapshot_route() -> None:
+    """Test that the route serves the negotiated encoding and answers a matching ETag with 304."""
+    app = FastAPI()
+    app.include_router(menu_routes)
+    client = mock_client({"category": [CATEGORY], "item": [ITEM]})
+    app.dependency_overrides[get_supabase_client] = lambda: client
+    test_client = TestClient(app)
+
+    response = test_client.get("/menu/snapshot", headers={"Accept-Encoding": "gzip"})
+    revalidated = test_client.get("/menu/snapshot", headers={"If-None-Match": response.headers["ETag"]})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.json()["categories"][0]["title"] == "Mains"
+    assert revalidated.status_code == HTTP_NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_snapshot_etag_is_derived_from_the_menu() -> None:
+    """Test that snapshots of the same rows share an ETag, as separate workers do."""
+    client = mock_client({"category": [CATEGORY], "item": [ITEM]})
+
+    first = await MenuSnapshot().get(client)
+    second = await MenuSnapshot().get(client)
+
+    assert first.etag == second.etag
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reloads_once_expired(mocker: MagicMock) -> None:
+    """Test that rows older than the max age are loaded again, picking up writes made by other workers."""
+    monotonic = mocker.patch("src.snapshot.time.monotonic", return_value=100.0)
+    snapshot = MenuSnapshot(max_age=60.0)
+    first = await snapshot.get(mock_client({"category": [CATEGORY], "item": [ITEM]}))
+
+    monotonic.return_value = 150.0
+    assert await snapshot.get(MagicMock(spec=AClient)) is first
+
+    monotonic.return_value = 160.0
+    unchanged = await snapshot.get(mock_client({"category": [CATEGORY], "item": [ITEM]}))
+    assert unchanged is first
+
+    monotonic.return_value = 220.0
+    changed = await snapshot.get(mock_client({"category": [CATEGORY], "item": [{**ITEM, "is_available": False}]}))
+    assert changed.etag != first.etag
+    assert json.loads(changed.identity)["categories"][0]["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_drops_writes_queued_by_a_failed_load() -> None:
+    """Test that writes made during a load that fails are not replayed over the next load."""
+    snapshot = MenuSnapshot()
+    failing = mock_client({"category": [CATEGORY], "item": []})
+
+    async def write_then_fail() -> None:
+        snapshot.apply("item", [{**ITEM, "id": "i2"}])
+        raise ConnectionError
+
+    failing.table("item").select().eq().order().order().limit().execute.side_effect = write_then_fail
+    with pytest.raises(ConnectionError):
+        await snapshot.get(failing)
+
+    built = await snapshot.get(mock_client({"category": [CATEGORY], "item": [ITEM]}))
+
+    assert [item["id"] for item in json.loads(built.identity)["categories"][0]["items"]] == ["i1"]
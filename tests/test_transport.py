@@ -0,0 +1,80 @@
+from collections.abc import AsyncIterator
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from src.config import Configuration
+from src.transport import InstrumentedTransport, PooledClient, PooledPostgrestClient, PoolSettings
+
+HTTP_OK = 200
+
+
+class Body(httpx.AsyncByteStream):
+    """Streamed body, like a response read off a pooled connection."""
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield the body in one chunk."""
+        yield b'{"ok": true}'
+
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """Fake pool that fires the trace events httpcore emits for a fresh connection."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer with a streamed 200, tracing a new connection."""
+        trace = request.extensions["trace"]
+        for event in ("connection.connect_tcp.started", "connection.connect_tcp.complete", "http11.send_request_headers.started"):
+            await trace(event, {})
+        return httpx.Response(HTTP_OK, stream=Body())
+
+
+def test_pool_settings_from_config(mocker: MagicMock) -> None:
+    """Test that configured pool settings are read and unset ones keep their defaults."""
+    mocker.patch.object(Configuration, "pool_max_connections", 7, create=True)
+    mocker.patch.object(Configuration, "http2", new=False, create=True)
+
+    settings = PoolSettings.from_config(Configuration())
+
+    assert settings.limits.max_connections == Configuration.pool_max_connections
+    assert settings.http2 is False
+    assert settings.timeout.read == PoolSettings().read_timeout
+
+
+@pytest.mark.asyncio
+async def test_transport_records_requests_until_body_closed() -> None:
+    """Test that a request counts as in flight until its body is read and that connections opened are counted."""
+    transport = InstrumentedTransport(PoolSettings(max_connections=4))
+    transport._transport = TracingTransport()  # noqa: SLF001 # replaces the pool under the instrumentation
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        async with client.stream("GET", "/rest/v1/item") as response:
+            assert transport.stats()["in_flight"] == 1
+            await response.aread()
+        assert response.json() == {"ok": True}
+
+    stats = transport.stats()
+    assert stats["requests"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["peak_in_flight"] == 1
+    assert stats["connections_opened"] == 1
+    assert stats["saturation"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_closing_a_session_keeps_the_shared_pool_open() -> None:
+    """Test that recreated clients share one transport and closing one leaves it usable."""
+    transport = InstrumentedTransport(PoolSettings())
+    transport._transport = TracingTransport()  # noqa: SLF001 # replaces the pool under the instrumentation
+    client = PooledClient("https://example.supabase.co", "header.payload.signature")
+    client.transport = transport
+
+    # The hook the supabase client builds its PostgREST client with, each time its session is renewed.
+    first = client._init_postgrest_client("https://example.supabase.co/rest/v1", {}, "public")  # noqa: SLF001
+    second = client._init_postgrest_client("https://example.supabase.co/rest/v1", {}, "public")  # noqa: SLF001
+    await first.aclose()
+    response = await second.session.get("/item")
+
+    assert isinstance(first, PooledPostgrestClient)
+    assert response.status_code == HTTP_OK
+    assert second.session.timeout.connect == PoolSettings().connect_timeout
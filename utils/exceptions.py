@@ -2,12 +2,23 @@
 from __future__ import annotations
 
 import uuid
+from contextvars import ContextVar
 from typing import Any
 
+# The id of the request being served, set by the access log middleware.
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
 
 def get_error_id() -> str:
-    """Generate a unique identifier for error tracking."""
-    return str(uuid.uuid4())
+    """
+    Generate a unique identifier for error tracking.
+
+    While a request is being served the identifier is prefixed with its request id,
+    so an error can be found in the access log and correlated with its upstream calls.
+    """
+    error_id = str(uuid.uuid4())
+    request_id = request_id_var.get()
+    return error_id if request_id is None else f"{request_id}:{error_id}"
 
 
 class ClientInitializationError(Exception):
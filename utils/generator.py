@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import itertools
+import json
+import random
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from utils.logger import logger
+from utils.vocabulary import CATEGORY_NAMES, FOOD_ADJECTIVES, FOOD_TYPES
+
+DEFAULT_SHARD_SIZE = 100_000
+WRITE_BATCH_SIZE = 10_000
+BASE_TIMESTAMP = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+class OutputFormat(str, Enum):
+    """Enumeration for the file formats a dataset can be written in."""
+
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class CategoryDistribution(str, Enum):
+    """Enumeration for how items are spread across categories."""
+
+    UNIFORM = "uniform"
+    ZIPF = "zipf"
+
+
+@dataclass(frozen=True)
+class ValuePools:
+    """Values drawn from when generating rows, built once per dataset."""
+
+    titles: list[str]
+    words: list[str]
+    sentences: list[str]
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """Everything a worker process needs to write one shard of items."""
+
+    index: int
+    start: int
+    size: int
+    seed: int
+    output_format: OutputFormat
+    output_dir: Path
+    pools: ValuePools
+    category_ids: list[str]
+    category_weights: list[float]
+
+
+def seeded_uuid(rng: random.Random) -> str:
+    """Return a version 4 UUID drawn from `rng`, so it is reproducible from the seed."""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def build_pools(seed: int, words: int = 2_000, sentences: int = 1_000) -> ValuePools:
+    """
+    Build the value pools with Faker once, so rows never call Faker per field.
+
+    Faker is imported here rather than at module level since it is slow to import
+    and only dataset generation needs it.
+    """
+    from faker import Faker
+
+    fake = Faker()
+    fake.seed_instance(seed)
+    return ValuePools(
+        titles=[f"{adjective} {food_type}"[:22] for adjective, food_type in itertools.product(FOOD_ADJECTIVES, FOOD_TYPES)],
+        words=fake.words(nb=words),
+        sentences=[fake.sentence(nb_words=10) for _ in range(sentences)],
+    )
+
+
+def category_weights(count: int, distribution: CategoryDistribution, exponent: float = 1.1) -> list[float]:
+    """Return the relative weight of each category rank under `distribution`."""
+    if distribution == CategoryDistribution.UNIFORM:
+        return [1.0] * count
+    return [1.0 / rank**exponent for rank in range(1, count + 1)]
+
+
+def generate_categories(count: int, seed: int) -> list[dict[str, Any]]:
+    """Generate `count` categories with ids reproducible from `seed`."""
+    rng = random.Random(f"{seed}:categories")  # noqa: S311
+    return [
+        {
+            "id": seeded_uuid(rng),
+            "title": f"{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {i // len(CATEGORY_NAMES) + 1}"[:22],
+            "image_uri": f"https://example.com/images/{seeded_uuid(rng)}.jpg",
+            "created_at": (BASE_TIMESTAMP + timedelta(seconds=i)).isoformat(),
+            "is_available": rng.random() < 0.9,  # noqa: PLR2004
+        }
+        for i in range(count)
+    ]
+
+
+def generate_items(spec: ShardSpec, start: int, size: int, rng: random.Random) -> list[dict[str, Any]]:
+    """
+    Generate one batch of items, drawing every column for the whole batch at once.
+
+    Each item is linked to one to three of the generated categories, chosen with
+    the configured distribution.
+    """
+    pools = spec.pools
+    titles = rng.choices(pools.titles, k=size)
+    first_words = rng.choices(pools.words, k=size)
+    second_words = rng.choices(pools.words, k=size)
+    descriptions = rng.choices(pools.sentences, k=size)
+    prices = [rng.randint(500, 3500) for _ in range(size)]
+    category_counts = rng.choices((1, 2, 3), k=size)
+    linked = rng.choices(spec.category_ids, weights=spec.category_weights, k=size * 3)
+
+    return [
+        {
+            "title": titles[i],
+            "title_full": f"{titles[i]} with {first_words[i]} {second_words[i]}",
+            "description": descriptions[i],
+            "price": f"{prices[i] // 100}.{prices[i] % 100:02d}",
+            "is_available": rng.random() < 0.8,  # noqa: PLR2004
+            "image_uri": f"https://example.com/images/{seeded_uuid(rng)}.jpg",
+            "created_at": (BASE_TIMESTAMP + timedelta(seconds=start + i)).isoformat(),
+            "categories": list(dict.fromkeys(linked[i * 3 : i * 3 + category_counts[i]])),
+        }
+        for i in range(size)
+    ]
+
+
+def iter_item_batches(spec: ShardSpec) -> Iterator[list[dict[str, Any]]]:
+    """Yield the items of a shard in batches of at most WRITE_BATCH_SIZE."""
+    rng = random.Random(f"{spec.seed}:items:{spec.index}")  # noqa: S311
+    for offset in range(0, spec.size, WRITE_BATCH_SIZE):
+        size = min(WRITE_BATCH_SIZE, spec.size - offset)
+        yield generate_items(spec, spec.start + offset, size, rng)
+
+
+def write_rows(path: Path, batches: Iterator[list[dict[str, Any]]], output_format: OutputFormat) -> int:
+    """
+    Stream batches of rows to a file, holding only one batch in memory at a time.
+
+    Raises:
+        ImportError: If Parquet output is requested without pyarrow installed.
+
+    """
+    written = 0
+    if output_format == OutputFormat.NDJSON:
+        with path.open("w", encoding="utf-8") as file:
+            for batch in batches:
+                file.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in batch)
+                written += len(batch)
+        return written
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        msg = "Generator - Parquet output requires pyarrow. Install it with: uv pip install pyarrow"
+        raise ImportError(msg) from e
+
+    writer = None
+    try:
+        for batch in batches:
+            table = pa.Table.from_pylist(batch)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            written += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def write_shard(spec: ShardSpec) -> tuple[Path, int]:
+    """Write one shard of items. Runs in a worker process."""
+    path = spec.output_dir / f"items-{spec.index:05d}.{spec.output_format.value}"
+    return path, write_rows(path, iter_item_batches(spec), spec.output_format)
+
+
+class DatasetGenerator:
+    """Utility class for generating large, referentially intact datasets for offline load tests."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        seed: int = 0,
+        output_format: OutputFormat = OutputFormat.NDJSON,
+        distribution: CategoryDistribution = CategoryDistribution.ZIPF,
+    ) -> None:
+        """
+        Initialize the DatasetGenerator.
+
+        Args:
+            output_dir: Directory the dataset files are written to.
+            seed: Seed every random draw derives from. The same seed produces the same files.
+            output_format: Whether rows are written as NDJSON or Parquet.
+            distribution: How items are spread across categories.
+
+        """
+        self.output_dir = output_dir
+        self.seed = seed
+        self.output_format = output_format
+        self.distribution = distribution
+
+    def generate(self, items: int, categories: int, shard_size: int = DEFAULT_SHARD_SIZE, workers: int | None = None) -> None:
+        """
+        Write `categories` categories followed by `items` items linked to them.
+
+        Categories are written first to `categories.<format>` so their ids exist before
+        any item references them. Items are split into shards of `shard_size` rows and
+        written to `items-<shard>.<format>` by a pool of `workers` processes.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        logger.info("Generator - Writing %s categories and %s items to: %s", categories, items, self.output_dir)
+
+        category_rows = generate_categories(categories, self.seed)
+        write_rows(self.output_dir / f"categories.{self.output_format.value}", iter([category_rows]), self.output_format)
+
+        pools = build_pools(self.seed)
+        category_ids = [row["id"] for row in category_rows]
+        weights = category_weights(len(category_ids), self.distribution)
+        specs = [
+            ShardSpec(
+                index=index,
+                start=start,
+                size=min(shard_size, items - start),
+                seed=self.seed,
+                output_format=self.output_format,
+                output_dir=self.output_dir,
+                pools=pools,
+                category_ids=category_ids,
+                category_weights=weights,
+            )
+            for index, start in enumerate(range(0, items, shard_size))
+        ]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, written in executor.map(write_shard, specs):
+                logger.info("Generator - Wrote %s item(s) to: %s", written, path)
+
+        logger.info("Generator - Finished writing dataset to: %s", self.output_dir)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from supabase import AClient
+
+from src.database import create_supabase
+from utils.exceptions import ItemSeedingError
+from utils.generator import OutputFormat
+from utils.logger import logger
+from utils.seeder import DEFAULT_SEED_CONCURRENCY
+
+DEFAULT_LOAD_BATCH_SIZE = 500
+
+
+def iter_row_batches(path: Path, batch_size: int) -> Iterator[list[dict[str, Any]]]:
+    """
+    Read a dataset file in batches of at most `batch_size` rows.
+
+    Raises:
+        ImportError: If a Parquet file is read without pyarrow installed.
+
+    """
+    if path.suffix == f".{OutputFormat.PARQUET.value}":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            msg = "Loader - Reading Parquet requires pyarrow. Install it with: uv pip install pyarrow"
+            raise ImportError(msg) from e
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield record_batch.to_pylist()
+        return
+
+    batch = []
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                batch.append(json.loads(line))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+class DatasetLoader:
+    """Utility class for pushing a generated dataset upstream in bulk."""
+
+    def __init__(self, client: AClient, batch_size: int = DEFAULT_LOAD_BATCH_SIZE, concurrency: int = DEFAULT_SEED_CONCURRENCY) -> None:
+        """
+        Initialize the DatasetLoader.
+
+        Args:
+            client (AClient): The Supabase client used to insert rows.
+            batch_size (int): Rows sent per insert.
+            concurrency (int): Inserts in flight at once.
+
+        """
+        self.client = client
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+    async def load(self, directory: Path) -> None:
+        """
+        Insert the categories and then the item shards found in `directory`.
+
+        Raises:
+            FileNotFoundError: If the directory holds no categories file.
+            ItemSeedingError: If any batch failed to insert, with one entry per failed batch.
+
+        """
+        category_files = sorted(directory.glob("categories.*"))
+        if not category_files:
+            msg = f"Loader - No categories file found in: {directory}"
+            raise FileNotFoundError(msg)
+
+        started = time.perf_counter()
+        errors: list[ItemSeedingError] = []
+        loaded = await self._load_file("category", category_files[0], errors)
+        for path in sorted(directory.glob("items-*")):
+            loaded += await self._load_file("item", path, errors)
+        elapsed = time.perf_counter() - started
+
+        logger.info("Loader - Inserted %s row(s) in %.2fs (%.1f rows/s)", loaded, elapsed, loaded / elapsed if elapsed else 0.0)
+
+        if errors:
+            raise ItemSeedingError(
+                message=f"Loader - Loading completed with errors. Inserted {loaded} row(s).",
+                details={"errors": [{"error_id": e.error_id, "details": e.details} for e in errors]},
+            )
+
+    async def _load_file(self, table: str, path: Path, errors: list[ItemSeedingError]) -> int:
+        """Insert one file into `table`, keeping at most `concurrency` batches in memory."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = []
+
+        async def insert(number: int, rows: list[dict[str, Any]]) -> int:
+            try:
+                response = await self.client.table(table).insert(rows).execute()
+            except Exception as e:  # noqa: BLE001
+                error = ItemSeedingError(
+                    message=f"Loader - Failed to insert batch {number} of {path.name}",
+                    original_error=e,
+                    details={"file": path.name, "batch": number, "size": len(rows)},
+                )
+                logger.error(str(error))
+                errors.append(error)
+                return 0
+            finally:
+                semaphore.release()
+            return len(response.data)
+
+        for number, rows in enumerate(iter_row_batches(path, self.batch_size), 1):
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(insert(number, rows)))
+
+        inserted = sum(await asyncio.gather(*tasks))
+        logger.info("Loader - Inserted %s row(s) from: %s", inserted, path)
+        return inserted
+
+
+async def main(directory: Path, batch_size: int = DEFAULT_LOAD_BATCH_SIZE, concurrency: int = DEFAULT_SEED_CONCURRENCY) -> None:
+    """Load a generated dataset into the configured environment."""
+    client = await create_supabase()
+    loader = DatasetLoader(client, batch_size=batch_size, concurrency=concurrency)
+
+    try:
+        await loader.load(directory)
+    except ItemSeedingError as e:
+        logger.error(f"Loader - Failed: {e!s}")
+        logger.error(f"Loader - Error details: {e.details}")
+    finally:
+        await client.close()
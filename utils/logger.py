@@ -1,10 +1,112 @@
+import atexit
 import logging
+import os
+import queue
+import time
 from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+DEFAULT_LOG_DIR = "logs"
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 5
+DEFAULT_DEBUG_SAMPLE_RATE = 10
+
+
+class DailyRotatingFileHandler(RotatingFileHandler):
+    """
+    File handler writing to `<logs_dir>/<date>/<filename>`.
+
+    It moves on to a new date folder at midnight UTC and, within a day, rolls the
+    file over to numbered backups once it grows past `maxBytes`.
+    """
+
+    def __init__(self, logs_dir: Path, filename: str, max_bytes: int, backup_count: int) -> None:
+        """
+        Initialize the DailyRotatingFileHandler.
+
+        Args:
+            logs_dir: Directory the date folders are created in.
+            filename: Name of the log file inside each date folder.
+            max_bytes: Size after which the file is rolled over. 0 disables size rotation.
+            backup_count: Number of rolled over files kept per day.
+
+        """
+        self.logs_dir = logs_dir
+        self.filename = filename
+        self.date = self._today()
+        super().__init__(self._path(self.date), maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(UTC).strftime("%Y-%m-%d")
+
+    def _path(self, date: str) -> str:
+        folder = self.logs_dir / date
+        folder.mkdir(parents=True, exist_ok=True)
+        return str(folder / self.filename)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802
+        """Roll over when the day has changed or the file is full."""
+        return self._today() != self.date or bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:  # noqa: N802
+        """Switch to the folder of the new day, or rotate the current file into numbered backups."""
+        today = self._today()
+        if today == self.date:
+            super().doRollover()
+            return
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.date = today
+        self.baseFilename = str(Path(self._path(today)).absolute())
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through at most `rate` records per message per second at or below `max_level`.
+
+    Records are grouped by their unformatted message, so a hot-path debug line is
+    sampled no matter what its arguments are. The first record let through after
+    some were dropped reports how many were.
+    """
+
+    def __init__(self, rate: int = DEFAULT_DEBUG_SAMPLE_RATE, max_level: int = logging.DEBUG) -> None:
+        """
+        Initialize the SamplingFilter.
+
+        Args:
+            rate: Records of one message let through per second. 0 disables sampling.
+            max_level: Records above this level are never sampled.
+
+        """
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+        self._windows: dict[str, tuple[int, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether the record is let through."""
+        if self.rate <= 0 or record.levelno > self.max_level:
+            return True
+        key = str(record.msg)
+        second = int(time.monotonic())
+        window, passed, dropped = self._windows.get(key, (second, 0, 0))
+        if window != second:
+            window, passed = second, 0
+        if passed >= self.rate:
+            self._windows[key] = (window, passed, dropped + 1)
+            return False
+        if dropped:
+            record.msg = f"{record.msg} (sampled: {dropped} similar message(s) dropped)"
+        self._windows[key] = (window, passed + 1, 0)
+        return True
+
 
 class LoggerSetup:  # noqa: D101
     _logger: logging.Logger | None = None
+    _access_logger: logging.Logger | None = None
 
     @classmethod
     def get_logger(cls, name: str = "micropos-api") -> logging.Logger:
@@ -13,29 +115,71 @@ class LoggerSetup:  # noqa: D101
             cls._logger = cls._init_logging(name)
         return cls._logger
 
-    @staticmethod
-    def _init_logging(name: str) -> logging.Logger:
-        """Create logger with logs stored in a timestamped folder."""
-        logs_dir = Path("logs")
-        if not logs_dir.exists():
-            logs_dir.mkdir()
-
-        timestamped_folder = datetime.now(UTC).strftime("%Y-%m-%d")
-        log_folder_path = logs_dir / timestamped_folder
+    @classmethod
+    def get_access_logger(cls, name: str = "micropos-api.access") -> logging.Logger:
+        """
+        Get or create the access logger, which writes bare JSON lines to `access.log`.
+
+        It does not propagate, so access lines never reach the application log.
+        """
+        if cls._access_logger is None:
+            logger = logging.getLogger(name)
+            if not logger.handlers:
+                file_handler = cls._file_handler("access.log")
+                console_handler = logging.StreamHandler()
+                formatter = logging.Formatter("%(message)s")
+                file_handler.setFormatter(formatter)
+                console_handler.setFormatter(formatter)
+                logger.addHandler(cls._start_queue(file_handler, console_handler))
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+            cls._access_logger = logger
+        return cls._access_logger
 
-        if not log_folder_path.exists():
-            log_folder_path.mkdir(parents=True)
+    @staticmethod
+    def _file_handler(filename: str) -> DailyRotatingFileHandler:
+        """
+        Create the handler of a log file.
+
+        With LOG_FILE_PER_PROCESS set, as the launcher does for several workers, each
+        process writes and rotates its own `<name>.<pid>.log`. Rotating a shared file
+        from several processes would truncate the lines the others are writing.
+        """
+        if (os.getenv("LOG_FILE_PER_PROCESS") or "false").lower() == "true":
+            stem, _, suffix = filename.rpartition(".")
+            filename = f"{stem}.{os.getpid()}.{suffix}"
+        return DailyRotatingFileHandler(
+            Path(os.getenv("LOG_DIR") or DEFAULT_LOG_DIR),
+            filename,
+            max_bytes=int(os.getenv("LOG_MAX_BYTES") or DEFAULT_LOG_MAX_BYTES),
+            backup_count=int(os.getenv("LOG_BACKUP_COUNT") or DEFAULT_LOG_BACKUP_COUNT),
+        )
 
-        log_file = log_folder_path / "micropos-api.log"
+    @staticmethod
+    def _start_queue(*handlers: logging.Handler) -> QueueHandler:
+        """Start a background thread writing to `handlers` and return the handler that feeds it."""
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        return QueueHandler(log_queue)
 
+    @classmethod
+    def _init_logging(cls, name: str) -> logging.Logger:
+        """
+        Create logger with logs stored in a dated folder.
+
+        Records are put on a queue and written to the console and the log file by a
+        background thread, so logging never blocks the event loop on I/O. The level,
+        directory, rotation size, backup count and debug sample rate are read from
+        LOG_LEVEL, LOG_DIR, LOG_MAX_BYTES, LOG_BACKUP_COUNT and LOG_DEBUG_SAMPLE_RATE
+        since the logger exists before any Configuration is loaded.
+        """
         logger = logging.getLogger(name)
 
         if not logger.handlers:
-            file_handler = logging.FileHandler(str(log_file))
-            file_handler.setLevel(logging.INFO)
-
+            file_handler = cls._file_handler("micropos-api.log")
             console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
 
             formatter = logging.Formatter(
                 "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -45,11 +189,14 @@ class LoggerSetup:  # noqa: D101
             file_handler.setFormatter(formatter)
             console_handler.setFormatter(formatter)
 
-            logger.addHandler(file_handler)
-            logger.addHandler(console_handler)
-            logger.setLevel(logging.INFO)
+            queue_handler = cls._start_queue(file_handler, console_handler)
+            queue_handler.addFilter(SamplingFilter(int(os.getenv("LOG_DEBUG_SAMPLE_RATE") or DEFAULT_DEBUG_SAMPLE_RATE)))
+
+            logger.addHandler(queue_handler)
+            logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
         return logger
 
 
 logger = LoggerSetup.get_logger()
+access_logger = LoggerSetup.get_access_logger()
@@ -1,22 +1,46 @@
 from __future__ import annotations
 
+import argparse
+import asyncio
+import time
 import uuid
 from datetime import UTC, datetime
 from decimal import Decimal, InvalidOperation
 from json.decoder import JSONDecodeError
+from typing import TYPE_CHECKING
 
-from faker import Faker
 from fastapi.encoders import jsonable_encoder
 from pydantic import ValidationError
 
 from src.api.item.schemas import ItemCreate
 from src.config import Environment, get_config
-from src.database import create_supabase
-from supabase import AClient
 from utils.exceptions import ItemSeedingError, ValidationSeedingError
 from utils.logger import logger
+from utils.vocabulary import CATEGORY_NAMES, FOOD_ADJECTIVES, FOOD_TYPES
+
+if TYPE_CHECKING:
+    from supabase import AClient
+
+DEFAULT_SEED_CONCURRENCY = 4
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a command line value that must be at least 1, such as a batch size or concurrency.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer of at least 1.
+
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        msg = f"must be an integer of at least 1, got {value!r}"
+        raise argparse.ArgumentTypeError(msg)
+    return number
 
-fake = Faker()
 
 class DataSeeder:
     """Utility class for seeding test data into the database."""
@@ -30,6 +54,7 @@ class DataSeeder:
 
         Attributes:
             client (AClient): The provided database client instance.
+            fake (Faker): The Faker instance item fields are drawn from.
             config: Configuration settings retrieved from `get_config`.
             environment (Environment): The current environment (e.g., local, development, production).
             categories (list[str]): List of item categories used to classify seeded data.
@@ -44,27 +69,19 @@ class DataSeeder:
             Logs the initialization process and specifies the environment being used.
 
         """
+        # Faker is slow to import, so it is only loaded once a seeder is created.
+        from faker import Faker
+
         self.client = client
+        self.fake = Faker()
         self.config = get_config()
         self.environment = self.config.environment
 
         logger.info(f"Seeder - Initializing seeder for environment: {self.environment}")
 
-        self.categories = [
-            "Appetizers",
-            "Main Course",
-            "Desserts",
-            "Beverages",
-            "Specials",
-        ]
-        self.food_adjectives = [
-            "Spicy", "Fresh", "Grilled", "Homemade", "Traditional",
-            "Seasonal", "Organic", "Local", "House Special", "Chef's",
-        ]
-        self.food_types = [
-            "Curry", "Stir-fry", "Salad", "Soup", "Rice Bowl",
-            "Noodles", "Sandwich", "Pizza", "Pasta", "Seafood",
-        ]
+        self.categories = list(CATEGORY_NAMES)
+        self.food_adjectives = list(FOOD_ADJECTIVES)
+        self.food_types = list(FOOD_TYPES)
 
         if self.environment == Environment.PRODUCTION:
             logger.warning("Seeder - Seeding data in production environment!")
@@ -74,8 +91,8 @@ class DataSeeder:
     def generate_fake_item(self) -> ItemCreate:
         """Generate a single fake menu item with environment-aware modifications."""
         try:
-            adjective = fake.random_element(self.food_adjectives)
-            food_type = fake.random_element(self.food_types)
+            adjective = self.fake.random_element(self.food_adjectives)
+            food_type = self.fake.random_element(self.food_types)
 
             title = f"{adjective} {food_type}"
             if self.environment == Environment.PRODUCTION:
@@ -83,7 +100,7 @@ class DataSeeder:
             title = title[:22]
 
             try:
-                price = Decimal(str(fake.pyfloat(
+                price = Decimal(str(self.fake.pyfloat(
                     min_value=5.0,
                     max_value=35.0,
                     right_digits=2,
@@ -97,13 +114,13 @@ class DataSeeder:
 
             item_data = {
                 "title": title,
-                "title_full": f"{adjective} {food_type} with {fake.word()} {fake.word()}",
-                "description": fake.sentence(nb_words=10),
+                "title_full": f"{adjective} {food_type} with {self.fake.word()} {self.fake.word()}",
+                "description": self.fake.sentence(nb_words=10),
                 "price": price,
-                "is_available": fake.boolean(chance_of_getting_true=80),
+                "is_available": self.fake.boolean(chance_of_getting_true=80),
                 "image_uri": f"https://example.com/images/{uuid.uuid4()}.jpg",
                 "created_at": datetime.now(UTC),
-                "categories": [uuid.uuid4() for _ in range(fake.random_int(min=1, max=3))],
+                "categories": [uuid.uuid4() for _ in range(self.fake.random_int(min=1, max=3))],
             }
 
             if self.environment != "production":
@@ -124,8 +141,19 @@ class DataSeeder:
                 original_error=e,
             ) from e
 
-    async def seed_items(self, count: int = 10) -> None:
-        """Seed items with environment-specific logging and safeguards."""
+    async def seed_items(
+        self,
+        count: int = 10,
+        batch_size: int | None = None,
+        concurrency: int = DEFAULT_SEED_CONCURRENCY,
+    ) -> None:
+        """
+        Seed items with environment-specific logging and safeguards.
+
+        Items are inserted one per round trip unless `batch_size` is given, in which
+        case they are inserted in chunks of `batch_size` with up to `concurrency`
+        chunks in flight at once.
+        """
         logger.info(f"Seeder - Seeding {count} item(s) ...")
 
         # Safeguards for production
@@ -133,6 +161,30 @@ class DataSeeder:
             logger.warning("Seeder - Limiting seed count to 1 in production environment")
             count = 1
 
+        started = time.perf_counter()
+        if batch_size:
+            seeded_count, errors = await self._seed_batches(count, batch_size, concurrency)
+        else:
+            seeded_count, errors = await self._seed_one_by_one(count)
+        elapsed = time.perf_counter() - started
+
+        logger.info(
+            "Seeder - Inserted %s item(s) in %.2fs (%.1f rows/s)",
+            seeded_count,
+            elapsed,
+            seeded_count / elapsed if elapsed else 0.0,
+        )
+
+        if errors:
+            raise ItemSeedingError(
+                message=f"Seeder - Seeding completed with errors in {self.environment}. Seeded {seeded_count} of {count} items.",
+                details={"errors": [{"error_id": e.error_id, "details": e.details} for e in errors]},
+            )
+
+        logger.info(f"Seeder - Successfully seeded {seeded_count} item(s) in environment: {self.environment}")
+
+    async def _seed_one_by_one(self, count: int) -> tuple[int, list[ItemSeedingError]]:
+        """Insert `count` items with one awaited round trip each."""
         seeded_count = 0
         errors = []
 
@@ -169,24 +221,54 @@ class DataSeeder:
                 logger.error(str(error))
                 errors.append(error)
 
-        if errors:
-            raise ItemSeedingError(
-                message=f"Seeder - Seeding completed with errors in {self.environment}. Seeded {seeded_count} of {count} items.",
-                details={"errors": [{"error_id": e.error_id, "details": e.details} for e in errors]},
-            )
-
-        logger.info(f"Seeder - Successfully seeded {seeded_count} item(s) in environment: {self.environment}")
-
-async def main(items: int = 1) -> None:
+        return seeded_count, errors
+
+    async def _seed_batches(self, count: int, batch_size: int, concurrency: int) -> tuple[int, list[ItemSeedingError]]:
+        """Insert `count` items in chunks of `batch_size`, running up to `concurrency` chunks at once."""
+        semaphore = asyncio.Semaphore(concurrency)
+        chunks = [(start, min(batch_size, count - start)) for start in range(0, count, batch_size)]
+
+        async def seed_chunk(number: int, start: int, size: int) -> tuple[int, ItemSeedingError | None]:
+            # Items are generated inside the semaphore so at most `concurrency` chunks are held in memory.
+            async with semaphore:
+                label = f"chunk {number}/{len(chunks)} (items {start + 1}-{start + size})"
+                try:
+                    items = [self.generate_fake_item().model_dump() for _ in range(size)]
+                    response = await self.client.table("item").insert(jsonable_encoder(items)).execute()
+                except ItemSeedingError as e:
+                    e.details.update({"chunk": number, "size": size})
+                    logger.error(f"Seeder - Failed to seed {label} in {self.environment}: {e!s}")
+                    return 0, e
+                except Exception as e:  # noqa: BLE001
+                    error = ItemSeedingError(
+                        message=f"Seeder - Failed to insert {label}",
+                        original_error=e,
+                        details={"chunk": number, "size": size},
+                    )
+                    logger.error(str(error))
+                    return 0, error
+
+                logger.info("Seeder - Created %s", label)
+                return len(response.data), None
+
+        results = await asyncio.gather(*(seed_chunk(number, start, size) for number, (start, size) in enumerate(chunks, 1)))
+
+        seeded_count = sum(inserted for inserted, _ in results)
+        errors = [error for _, error in results if error is not None]
+        return seeded_count, errors
+
+async def main(items: int = 1, batch_size: int | None = None, concurrency: int = DEFAULT_SEED_CONCURRENCY) -> None:
     """Run the seeding function with environment awareness."""
+    from src.database import create_repository
+
     config = get_config()
-    client = await create_supabase()
+    client = await create_repository()
     seeder = DataSeeder(client)
 
     try:
-        await seeder.seed_items(items)
+        await seeder.seed_items(items, batch_size=batch_size, concurrency=concurrency)
     except ItemSeedingError as e:
         logger.error(f"Seeder - Failed in {config.environment}: {e!s}")
         logger.error(f"Seeder - Error details: {e.details}")
     finally:
-        await client.auth.sign_out()
+        await client.close()
@@ -0,0 +1,15 @@
+CATEGORY_NAMES = [
+    "Appetizers",
+    "Main Course",
+    "Desserts",
+    "Beverages",
+    "Specials",
+]
+FOOD_ADJECTIVES = [
+    "Spicy", "Fresh", "Grilled", "Homemade", "Traditional",
+    "Seasonal", "Organic", "Local", "House Special", "Chef's",
+]
+FOOD_TYPES = [
+    "Curry", "Stir-fry", "Salad", "Soup", "Rice Bowl",
+    "Noodles", "Sandwich", "Pizza", "Pasta", "Seafood",
+]